@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Free-text ``details`` extraction in PropertyAPI.get_property_details.
+
+When the structured /v2/property fields are empty, get_property_details falls
+back to the payload's ``details`` groups. It used to call two helpers once per
+pattern — 14 patterns across 9 fields — and each call re-walked every text with
+an uncompiled ``re.search``. ``property_api.index_details`` scans each text
+once for all fields. This script times both on the same payloads, with every
+structured field missing so every fallback runs, and checks they agree.
+
+Payloads are the /v2/property responses saved by the HTTP response cache
+(``--cache-dir``, default data/cache/http) plus any ``--payload FILE``; with
+none recorded, synthetic payloads in RapidAPI's shape are used.
+
+    python benchmarks/bench_details_index.py
+    python benchmarks/bench_details_index.py --groups 80 --iterations 2000
+"""
+import argparse
+import json
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT / "pre_walkthrough_generator" / "src"))
+
+from property_api import index_details  # noqa: E402
+
+FIELDS = ("price", "bedrooms", "bathrooms", "rooms", "sqft", "year_built", "hoa_fee",
+          "property_type", "neighborhood")
+
+
+def legacy_extract(d: dict) -> dict:
+    """The helper calls get_property_details made before the index (values only)."""
+
+    def search_details(category=None, regex=None, contains=None):
+        details_list = d.get('details') or []
+        for det in details_list:
+            if category and det.get('category', '').lower() == category.lower():
+                text_list = det.get('text') or []
+                for t in text_list:
+                    if regex:
+                        m = re.search(regex, t)
+                        if m:
+                            return m.group(1)
+                    elif contains and contains.lower() in t.lower():
+                        return t
+                    else:
+                        return t
+            text_list = det.get('text') or []
+            for t in text_list:
+                if contains and contains.lower() in t.lower():
+                    return t
+                if regex:
+                    m = re.search(regex, t)
+                    if m:
+                        return m.group(1)
+        return None
+
+    def search_details_any(regex):
+        for det in d.get('details') or []:
+            for t in det.get('text') or []:
+                m = re.search(regex, t)
+                if m:
+                    return m.group(1)
+        return None
+
+    def first_containing(word):
+        for det in d.get('details') or []:
+            for t in det.get('text') or []:
+                if word in t.lower():
+                    return t.split(':')[-1].strip()
+        return None
+
+    return {
+        "price": search_details_any(r'Price: \$?([\d,]+)'),
+        "bedrooms": (search_details('Bedrooms', r'Bedrooms: (\d+)') or search_details_any(r'Bedrooms: (\d+)')
+                     or search_details_any(r'Beds: (\d+)') or search_details_any(r'Bedroom[s]?: (\d+)')),
+        "bathrooms": (search_details('Bathrooms', r'Bathrooms: (\d+)') or search_details_any(r'Bathrooms: (\d+)')
+                      or search_details_any(r'Baths: (\d+)') or search_details_any(r'Bathroom[s]?: (\d+)')),
+        "rooms": search_details('Other Rooms', r'Total Rooms: (\d+)') or search_details_any(r'Total Rooms: (\d+)'),
+        "sqft": search_details_any(r'(\d{3,5})\s*sqft'),
+        "year_built": search_details_any(r'Year Built: (\d{4})'),
+        "hoa_fee": (search_details('Homeowners Association', r'Association Fee: (\d+)')
+                    or search_details_any(r'Association Fee: (\d+)')),
+        "property_type": search_details_any(r'Property Subtype: ([\w-]+)') or first_containing('property subtype'),
+        "neighborhood": search_details_any(r'Neighborhood: ([\w\s-]+)') or first_containing('neighborhood'),
+    }
+
+
+def indexed_extract(d: dict) -> dict:
+    values = index_details(d.get('details'))
+    return {f: values.get(f) for f in FIELDS}
+
+
+def synthetic_payload(groups: int) -> dict:
+    """A /v2/property ``data`` object whose facts sit at the end of ``groups`` detail groups."""
+    filler = ["Heating Features: Radiant", "Cooling Features: Wall Unit(s)", "Laundry: In Building",
+              "Flooring: Hardwood", "Exterior: Brick", "Parking: Garage", "Pets Allowed: Yes"]
+    details = [{"category": f"Group {i}", "text": [f"{t} ({i})" for t in filler]} for i in range(groups)]
+    details += [
+        {"category": "Bedrooms", "text": ["Bedrooms: 2", "Bedroom Main Level: Yes"]},
+        {"category": "Bathrooms", "text": ["Bathrooms: 1", "Full Bathrooms: 1"]},
+        {"category": "Other Rooms", "text": ["Total Rooms: 4"]},
+        {"category": "Building and Construction", "text": ["Year Built: 1962", "Property Subtype: co-op", "850 sqft"]},
+        {"category": "Homeowners Association", "text": ["Association Fee: 1450"]},
+        {"category": "Listing", "text": ["List Price: $895,000", "Neighborhood: Kips Bay"]},
+    ]
+    return {"details": details}
+
+
+def recorded_payloads(cache_dir: Path) -> list:
+    payloads = []
+    for path in sorted(cache_dir.glob("*/*.json")) if cache_dir.exists() else []:
+        try:
+            entry = json.loads(path.read_text())
+            if "/v2/property" in entry.get("url", "") and entry.get("status") == 200:
+                data = (json.loads(entry["body"]) or {}).get("data")
+                if isinstance(data, dict) and data.get("details"):
+                    payloads.append(data)
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            continue
+    return payloads
+
+
+def time_per_call(fn, payloads: list, iterations: int) -> float:
+    samples = []
+    for _ in range(5):
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for d in payloads:
+                fn(d)
+        samples.append((time.perf_counter() - started) / (iterations * len(payloads)))
+    return statistics.median(samples)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--cache-dir", default=str(ROOT / "data" / "cache" / "http"),
+                    help="HTTP response cache to read recorded /v2/property payloads from")
+    ap.add_argument("--payload", action="append", default=[],
+                    help="a saved /v2/property response (JSON); repeatable")
+    ap.add_argument("--groups", type=int, default=30, help="detail groups in each synthetic payload")
+    ap.add_argument("--iterations", type=int, default=500)
+    ap.add_argument("--output", help="write results as JSON")
+    args = ap.parse_args()
+
+    payloads = recorded_payloads(Path(args.cache_dir))
+    for p in args.payload:
+        body = json.loads(Path(p).read_text())
+        payloads.append(body.get("data", body))
+    source = "recorded" if payloads else "synthetic"
+    if not payloads:
+        payloads = [synthetic_payload(args.groups), synthetic_payload(args.groups // 3)]
+
+    mismatches = [(i, f) for i, d in enumerate(payloads)
+                  for f, v in legacy_extract(d).items() if indexed_extract(d)[f] != v]
+    legacy = time_per_call(legacy_extract, payloads, args.iterations)
+    indexed = time_per_call(indexed_extract, payloads, args.iterations)
+    texts = statistics.mean(sum(len(g.get("text") or []) for g in d.get("details") or []) for d in payloads)
+
+    result = {"payloads": len(payloads), "source": source, "mean_texts": round(texts, 1),
+              "legacy_us": round(legacy * 1e6, 1), "indexed_us": round(indexed * 1e6, 1),
+              "speedup": round(legacy / indexed, 1), "mismatches": len(mismatches)}
+    print(f"{len(payloads)} {source} payload(s), {texts:.0f} detail texts on average")
+    print(f"legacy helpers  {result['legacy_us']:>9.1f} us/payload")
+    print(f"index_details   {result['indexed_us']:>9.1f} us/payload   ({result['speedup']}x)")
+    for i, f in mismatches:
+        print(f"MISMATCH payload {i} field {f}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(result, indent=2))
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
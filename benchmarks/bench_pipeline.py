@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""End-to-end performance benchmark for the report pipeline.
+
+Drives ``process_transcript_and_generate_report`` (transcript -> extraction ->
+research -> neighboring projects -> .docx) and ``DocumentGenerator.generate_report``
+on its own, with external services either stubbed (default, see stubs.py) or
+replayed from recorded cassettes. For every case it reports:
+
+  - wall time per pipeline stage and in total
+  - peak RSS of the process (each case runs in a fresh subprocess)
+  - peak traced Python allocations per stage and overall (tracemalloc)
+  - size of the generated .docx
+  - Anthropic calls and input tokens (stubbed services)
+
+Results are written as JSON and can be saved as a baseline and compared on the
+next run; a regression beyond the tolerances exits non-zero, so this can gate a
+deploy.
+
+    python benchmarks/bench_pipeline.py                         # stubbed services
+    python benchmarks/bench_pipeline.py --save-baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --baseline benchmarks/baseline.json
+    python benchmarks/bench_pipeline.py --services replay       # recorded cassettes
+    python benchmarks/bench_pipeline.py --stub-latency 2 --env RESEARCH_STRUCTURED_SEARCH=on
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC = ROOT / "pre_walkthrough_generator" / "src"
+BENCH_DIR = Path(__file__).resolve().parent
+TRANSCRIPTS_DIR = ROOT / "data" / "transcripts"
+
+# Synthetic transcript sizes (characters).
+SYNTHETIC_SIZES = {"short": 2_000, "medium": 15_000, "long": 80_000}
+
+# Regression tolerances: a metric regresses when it exceeds
+# baseline * (1 + rel) + abs.
+TOLERANCES = {
+    "total_s": (0.25, 0.05),
+    "peak_rss_mb": (0.15, 5.0),
+    "alloc_peak_mb": (0.20, 1.0),
+    "docx_bytes": (0.10, 2048),
+}
+
+_SPEAKERS = ["Consultant", "Client"]
+_LINES = [
+    "We're at 305 East 24th Street, apartment 8C, it's a co-op in Kips Bay.",
+    "We want to gut the kitchen and move the sink over to an island with seating.",
+    "Both bathrooms need redoing, ideally a curbless shower and heated floors.",
+    "The board requires an alteration agreement and work hours are nine to five on weekdays.",
+    "Our budget is somewhere around two fifty to three hundred thousand all in.",
+    "I'd like white oak floors throughout and warm, minimal finishes.",
+    "We'll be living in the apartment during construction, so phasing matters.",
+    "Can we replace the central AC at the same time as the kitchen work?",
+    "The building was built in 1962 and has a doorman and two elevators.",
+    "We'd need drawings for the board package and a DOB alteration permit.",
+    "My partner and I will make decisions together, mostly over email.",
+    "Ideally we'd start in March and be finished before the holidays.",
+]
+
+
+def synthetic_transcript(chars: int, seed: int = 7) -> str:
+    """Deterministic consultation-style transcript of roughly ``chars`` characters."""
+    rng = random.Random(seed + chars)
+    out, size, minute = [], 0, 0
+    while size < chars:
+        speaker = _SPEAKERS[len(out) % 2]
+        text = " ".join(rng.choice(_LINES) for _ in range(rng.randint(1, 4)))
+        block = f"{speaker} | {minute // 60:02d}:{minute % 60:02d}\n{text}\n"
+        out.append(block)
+        size += len(block)
+        minute += 1
+    return "\n".join(out)
+
+
+def default_cases(services: str) -> list:
+    cases = []
+    if services == "stub":
+        # Synthetic transcripts are never recorded, so they only run stubbed.
+        cases += [{"name": f"pipeline_synthetic_{label}", "kind": "pipeline", "synthetic": size}
+                  for label, size in SYNTHETIC_SIZES.items()]
+    cases += [{"name": f"pipeline_real_{p.stem}", "kind": "pipeline", "transcript": str(p)}
+              for p in sorted(TRANSCRIPTS_DIR.glob("*.txt"))]
+    cases.append({"name": "render_report", "kind": "render"})
+    return cases
+
+
+# --- child process: run one case ---------------------------------------------
+
+class StageTimer:
+    """Wraps pipeline entry points and records wall time + allocation peak per stage."""
+
+    def __init__(self, trace_allocs: bool):
+        self.trace_allocs = trace_allocs
+        self.stages = {}
+
+    def wrap(self, owner, attr: str, stage: str) -> None:
+        original = getattr(owner, attr)
+        timer = self
+
+        def timed(*args, **kwargs):
+            if timer.trace_allocs:
+                tracemalloc.reset_peak()
+                base = tracemalloc.get_traced_memory()[0]
+            started = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                s = timer.stages.setdefault(stage, {"calls": 0, "wall_s": 0.0, "alloc_peak_mb": 0.0})
+                s["calls"] += 1
+                s["wall_s"] += time.perf_counter() - started
+                if timer.trace_allocs:
+                    peak = (tracemalloc.get_traced_memory()[1] - base) / 2**20
+                    s["alloc_peak_mb"] = max(s["alloc_peak_mb"], peak)
+
+        setattr(owner, attr, timed)
+
+
+def _peak_rss_mb() -> float:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss / 2**20 if sys.platform == "darwin" else rss / 1024  # bytes on macOS, KiB on Linux
+
+
+def run_case(case: dict, args) -> dict:
+    """Run one case in THIS process (called in a fresh subprocess by main)."""
+    workdir = Path(tempfile.mkdtemp(prefix="prewalk-bench-"))
+    # Run from a scratch directory with a copy of the deals cache so the
+    # pipeline's relative paths (config.json, generator.log, data/cache) never
+    # touch the checkout.
+    cache_src = ROOT / "data" / "cache" / "zoho_deals_cache.json"
+    (workdir / "data" / "cache").mkdir(parents=True)
+    if cache_src.exists():
+        shutil.copy(cache_src, workdir / "data" / "cache" / cache_src.name)
+    os.chdir(workdir)
+    os.environ["REPORT_OUTPUT_DIR"] = str(workdir / "out")
+    os.environ["RESEARCH_CACHE_DIR"] = str(workdir / "data" / "cache" / "research")
+    for assignment in args.env or []:
+        name, _, value = assignment.partition("=")
+        os.environ[name] = value
+    for path in (str(ROOT), str(SRC), str(BENCH_DIR)):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    if args.services == "stub":
+        os.environ.setdefault("ANTHROPIC_API_KEY", "bench-stub")
+        for var in ("ZOHO_CLIENT_ID", "ZOHO_CLIENT_SECRET", "ZOHO_REFRESH_TOKEN"):
+            os.environ.pop(var, None)
+        import stubs
+        stubs.install(latency=args.stub_latency)
+    else:
+        import cassette
+        cassette.configure("replay", args.cassette_dir, args.replay_latency)
+
+    import document_generator
+    import fastapi_server
+    import property_research
+    import transcript_formats
+    import transcript_processor
+    from neighboring_projects import NeighboringProjectsManager
+
+    timer = StageTimer(trace_allocs=not args.no_alloc)
+    timer.wrap(transcript_formats, "flatten_transcript", "flatten_transcript")
+    timer.wrap(fastapi_server, "clean_transcript", "clean_transcript")
+    timer.wrap(transcript_processor.TranscriptProcessor, "extract_info", "extract_info")
+    timer.wrap(transcript_processor.TranscriptProcessor, "extract_address", "extract_address")
+    timer.wrap(property_research, "research_property", "research")
+    timer.wrap(NeighboringProjectsManager, "find_neighboring_projects", "neighboring_projects")
+    timer.wrap(document_generator.DocumentGenerator, "generate_report", "render")
+
+    if not args.no_alloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    if case["kind"] == "render":
+        import stubs
+        output = document_generator.DocumentGenerator().generate_report(
+            stubs.report_data(), output_dir=str(workdir / "out"), file_name="bench.docx")
+        input_chars = 0
+    else:
+        if case.get("synthetic"):
+            transcript_path = workdir / "transcript.txt"
+            transcript_path.write_text(synthetic_transcript(case["synthetic"]))
+        else:
+            transcript_path = Path(case["transcript"])
+        input_chars = len(transcript_path.read_text())
+        output = fastapi_server.process_transcript_and_generate_report(
+            str(transcript_path), output_name="bench")
+    total_s = time.perf_counter() - started
+    alloc_peak_mb = tracemalloc.get_traced_memory()[1] / 2**20 if not args.no_alloc else None
+
+    result = {
+        "name": case["name"],
+        "input_chars": input_chars,
+        "total_s": round(total_s, 4),
+        "peak_rss_mb": round(_peak_rss_mb(), 1),
+        "alloc_peak_mb": round(alloc_peak_mb, 2) if alloc_peak_mb is not None else None,
+        "docx_bytes": os.path.getsize(output) if output and os.path.exists(output) else None,
+        "stages": {k: {"calls": v["calls"], "wall_s": round(v["wall_s"], 4),
+                       "alloc_peak_mb": round(v["alloc_peak_mb"], 2)}
+                   for k, v in timer.stages.items()},
+    }
+    if args.services == "stub":
+        import stubs
+        result["api_calls"] = stubs.USAGE["calls"]
+        result["api_input_tokens"] = stubs.USAGE["input_tokens"]
+    shutil.rmtree(workdir, ignore_errors=True)
+    return result
+
+
+# --- parent process: orchestrate, aggregate, compare -------------------------
+
+def _spawn(case: dict, argv: list) -> dict:
+    cmd = [sys.executable, str(Path(__file__).resolve()), "--run-case", json.dumps(case)] + argv
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    lines = [l for l in proc.stdout.splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        tail = (proc.stderr or proc.stdout).strip().splitlines()[-15:]
+        return {"name": case["name"], "error": "\n".join(tail) or f"exit {proc.returncode}"}
+    return json.loads(lines[-1])
+
+
+def _aggregate(runs: list) -> dict:
+    """Median of each metric over repeats (stage timings included)."""
+    ok = [r for r in runs if "error" not in r]
+    if not ok:
+        return runs[-1]
+    out = dict(ok[0])
+    for metric in ("total_s", "peak_rss_mb", "alloc_peak_mb", "docx_bytes", "api_calls", "api_input_tokens"):
+        values = [r[metric] for r in ok if r.get(metric) is not None]
+        out[metric] = statistics.median(values) if values else None
+    for stage in out.get("stages", {}):
+        values = [r["stages"][stage]["wall_s"] for r in ok if stage in r.get("stages", {})]
+        out["stages"][stage] = dict(out["stages"][stage], wall_s=round(statistics.median(values), 4))
+    out["repeats"] = len(ok)
+    return out
+
+
+def compare(results: dict, baseline: dict) -> list:
+    """Human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    base_cases = {c["name"]: c for c in baseline.get("cases", [])}
+    for case in results["cases"]:
+        base = base_cases.get(case["name"])
+        if not base or "error" in base:
+            continue
+        if "error" in case:
+            regressions.append(f"{case['name']}: failed ({case['error'].splitlines()[-1]})")
+            continue
+        for metric, (rel, slack) in TOLERANCES.items():
+            new, old = case.get(metric), base.get(metric)
+            if new is None or old is None:
+                continue
+            if new > old * (1 + rel) + slack:
+                regressions.append(f"{case['name']}: {metric} {old} -> {new} "
+                                   f"(+{(new - old) / old * 100 if old else 0:.0f}%)")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--services", choices=("stub", "replay"), default="stub",
+                        help="stub external services, or replay recorded cassettes")
+    parser.add_argument("--stub-latency", type=float, default=0.0,
+                        help="seconds of simulated latency per stubbed Anthropic call")
+    parser.add_argument("--cassette-dir", default=None, help="cassette directory for --services replay")
+    parser.add_argument("--replay-latency", default="zero", help="zero, realistic or a scale factor")
+    parser.add_argument("--case", action="append", help="only run cases whose name contains this")
+    parser.add_argument("--repeat", type=int, default=1, help="runs per case (median is reported)")
+    parser.add_argument("--no-alloc", action="store_true", help="skip tracemalloc (lower overhead)")
+    parser.add_argument("--output", default=None, help="write results JSON here (default: stdout)")
+    parser.add_argument("--save-baseline", default=None, help="also save results as a baseline file")
+    parser.add_argument("--baseline", default=None, help="compare against this baseline; exit 1 on regression")
+    parser.add_argument("--env", action="append", metavar="NAME=VALUE",
+                        help="set an environment variable in every case (e.g. to compare research modes)")
+    parser.add_argument("--run-case", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        result = run_case(json.loads(args.run_case), args)
+        print(json.dumps(result))
+        return 0
+
+    child_argv = ["--services", args.services, "--stub-latency", str(args.stub_latency),
+                  "--replay-latency", args.replay_latency]
+    if args.cassette_dir:
+        child_argv += ["--cassette-dir", str(Path(args.cassette_dir).resolve())]
+    if args.no_alloc:
+        child_argv.append("--no-alloc")
+    for assignment in args.env or []:
+        child_argv += ["--env", assignment]
+
+    cases = default_cases(args.services)
+    if args.case:
+        cases = [c for c in cases if any(sel in c["name"] for sel in args.case)]
+
+    results = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "services": args.services,
+        "python": sys.version.split()[0],
+        "cases": [],
+    }
+    for case in cases:
+        runs = [_spawn(case, child_argv) for _ in range(max(1, args.repeat))]
+        summary = _aggregate(runs)
+        results["cases"].append(summary)
+        if "error" in summary:
+            print(f"{case['name']:<40} FAILED: {summary['error'].splitlines()[-1]}", file=sys.stderr)
+        else:
+            stages = ", ".join(f"{k}={v['wall_s']:.3f}s" for k, v in summary["stages"].items())
+            print(f"{case['name']:<40} {summary['total_s']:.3f}s  rss={summary['peak_rss_mb']}MB  "
+                  f"alloc={summary['alloc_peak_mb']}MB  docx={summary['docx_bytes']}B  "
+                  f"calls={summary.get('api_calls')}  [{stages}]",
+                  file=sys.stderr)
+
+    text = json.dumps(results, indent=2)
+    if args.output:
+        Path(args.output).write_text(text + "\n")
+    else:
+        print(text)
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(text + "\n")
+
+    failed = any("error" in c for c in results["cases"])
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text()))
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            return 1
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""Fixed-sleep throttling vs the shared token-bucket rate limiter.
+
+Simulates a rate-limited provider (default: Nominatim's 1 request/second) and
+runs the same workload — each job makes ``--calls`` requests, as a geocode
+lookup or a RapidAPI id -> details -> photos sequence does — two ways:
+
+  - sleep  : the old pattern, a fixed pause after every request on each thread
+  - bucket : rate_limiter.TokenBucket shared by every thread
+
+once with a single job and once with ``--jobs`` concurrent jobs. Reported per
+run: mean / max job latency, and compliance — requests that went out while the
+provider's own bucket (same rate and burst) was empty, i.e. would have been
+rejected with a 429.
+
+    python benchmarks/bench_rate_limit.py
+    python benchmarks/bench_rate_limit.py --rate 1 --burst 2 --sleep 1 --calls 3 --jobs 4
+"""
+import argparse
+import json
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+SRC = Path(__file__).resolve().parent.parent / "pre_walkthrough_generator" / "src"
+sys.path.insert(0, str(SRC))
+
+from rate_limiter import TokenBucket  # noqa: E402
+
+# Scheduling slack before a request counts as over the limit.
+_TOLERANCE_S = 0.01
+
+
+class Provider:
+    """Records request send times; each request takes ``latency`` seconds."""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.sent = []
+        self._lock = threading.Lock()
+
+    def call(self) -> None:
+        with self._lock:
+            self.sent.append(time.monotonic())
+        time.sleep(self.latency)
+
+    def violations(self, rate: float, burst: int) -> int:
+        """Requests the provider's bucket (``rate``/s, ``burst``) would have refused."""
+        tokens, last, refused = float(burst), None, 0
+        for t in sorted(self.sent):
+            if last is not None:
+                tokens = min(float(burst), tokens + (t - last) * rate)
+            last = t
+            if tokens >= 1.0 - _TOLERANCE_S * rate:
+                tokens -= 1.0
+            else:
+                refused += 1
+        return refused
+
+
+def run(mode: str, jobs: int, calls: int, rate: float, burst: int, sleep_s: float, latency: float) -> dict:
+    provider = Provider(latency)
+    bucket = TokenBucket(rate, burst)
+
+    def job(_):
+        started = time.monotonic()
+        for i in range(calls):
+            if mode == "bucket":
+                bucket.acquire()
+            provider.call()
+            if mode == "sleep" and i < calls - 1:
+                time.sleep(sleep_s)
+        return time.monotonic() - started
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        latencies = list(pool.map(job, range(jobs)))
+    return {"mode": mode, "jobs": jobs, "calls": jobs * calls,
+            "job_mean_s": round(statistics.mean(latencies), 3), "job_max_s": round(max(latencies), 3),
+            "violations": provider.violations(rate, burst)}
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--rate", type=float, default=1.0, help="provider limit, requests/second")
+    ap.add_argument("--burst", type=int, default=1, help="provider burst allowance")
+    ap.add_argument("--sleep", type=float, default=1.1, help="old fixed pause after each request (s)")
+    ap.add_argument("--calls", type=int, default=3, help="requests per job")
+    ap.add_argument("--jobs", type=int, default=4, help="concurrent jobs in the concurrent run")
+    ap.add_argument("--latency", type=float, default=0.05, help="provider response time (s)")
+    ap.add_argument("--output", help="write results as JSON")
+    args = ap.parse_args()
+
+    results = []
+    for jobs in (1, args.jobs):
+        for mode in ("sleep", "bucket"):
+            r = run(mode, jobs, args.calls, args.rate, args.burst, args.sleep, args.latency)
+            results.append(r)
+            print(f"{mode:<7} jobs={jobs:<3} job_mean={r['job_mean_s']:.2f}s  job_max={r['job_max_s']:.2f}s  "
+                  f"violations={r['violations']}/{r['calls']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
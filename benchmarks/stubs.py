@@ -0,0 +1,187 @@
+"""Offline stand-ins for the pipeline's external services.
+
+``install()`` swaps the Anthropic client used by transcript_processor and
+property_research for a canned responder, so the full report pipeline runs
+without network access, API keys or cost. Responses are realistic in SHAPE
+(full extraction template, a complete research record) so every report
+section renders; ``latency`` adds a fixed per-call delay to mimic the API.
+
+For real recorded responses use the cassette replay mode instead
+(``--services replay``); these stubs are for synthetic transcripts of any size.
+"""
+import json
+import time
+from types import SimpleNamespace
+
+ADDRESS = "305 East 24th Street, Apt 8C, New York, NY 10010"
+
+EXTRACTION = {
+    "property_address": ADDRESS,
+    "property_info": {
+        "building_type": "co-op", "total_units": 120, "year_built": 1962,
+        "building_rules": ["Board approval of plans required", "Work hours 9am-5pm weekdays"],
+        "building_features": ["Doorman", "Elevator"], "realtor_property_id": None,
+    },
+    "client_info": {
+        "names": ["Jordan Smith"], "phone": "", "email": "jordan@example.com",
+        "profession": "Architect",
+        "preferences": {"budget_sensitivity": "medium", "decision_making": "deliberate",
+                        "design_involvement": "high", "quality_preference": "high-end"},
+        "constraints": ["Living in the unit during the work"],
+        "red_flags": {"is_negative_reviewer": False, "payment_concerns": False,
+                      "unrealistic_expectations": False, "communication_issues": False},
+    },
+    "renovation_scope": {
+        "kitchen": {
+            "description": "Full kitchen gut with new layout",
+            "estimated_cost": {"range": {"min": 80000, "max": 120000}},
+            "plumbing_changes": "Relocate sink to the island", "electrical_changes": "New circuits",
+            "specific_requirements": ["Island with seating", "Panel-ready appliances"],
+            "appliances": ["Induction range", "Dishwasher"],
+            "cabinets_and_countertops": {"type": "Custom", "preferences": ["Quartz"]},
+            "constraints": [],
+        },
+        "bathrooms": {
+            "count": 2, "cost_per_bathroom": 40000, "plumbing_changes": "Curbless shower",
+            "specific_requirements": ["Heated floors"], "fixtures": ["Wall-hung toilet"],
+            "finishes": ["Large-format porcelain"], "constraints": [],
+        },
+        "additional_work": {
+            "rooms": ["Home office with glass partition"], "structural_changes": [],
+            "systems_updates": ["Replace central AC"], "custom_features": ["Built-ins"],
+            "estimated_costs": {
+                "per_sqft_cost": 350, "total_estimated_range": {"min": 250000, "max": 320000},
+                "architect_fees": {"percentage": 10, "estimated_amount": 30000},
+                "additional_fees": [],
+            },
+        },
+        "timeline": {
+            "total_duration": "5 months", "phasing": "Kitchen first", "living_arrangements": "In place",
+            "constraints": ["Finish before the holidays"],
+            "key_dates": {"survey_completion": "", "walkthrough_scheduled": "Next week",
+                          "project_start": "March", "other_milestones": []},
+        },
+    },
+    "materials_and_design": {
+        "sourcing_responsibility": "Client sources tile", "specific_materials": ["White oak"],
+        "style_preferences": ["Warm minimal"], "quality_preferences": ["High-end"],
+        "trade_discounts": [], "reuse_materials": [],
+    },
+    "project_management": {
+        "client_involvement": "Weekly check-ins", "design_services": ["Drawings"],
+        "documentation_needs": ["Board package"], "permit_requirements": ["DOB alteration permit"],
+        "contractor_requirements": ["Fixed-price bid"], "communication_preferences": "Email",
+        "decision_process": "Joint with partner",
+    },
+}
+
+RESEARCH = {
+    "found": True, "address_resolves": True, "property_kind": "residential",
+    "bedrooms": "2", "bathrooms": "2", "sqft": "1,150", "year_built": "1962",
+    "property_type": "Co-op", "lot_size": "Information not available",
+    "last_sale_price": "$1,050,000", "last_sale_date": "2019-06-14",
+    "assessed_value": "$210,000", "property_taxes": "Information not available",
+    "zoning": "R8B", "flood_zone": "X", "neighborhood": "Kips Bay",
+    "feasibility_notes": ["Co-op board alteration agreement required", "No landmark designation"],
+    "owner_summary": "Ownership: Jordan Smith (shareholder)\nProfession: Architect",
+    "photo_url": "Information not available", "floor_plan_url": "Information not available",
+    "listing_url": "https://streeteasy.com/building/example/8c",
+    "sources": ["https://a836-acris.nyc.gov/", "https://zola.planning.nyc.gov/"],
+}
+
+RESEARCH_PROSE = (
+    "The unit is a 2-bed, 2-bath co-op of about 1,150 sq ft in a 1962 building in Kips Bay, "
+    "zoned R8B, FEMA flood zone X. Last sold 2019-06-14 for $1,050,000. "
+) * 20
+
+
+# Anthropic calls and input tokens served by the stub in this process.
+USAGE = {"calls": 0, "input_tokens": 0}
+
+
+def _response(text: str, input_chars: int) -> SimpleNamespace:
+    USAGE["calls"] += 1
+    USAGE["input_tokens"] += max(1, input_chars // 4)
+    return SimpleNamespace(
+        content=[SimpleNamespace(type="text", text=text)],
+        stop_reason="end_turn",
+        usage=SimpleNamespace(input_tokens=max(1, input_chars // 4), output_tokens=max(1, len(text) // 4)),
+    )
+
+
+class StubMessages:
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        messages = kwargs.get("messages") or []
+        input_chars = len(json.dumps(messages, default=str))
+        first = messages[0]["content"] if messages else ""
+        if isinstance(first, list):  # vision check
+            return _response("OTHER", input_chars)
+        fmt = (kwargs.get("output_config") or {}).get("format")
+        if kwargs.get("tools") and not fmt:  # web-search research round
+            return _response(RESEARCH_PROSE, input_chars)
+        if fmt:  # structuring into _RESEARCH_SCHEMA, or a structured search round
+            return _response(json.dumps(RESEARCH), input_chars)
+        if "address" in str(kwargs.get("system", "")).lower() and "extract" in str(kwargs.get("system", "")).lower():
+            return _response(ADDRESS, input_chars)
+        return _response(json.dumps(EXTRACTION), input_chars)
+
+    def stream(self, **kwargs):
+        from cassette import RecordedStream
+        return RecordedStream(self.create(**kwargs))
+
+
+class StubAnthropic:
+    latency = 0.0
+
+    def __init__(self, *args, **kwargs):
+        self.messages = StubMessages(self.latency)
+
+
+def install(latency: float = 0.0) -> None:
+    """Point the pipeline modules at the stub client (call before they run)."""
+    import nyc_neighborhoods
+    import property_research
+    import transcript_processor
+
+    StubAnthropic.latency = latency
+    transcript_processor.Anthropic = StubAnthropic
+    property_research.anthropic = SimpleNamespace(Anthropic=StubAnthropic)
+    # Geocoding is off on the report path, but never let a stub run go live.
+    nyc_neighborhoods._nominatim_search = lambda query: []
+
+
+def report_data() -> dict:
+    """A fully populated ``final_data`` dict for rendering-only benchmarks."""
+    details = {
+        "address": ADDRESS, "price": "Information not available",
+        "last_sold_price": RESEARCH["last_sale_price"], "last_sold_date": RESEARCH["last_sale_date"],
+        "bedrooms": RESEARCH["bedrooms"], "bathrooms": RESEARCH["bathrooms"], "sqft": RESEARCH["sqft"],
+        "year_built": RESEARCH["year_built"], "property_type": RESEARCH["property_type"],
+        "lot_size": RESEARCH["lot_size"], "assessed_value": RESEARCH["assessed_value"],
+        "property_taxes": RESEARCH["property_taxes"], "neighborhood": RESEARCH["neighborhood"],
+        "photo_url": RESEARCH["photo_url"], "floor_plan_url": RESEARCH["floor_plan_url"],
+        "listing_url": RESEARCH["listing_url"], "photos": [], "floor_plans": [],
+        "source": "public records research",
+    }
+    projects = [
+        {"deal_name": f"{200 + i} East 2{i % 10}th Street #{i}A", "address": f"{200 + i} East 2{i % 10}th Street",
+         "amount": 50000 + 1000 * i, "stage": "Closed Won", "is_same_building": i == 0,
+         "neighborhood": "Kips Bay", "contact_name": "", "closing_date": ""}
+        for i in range(20)
+    ]
+    return {
+        "property_address": ADDRESS, "property_id": None, "realtor_url": None, "zillow_url": None,
+        "property_details": details, "images": {"images": []}, "floor_plans": {"floor_plans": []},
+        "transcript_info": EXTRACTION, "neighboring_projects": projects,
+        "research_zoning": RESEARCH["zoning"], "research_flood": RESEARCH["flood_zone"],
+        "research_feasibility": RESEARCH["feasibility_notes"], "research_sources": RESEARCH["sources"],
+        "owner_summary": RESEARCH["owner_summary"], "research_address_resolves": True,
+        "research_property_kind": "residential", "zoho_contact": {}, "zoho_notes": [],
+    }
@@ -10,11 +10,12 @@ import sys
 import copy
 import hmac
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional, Tuple
 import logging
 import asyncio
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor
 from config_manager import config_manager
 from datetime import datetime
 from pydantic import BaseModel
@@ -30,6 +31,21 @@ try:
     import transcript_processor
     import property_api
     import document_generator
+    import model_router
+    import research_cache
+    import property_research
+    import pre_research
+    import api_governor
+    import http_pool
+    import response_cache
+    import rate_limiter
+    import floor_plan_classifier
+    import image_cache
+    import image_prefetch
+    import transcript_extract
+    import transcript_formats
+    from address_canon import clean_address
+    from deadline import Deadline
     from neighboring_projects import NeighboringProjectsManager
 except ImportError as e:
     logging.error(f"Import error: {e}")
@@ -63,8 +79,25 @@ server_metrics = {
 # --- Admin auth, upload limits, and secret redaction -------------------------
 ADMIN_API_KEY = os.environ.get("ADMIN_API_KEY")
 MAX_UPLOAD_BYTES = int(os.environ.get("MAX_UPLOAD_BYTES", 10 * 1024 * 1024))  # 10 MB
-ALLOWED_TRANSCRIPT_EXTS = {".txt", ".json", ".jsonl", ".md", ".docx", ".pdf"}
+ALLOWED_TRANSCRIPT_EXTS = {".txt", ".json", ".jsonl", ".md", ".vtt", ".srt", ".docx", ".pdf"}
 ALLOWED_TEMPLATE_EXTS = {".docx"}
+UPLOAD_CHUNK_BYTES = 1024 * 1024
+# End-to-end latency budget for one report (seconds). Kept under the 600s
+# gunicorn worker timeout; the model router trades depth for speed as it runs out.
+REPORT_LATENCY_BUDGET_S = float(os.environ.get("REPORT_LATENCY_BUDGET_S", 540))
+# Besides the main property, research at most this many other properties a
+# consultation covers (rental unit, second home, ...), concurrently.
+MAX_ADDITIONAL_PROPERTIES = int(os.environ.get("MAX_ADDITIONAL_PROPERTIES", 3))
+
+
+def validate_research_tier(research_tier: Optional[str]) -> Optional[str]:
+    """Reject an unknown research tier up front (422) instead of failing mid-job."""
+    if not research_tier:
+        return None
+    try:
+        return property_research.resolve_tier(research_tier)[0]
+    except ValueError as e:
+        raise HTTPException(status_code=422, detail=str(e))
 
 
 def require_admin(x_admin_key: Optional[str] = Header(default=None)):
@@ -126,7 +159,7 @@ def _sync_zoho_cache(force: bool = False) -> bool:
     from zoho_api import ZohoAPI
     from nyc_neighborhoods import enrich_deals_with_neighborhoods
     zoho = ZohoAPI(zoho_client_id, zoho_client_secret, zoho_refresh_token)
-    fields = ["Deal_Name", "Amount", "Stage", "Contact_Name", "Closing_Date"]
+    fields = ["Deal_Name", "Amount", "Stage", "Contact_Name", "Closing_Date", "Modified_Time"]
     deals = zoho.get_all_records("Deals", fields=fields, max_records=5000)
     if not deals:
         logger.warning("No deals returned from Zoho API")
@@ -141,6 +174,17 @@ def _sync_zoho_cache(force: bool = False) -> bool:
         manager.save_cache(deals, preserve_neighborhoods=True)
     tagged = sum(1 for d in deals if d.get("Neighborhood"))
     logger.info(f"Zoho cache refreshed: {len(deals)} deals ({tagged} tagged, {len(new_deals)} newly geocoded)")
+
+    # The most recently modified contacts carry upcoming walkthrough addresses
+    # (Mailing_Street) for pre-research.
+    try:
+        contacts = zoho.get_all_records("Contacts", fields=pre_research.CONTACT_FIELDS,
+                                        max_records=pre_research.PRE_RESEARCH_CONTACTS,
+                                        sort_by="Modified_Time")
+        if contacts:
+            pre_research.save_contacts(contacts)
+    except Exception as e:
+        logger.error(f"Zoho contacts refresh failed (non-fatal): {e}")
     return True
 
 
@@ -154,6 +198,21 @@ async def _periodic_zoho_refresh():
             logger.error(f"Periodic Zoho refresh failed (non-fatal): {e}")
 
 
+def _run_pre_research() -> dict:
+    """One pre-research batch over the cached Zoho addresses (blocking)."""
+    return pre_research.get_pre_researcher().run(config.Config().anthropic_api_key)
+
+
+async def _periodic_pre_research():
+    """Warm the research cache for upcoming walkthroughs every PRE_RESEARCH_INTERVAL_HOURS."""
+    while True:
+        try:
+            await asyncio.to_thread(_run_pre_research)
+        except Exception as e:
+            logger.error(f"Scheduled pre-research failed (non-fatal): {e}")
+        await asyncio.sleep(pre_research.PRE_RESEARCH_INTERVAL_HOURS * 3600)
+
+
 @app.on_event("startup")
 async def startup_sync_zoho_cache():
     """Refresh the Zoho cache if stale on startup, then keep it fresh on a timer."""
@@ -163,6 +222,8 @@ async def startup_sync_zoho_cache():
         logger.error(f"Startup Zoho sync failed (non-fatal): {e}")
     # Keep neighboring-project data current between deploys.
     asyncio.create_task(_periodic_zoho_refresh())
+    if pre_research.PRE_RESEARCH:
+        asyncio.create_task(_periodic_pre_research())
 
 
 @app.get("/health")
@@ -195,6 +256,16 @@ async def get_metrics(_: bool = Depends(require_admin)):
     return {
         "server_metrics": server_metrics,
         "config": _redact_config(config_manager.config),
+        "model_routing": model_router.get_router().stats(),
+        "research_cache": research_cache.get_research_cache().stats(),
+        "floor_plan_classifier": floor_plan_classifier.get_floor_plan_classifier().stats(),
+        "image_prefetch": image_prefetch.get_image_prefetcher().stats(),
+        "image_cache": image_cache.get_image_cache().stats(),
+        "pre_research": pre_research.get_pre_researcher().stats(),
+        "anthropic_governor": api_governor.get_governor().stats(),
+        "http_pool": http_pool.get_http_pool().stats(),
+        "http_cache": response_cache.get_response_cache().stats(),
+        "rate_limits": rate_limiter.get_rate_limiter().stats(),
         "memory_usage": "Available via system monitoring"
     }
 
@@ -203,25 +274,31 @@ def clean_transcript(raw_transcript: str) -> str:
     transcript = raw_transcript.strip()
     return transcript
 
-def clean_address(address: str) -> str:
-    """Clean and standardize address format"""
-    address = ' '.join(address.split())
-    address = re.sub(r'(?i)\b(apartment|apt\.?|unit)\s*#?\s*(\w+)', r'Apt \2', address)
-    # Only expand abbreviations that are clearly street names, not state abbreviations
-    # Use word boundaries and context to avoid changing state abbreviations
-    abbr = {
-        r'\b(\d+\s+\w+\s+)Pl\b\.?' : r'\1Place',  # Only expand Pl when it's clearly a street
-        r'\b(\d+\s+\w+\s+)St\b\.?' : r'\1Street',  # Only expand St when it's clearly a street
-        r'\b(\d+\s+\w+\s+)Ave\b\.?' : r'\1Avenue',
-        r'\b(\d+\s+\w+\s+)Rd\b\.?' : r'\1Road',
-        r'\bPkwy\b\.?' : 'Parkway'
-        # Don't expand Ct as it could be Connecticut
-    }
-    for pat, repl in abbr.items():
-        address = re.sub(pat, repl, address, flags=re.IGNORECASE)
-    return address
-
-def process_transcript_and_generate_report(transcript_path: str, address: str = None, last_name: str = None, output_name: str = None) -> str:
+def additional_addresses(transcript_info: dict, address: Optional[str]) -> List[Tuple[str, str]]:
+    """(address, role) for every OTHER property the extraction found, deduplicated
+    against the main address by building/unit key and capped at MAX_ADDITIONAL_PROPERTIES."""
+    seen = {research_cache.address_keys(address)[1]} if address else set()
+    extra = []
+    for entry in transcript_info.get("property_addresses") or []:
+        if isinstance(entry, dict):
+            candidate, role = entry.get("address"), entry.get("role")
+        else:
+            candidate, role = entry, None
+        candidate = clean_address(str(candidate or ""))
+        if not candidate or candidate.upper() == "NONE":
+            continue
+        key = research_cache.address_keys(candidate)[1]
+        if key in seen:
+            continue
+        seen.add(key)
+        extra.append((candidate, str(role or "").strip() or "Additional property"))
+    if len(extra) > MAX_ADDITIONAL_PROPERTIES:
+        logger.info("Consultation covers %d other properties — researching the first %d",
+                    len(extra), MAX_ADDITIONAL_PROPERTIES)
+    return extra[:MAX_ADDITIONAL_PROPERTIES]
+
+def process_transcript_and_generate_report(transcript_path: str, address: str = None, last_name: str = None, output_name: str = None, research_tier: str = None,
+                                           priority: int = api_governor.PRIORITY_INTERACTIVE) -> str:
     """
     Process a transcript and generate a pre-walkthrough report.
     
@@ -229,24 +306,45 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
         transcript_path: Path to the transcript file
         address: Property address (optional, will be extracted from transcript if not provided)
         last_name: Last name for the report (optional)
+        research_tier: Research depth — "fast", "standard" or "deep" (optional, default RESEARCH_TIER)
+        priority: api_governor priority of the job's Anthropic calls (a caller
+            waiting on the HTTP response goes first; async jobs pass PRIORITY_NORMAL)
     
     Returns:
         Path to the generated report file
     """
+    # One latency budget for the whole job; every step sizes itself to what's left.
+    # The research tier bounds it further (a "fast" report is a sub-minute job).
+    research_tier, tier = property_research.resolve_tier(research_tier)
+    deadline = Deadline(min(REPORT_LATENCY_BUDGET_S, tier.job_budget_s))
+    # Scopes this job's image prefetches (image_prefetch) to its own report.
+    prefetch_token = uuid.uuid4().hex
+
     try:
         # Initialize components
         config_obj = config.Config()
         doc_generator = document_generator.DocumentGenerator()
-        transcript_processor_obj = transcript_processor.TranscriptProcessor(config_obj.anthropic_api_key, config_obj.claude_model)
-
-        # Read and clean transcript
-        with open(transcript_path, 'r') as f:
-            transcript = clean_transcript(f.read())
+        # A tier with its own extraction model (the "fast" tier) extracts on it,
+        # without thinking; other tiers are routed as usual. Extraction runs on
+        # the job deadline and research takes what it leaves (capped at the
+        # tier's budget); running out mid-extraction fails the job rather than
+        # producing a report with no address, client or scope.
+        transcript_processor_obj = transcript_processor.TranscriptProcessor(config_obj.anthropic_api_key, config_obj.claude_model,
+                                                                          priority=priority, deadline=deadline,
+                                                                          fixed_model=tier.extract_model)
+
+        # Read and clean transcript: .docx/.pdf text is streamed out under the token
+        # budget, then meeting-tool exports are flattened to speaker turns.
+        try:
+            raw_transcript = transcript_extract.extract_transcript(transcript_path)
+        except transcript_extract.UnsupportedTranscript as e:
+            raise Exception(f"Could not read the transcript file: {e}")
+        transcript = clean_transcript(transcript_formats.flatten_transcript(raw_transcript))
         
         logger.info(f"Processing transcript: {transcript_path} ({len(transcript)} chars)")
 
         # Extract transcript information
-        transcript_info = transcript_processor_obj.extract_info(transcript)
+        transcript_info = transcript_processor_obj.extract_info(transcript, remaining_s=deadline.remaining())
         logger.info("Transcript processed successfully")
         
         # Validate that we have meaningful data to generate a report
@@ -272,7 +370,7 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
                 logger.info(f"Using address from transcript info: {address}")
             else:
                 logger.info("No address in transcript info, extracting separately...")
-                address = transcript_processor_obj.extract_address(transcript)
+                address = transcript_processor_obj.extract_address(transcript, remaining_s=deadline.remaining())
                 if address and address.upper() != 'NONE':
                     logger.info(f"Extracted address from transcript: {address}")
                 else:
@@ -319,7 +417,6 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
         # typical walkthrough client) come back empty. Public-records web research
         # fills the report instead. This is the slow step (minutes) — the async
         # endpoints exist so callers don't hit an HTTP timeout waiting for it.
-        import property_research
         owner_name = None
         names = (transcript_info.get('client_info') or {}).get('names') or []
         if names:
@@ -351,7 +448,6 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
         # (e.g. the SELLER of an in-contract unit) and adds authoritative
         # status/budget/sqft. (Deal notes stay off — this is identity only.)
         zoho_contact = {}
-        client_context = None
         try:
             if config_obj.has_zoho:  # property, not a method
                 from zoho_api import ZohoAPI
@@ -368,20 +464,48 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
             logger.info("Using Zoho contact as authoritative client: %r (status=%r)",
                         owner_name, zoho_contact.get("property_status"))
         # In-contract framing: the contact is the incoming BUYER, not the deed seller.
-        _status = (zoho_contact.get("property_status") or "").lower()
-        if "contract" in _status or "purchas" in (zoho_contact.get("description") or "").lower():
-            client_context = (
-                f"IMPORTANT: per the CRM, {owner_name or 'the client'} is the INCOMING BUYER / new owner "
-                "of this unit (it is IN CONTRACT / being purchased). Research and describe THIS person as "
-                "the buyer. The public deed/tax record will still show the CURRENT owner (the SELLER) — do "
-                "not confuse the two; if you mention the deed owner, label them the seller."
-            )
-
-        logger.info("Researching property + owner via web search for '%s' (may take a few minutes)...", address)
-        research = property_research.research_property(
-            address, config_obj.anthropic_api_key, owner_name=owner_name,
-            owner_email=owner_email, owner_phone=owner_phone, client_context=client_context,
-        ) or {}
+        client_context = property_research.client_context_for(
+            owner_name, zoho_contact.get("property_status"), zoho_contact.get("description"))
+
+        # Other properties the consultation covers are researched concurrently with
+        # the main one, against the same deadline and research cache. Each extra
+        # runs as a single brief (one model stream instead of the sub-query
+        # fan-out) one priority step below the main property, so they don't crowd
+        # the main property's sub-queries out of the api_governor's slots.
+        extra_addresses = additional_addresses(transcript_info, address)
+        logger.info("Researching property + owner via web search for '%s'%s (may take a few minutes)...", address,
+                    f" and {len(extra_addresses)} other propert{'y' if len(extra_addresses) == 1 else 'ies'}"
+                    if extra_addresses else "")
+        research_kwargs = dict(owner_name=owner_name, owner_email=owner_email, owner_phone=owner_phone,
+                               client_context=client_context, remaining_s=deadline.remaining(),
+                               deadline=deadline, tier=research_tier, priority=priority)
+        extra_kwargs = dict(research_kwargs, parallel=False,
+                            priority=min(priority + 1, api_governor.PRIORITY_BACKGROUND))
+        targets = [(address, research_kwargs)] + [(a, extra_kwargs) for a, _ in extra_addresses]
+        with ThreadPoolExecutor(max_workers=len(targets), thread_name_prefix="property") as pool:
+            futures = [pool.submit(property_research.research_property, a, config_obj.anthropic_api_key,
+                                   **kwargs) for a, kwargs in targets]
+            # The report's floor-plan image starts downloading as soon as the main
+            # property's research is back, while the others are still running.
+            results = [futures[0].result() or {}]
+            image_prefetch.get_image_prefetcher().prefetch(
+                image_prefetch.report_image_urls({"property_details": results[0].get("property_details")}),
+                prefetch_token)
+            results += [f.result() or {} for f in futures[1:]]
+        research = results[0]
+        additional_properties = []
+        for (extra_address, role), extra in zip(extra_addresses, results[1:]):
+            additional_properties.append({
+                "property_address": extra_address,
+                "role": role,
+                "property_details": extra.get("property_details") or {},
+                "research_zoning": extra.get("zoning"),
+                "research_flood": extra.get("flood_zone"),
+                "research_feasibility": extra.get("feasibility") or [],
+                "research_sources": extra.get("sources") or [],
+                "research_address_resolves": extra.get("address_resolves", True),
+                "research_property_kind": extra.get("property_kind"),
+            })
         property_details = research.get("property_details") or {}
         # Backfill authoritative Zoho facts the web research may have missed.
         if isinstance(property_details, dict) and zoho_contact:
@@ -390,7 +514,8 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
         if not property_details:
             logger.warning("Property research returned nothing for '%s' — limited property info", address)
         else:
-            logger.info("Property research complete (found=%s)", research.get("found"))
+            logger.info("Property research complete (found=%s, partial=%s)",
+                        research.get("found"), research.get("partial"))
 
         # --- Neighboring projects from the Zoho cache ---
         logger.info("Looking up neighboring projects...")
@@ -442,6 +567,7 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
             "owner_summary": research.get("owner_summary"),
             "research_address_resolves": research.get("address_resolves", True),
             "research_property_kind": research.get("property_kind"),
+            "additional_properties": additional_properties,
             "zoho_contact": zoho_contact,
             "zoho_notes": zoho_notes,
         }
@@ -478,7 +604,8 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
         # Report output dir is env-configurable so it can point at a mounted
         # persistent disk (with REPORT_JOBS_DIR) for durability across redeploys.
         output_dir = os.environ.get("REPORT_OUTPUT_DIR") or "data"
-        output_path = doc_generator.generate_report(final_data, output_dir=output_dir, file_name=file_name)
+        output_path = doc_generator.generate_report(final_data, output_dir=output_dir, file_name=file_name,
+                                                    prefetch_token=prefetch_token)
         
         if not output_path:
             raise Exception("Failed to generate report")
@@ -489,6 +616,8 @@ def process_transcript_and_generate_report(transcript_path: str, address: str =
     except Exception as e:
         logger.error(f"Error in process_transcript_and_generate_report: {str(e)}")
         raise
+    finally:
+        image_prefetch.get_image_prefetcher().release(prefetch_token)
 
 @app.get("/")
 async def root():
@@ -499,7 +628,8 @@ async def root():
 async def generate_report(
     transcript_file: UploadFile = File(...),
     address: str = None,
-    last_name: str = None
+    last_name: str = None,
+    research_tier: str = None
 ):
     """
     Generate a pre-walkthrough report from a transcript file.
@@ -508,6 +638,7 @@ async def generate_report(
         transcript_file: The transcript file (txt, docx, pdf)
         address: Property address (optional, will be extracted from transcript if not provided)
         last_name: Last name for the report (optional)
+        research_tier: Research depth — "fast", "standard" or "deep" (optional)
     
     Returns:
         The generated DOCX report file
@@ -516,20 +647,23 @@ async def generate_report(
         server_metrics["requests_processed"] += 1
         server_metrics["last_request"] = datetime.now().isoformat()
         logger.info(f"Received request to generate report for file: {transcript_file.filename}")
+        research_tier = validate_research_tier(research_tier)
         
-        # Validate the upload (size + extension) before persisting it.
-        content = await transcript_file.read()
-        if len(content) > MAX_UPLOAD_BYTES:
-            raise HTTPException(status_code=413, detail="Transcript file too large.")
+        # Validate the extension, then stream the upload to disk in chunks so a
+        # large file is never held in memory; the size limit is enforced as it arrives.
         safe_name = os.path.basename(transcript_file.filename or "transcript")
         ext = Path(safe_name).suffix.lower()
         if ext and ext not in ALLOWED_TRANSCRIPT_EXTS:
             raise HTTPException(status_code=415, detail=f"Unsupported file type: {ext}")
 
-        # Create a temporary file to save the uploaded transcript
         with tempfile.NamedTemporaryFile(delete=False, suffix=f"_{safe_name}") as temp_file:
-            temp_file.write(content)
             temp_file_path = temp_file.name
+            written = 0
+            while chunk := await transcript_file.read(UPLOAD_CHUNK_BYTES):
+                written += len(chunk)
+                if written > MAX_UPLOAD_BYTES:
+                    raise HTTPException(status_code=413, detail="Transcript file too large.")
+                temp_file.write(chunk)
         
         logger.info(f"Saved transcript to temporary file: {temp_file_path}")
         
@@ -537,7 +671,8 @@ async def generate_report(
         report_path = process_transcript_and_generate_report(
             transcript_path=temp_file_path,
             address=address,
-            last_name=last_name
+            last_name=last_name,
+            research_tier=research_tier
         )
         
         # Clean up the temporary transcript file
@@ -572,23 +707,11 @@ class TranscriptRequest(BaseModel):
     transcript_text: str
     address: str = None
     last_name: str = None
+    research_tier: str = None  # "fast" | "standard" | "deep"; default RESEARCH_TIER
 
 def flatten_jsonl_transcript(transcript_text: str) -> str:
-    """Convert JSONL transcript (if detected) to plain text, else return as-is."""
-    lines = transcript_text.strip().splitlines()
-    parsed_lines = []
-    for line in lines:
-        try:
-            obj = json.loads(line)
-            # If the object is {"": "Speaker: text"}, extract the value
-            if isinstance(obj, dict) and "" in obj:
-                parsed_lines.append(obj[""])
-            else:
-                parsed_lines.append(str(obj))
-        except Exception:
-            # Not JSON, treat as plain text
-            parsed_lines.append(line)
-    return "\n".join(parsed_lines)
+    """Convert JSONL / JSON / VTT / SRT transcripts to speaker-turn text; plain text is returned as-is."""
+    return transcript_formats.flatten_transcript(transcript_text.strip())
 
 @app.post("/generate-report-from-text")
 async def generate_report_from_text(request: TranscriptRequest):
@@ -599,12 +722,14 @@ async def generate_report_from_text(request: TranscriptRequest):
         transcript_text: The transcript text content
         address: Property address (optional, will be extracted from transcript if not provided)
         last_name: Last name for the report (optional)
+        research_tier: Research depth — "fast", "standard" or "deep" (optional)
     
     Returns:
         The generated DOCX report file
     """
     try:
         logger.info("Received request to generate report from text")
+        research_tier = validate_research_tier(request.research_tier)
         
         # Validate transcript content
         if not request.transcript_text or not request.transcript_text.strip():
@@ -635,7 +760,8 @@ async def generate_report_from_text(request: TranscriptRequest):
         report_path = process_transcript_and_generate_report(
             transcript_path=temp_file_path,
             address=request.address,
-            last_name=request.last_name
+            last_name=request.last_name,
+            research_tier=research_tier
         )
         # Clean up the temporary transcript file
         os.unlink(temp_file_path)
@@ -756,7 +882,8 @@ def _prune_report_jobs() -> None:
         logger.warning("Report-job prune failed: %s", e)
 
 
-def _run_report_job(job_id: str, flattened: str, address: Optional[str], last_name: Optional[str]) -> None:
+def _run_report_job(job_id: str, flattened: str, address: Optional[str], last_name: Optional[str],
+                    research_tier: Optional[str] = None) -> None:
     temp_file_path = None
     try:
         with tempfile.NamedTemporaryFile(delete=False, suffix=".txt", mode="w") as temp_file:
@@ -765,6 +892,7 @@ def _run_report_job(job_id: str, flattened: str, address: Optional[str], last_na
         report_path = process_transcript_and_generate_report(
             transcript_path=temp_file_path, address=address, last_name=last_name,
             output_name=f"PreWalk_{job_id}",  # unique on-disk name per job
+            research_tier=research_tier, priority=api_governor.PRIORITY_NORMAL,
         )
         if temp_file_path and os.path.exists(temp_file_path):
             os.unlink(temp_file_path)
@@ -807,6 +935,7 @@ async def generate_report_from_text_async(request: TranscriptRequest, http_reque
     """
     if not request.transcript_text or not request.transcript_text.strip():
         raise HTTPException(status_code=400, detail="Transcript text is required and cannot be empty")
+    research_tier = validate_research_tier(request.research_tier)
     flattened = flatten_jsonl_transcript(request.transcript_text)
     if not flattened or not flattened.strip():
         raise HTTPException(status_code=400, detail="Transcript text appears to be empty or invalid")
@@ -819,10 +948,11 @@ async def generate_report_from_text_async(request: TranscriptRequest, http_reque
     _report_jobs[job_id] = {"status": "running"}
     threading.Thread(
         target=_run_report_job,
-        args=(job_id, flattened, request.address, request.last_name),
+        args=(job_id, flattened, request.address, request.last_name, research_tier),
         daemon=True,
     ).start()
-    logger.info("Started async report job %s (address=%r)", job_id, request.address)
+    logger.info("Started async report job %s (address=%r, research_tier=%s)",
+                job_id, request.address, research_tier or property_research.DEFAULT_TIER)
     location = f"{_absolute_base_url(http_request)}/report-status/{job_id}"
     return JSONResponse(
         status_code=202,
@@ -867,6 +997,14 @@ async def get_config(_: bool = Depends(require_admin)):
     """Get current configuration (admin only; secrets redacted)"""
     return _redact_config(config_manager.config)
 
+@app.post("/pre-research")
+async def start_pre_research(_: bool = Depends(require_admin)):
+    """Start a pre-research batch now (admin only); progress shows under /metrics."""
+    if pre_research.get_pre_researcher().stats()["running"]:
+        return JSONResponse(status_code=409, content={"message": "Pre-research is already running"})
+    threading.Thread(target=_run_pre_research, daemon=True).start()
+    return JSONResponse(status_code=202, content={"message": "Pre-research started"})
+
 @app.post("/config/reload")
 async def reload_config(_: bool = Depends(require_admin)):
     """Reload configuration from file (admin only)"""
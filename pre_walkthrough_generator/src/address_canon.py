@@ -0,0 +1,234 @@
+"""Shared address canonicalization.
+
+Addresses reach the pipeline in many spellings — '305 E 24th St, Apt 8C, New
+York, NY 10010' from the transcript, '305 East 24th Street #8c' from Zoho,
+'305 E 24th St Apt 8C' from RapidAPI — and several modules used to compare them
+with their own chain of ``re.sub`` calls (research cache keys, Zoho contact
+matching, neighboring-project building matching, listing validation, geocode
+cache keys, report address cleanup). This module does it once:
+
+  - ``parse_address`` splits an address into canonical parts (number,
+    direction, street, street type, unit, city, state, ZIP) with abbreviations
+    expanded and ordinals stripped, so '305 E 24th St' and '305 East 24
+    Street' parse identically (as do 'NE 103rd St' and 'Northeast 103rd
+    Street'). ``AddressParts`` also gives the building/unit keys the research
+    cache stores under
+  - ``strip_unit`` drops unit / suite / floor designations and returns the
+    lowercase street address (the geocode cache key)
+  - ``clean_address`` is the display cleanup applied to extracted addresses
+    ('apartment 8c' -> 'Apt 8c', 'St' -> 'Street' after a street name)
+
+Patterns are compiled once and results are memoized (LRU), since the same few
+addresses are canonicalized over and over within a report.
+"""
+import re
+from functools import lru_cache
+from typing import NamedTuple, Tuple
+
+_MEMO_SIZE = 4096
+
+STREET_TYPES = {
+    "street": "street", "st": "street", "str": "street",
+    "avenue": "avenue", "ave": "avenue", "av": "avenue",
+    "road": "road", "rd": "road",
+    "place": "place", "pl": "place",
+    "plaza": "plaza", "plz": "plaza",
+    "drive": "drive", "dr": "drive",
+    "boulevard": "boulevard", "blvd": "boulevard",
+    "lane": "lane", "ln": "lane",
+    "terrace": "terrace", "ter": "terrace",
+    "court": "court", "ct": "court",
+    "way": "way",
+    "circle": "circle", "cir": "circle",
+    "parkway": "parkway", "pkwy": "parkway",
+    "highway": "highway", "hwy": "highway",
+    "square": "square", "sq": "square",
+}
+DIRECTIONS = {"e": "east", "w": "west", "n": "north", "s": "south"}
+# Diagonals are written both ways ("NE 103rd St", "Northeast 24th Street");
+# canonical is the abbreviation, and only in the direction slot, so street
+# names like "Prospect Park Southwest" are left alone.
+DIAGONALS = {"northeast": "ne", "northwest": "nw", "southeast": "se", "southwest": "sw"}
+_CANON_WORDS = {**STREET_TYPES, **DIRECTIONS}
+_DIRECTION_NAMES = frozenset(DIRECTIONS.values()) | frozenset(DIAGONALS.values())
+_TYPE_NAMES = frozenset(STREET_TYPES.values())
+
+_UNIT_RE = re.compile(r"(?:\b(?:apt|apartment|unit|suite|ste|ph|floor)\b\.?|#)\s*#?\s*([a-z0-9-]+)", re.IGNORECASE)
+# A unit marker straight after the house number is the street name ("10 Floor Ave").
+_UNIT_AFTER_NUMBER_RE = re.compile(r"^\s*\d+(?:-\d+)?[a-z]?\s*$", re.IGNORECASE)
+_ORDINAL_RE = re.compile(r"\b(\d+)(?:st|nd|rd|th)\b")
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9 ]")
+_SPACES_RE = re.compile(r"\s+")
+_STATE_ZIP_RE = re.compile(r"^(?:([a-z]{2})(?:\s+(\d{5})(?:\s+\d{4})?)?|(\d{5})(?:\s+\d{4})?)$")
+_CITY_STATE_ZIP_RE = re.compile(r"\s+([a-z]{2})(?:\s+(\d{5})(?:\s+\d{4})?)?$")
+_PAREN_RE = re.compile(r"\s*\(.*?\)")
+_NUMBER_RE = re.compile(r"\s*(\d+(?:-\d+)?[a-z]?)\b", re.IGNORECASE)
+
+# strip_unit: the rules the geocode cache keys were built with. "unit" and the
+# apt/suite words need whitespace before the identifier so "United" and
+# "Eastern" survive.
+_STRIP_UNIT_RES = (
+    (re.compile(r"\s*[,]?\s*[#]?\s*(?:apt\.?|apartment|suite|ste\.?)\s+[#]?\s*[a-zA-Z0-9/\-]+", re.IGNORECASE), ""),
+    (re.compile(r"\s+unit\s+[a-zA-Z0-9/\-]+", re.IGNORECASE), ""),
+    (re.compile(r"\s+(?:fl\.?|floor)\s*\d+", re.IGNORECASE), ""),
+    (re.compile(r"\s*[,]?\s*#[a-zA-Z0-9/\-]+"), ""),
+    (_PAREN_RE, ""),
+    (re.compile(r"\s+"), " "),
+)
+
+# clean_address: only expand abbreviations that clearly follow a street name,
+# so state codes survive ("Ct" could be Connecticut, so it is left alone).
+_CLEAN_UNIT_RE = re.compile(r"(?i)\b(apartment|apt\.?|unit)\s*#?\s*(\w+)")
+_CLEAN_ABBR_RES = (
+    (re.compile(r"\b(\d+\s+\w+\s+)Pl\b\.?", re.IGNORECASE), r"\1Place"),
+    (re.compile(r"\b(\d+\s+\w+\s+)St\b\.?", re.IGNORECASE), r"\1Street"),
+    (re.compile(r"\b(\d+\s+\w+\s+)Ave\b\.?", re.IGNORECASE), r"\1Avenue"),
+    (re.compile(r"\b(\d+\s+\w+\s+)Rd\b\.?", re.IGNORECASE), r"\1Road"),
+    (re.compile(r"\bPkwy\b\.?", re.IGNORECASE), "Parkway"),
+)
+
+
+class AddressParts(NamedTuple):
+    line: str          # canonical street line, no unit: '305 east 24 street'
+    number: str        # '305', '35-15'
+    direction: str     # 'east', 'ne', '' (only when it precedes the street name)
+    street: str        # '24', 'sutton', 'prospect park southwest'
+    street_type: str   # 'street', 'avenue', '' when the address has none ('100 broadway')
+    unit: str          # '8c', ''
+    city: str          # 'new york', ''
+    state: str         # 'ny', ''
+    zip: str           # '10010', ''
+
+    @property
+    def building_key(self) -> str:
+        """Canonical street line: shared by every unit in the building. The city
+        is left out because transcript addresses often don't have one, and the
+        key must match the one stored from a full mailing address."""
+        return self.line
+
+    @property
+    def unit_key(self) -> str:
+        return f"{self.building_key}|{self.unit}" if self.unit else self.building_key
+
+
+def canon_words(text: str) -> str:
+    """Lowercase words with punctuation dropped, ordinals stripped and street
+    types / directions expanded: '305 E. 24th St' -> '305 east 24 street'."""
+    text = _ORDINAL_RE.sub(r"\1", _NON_ALNUM_RE.sub(" ", str(text or "").lower()))
+    return " ".join(_CANON_WORDS.get(t, t) for t in text.split())
+
+
+def _find_unit(text: str):
+    """First unit-marker match that is really a unit, or None."""
+    for m in _UNIT_RE.finditer(text):
+        if m.group(1).lower() in STREET_TYPES or _UNIT_AFTER_NUMBER_RE.match(text[:m.start()]):
+            continue
+        return m
+    return None
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def parse_address(address: str) -> AddressParts:
+    """Canonical parts of a free-form US address (never raises; missing parts are '').
+
+    A leading direction word is the direction only when a street name follows
+    it; before a bare street type it is the street name itself:
+
+    >>> parse_address("305 E 24th St, Apt 8C, New York, NY 10010")[1:6]
+    ('305', 'east', '24', 'street', '8c')
+    >>> parse_address("1 West St, New York, NY")[1:5]
+    ('1', '', 'west', 'street')
+    >>> parse_address("250 South Ave")[1:5] != parse_address("250 South St")[1:5]
+    True
+
+    "CT" after the city is Connecticut, not "court":
+
+    >>> parse_address("1 Main St Ste 200, Stamford, CT 06901")[5:]
+    ('200', 'stamford', 'ct', '06901')
+
+    A unit marker needs a value that isn't a street type, and is never the word
+    after the house number:
+
+    >>> parse_address("10 Floor Ave")[:6]
+    ('10 floor avenue', '10', '', 'floor', 'avenue', '')
+    >>> parse_address("4 Ph Ave, Brooklyn, NY")[:8]
+    ('4 ph avenue', '4', '', 'ph', 'avenue', '', 'brooklyn', 'ny')
+    >>> parse_address("10 Floor Ave, Apt 3")[5]
+    '3'
+    """
+    text = _PAREN_RE.sub("", str(address or ""))
+    unit_m = _find_unit(text)
+    unit = unit_m.group(1).lower() if unit_m else ""
+    if unit_m:
+        text = text[:unit_m.start()] + "," + text[unit_m.end():]
+    parts = [p.strip() for p in text.split(",") if p.strip()]
+    line = canon_words(parts[0]) if parts else ""
+
+    city = state = zip_code = ""
+    for p in parts[1:]:
+        # State/ZIP are matched before canon_words, which would read "CT" as "court".
+        raw = _SPACES_RE.sub(" ", _NON_ALNUM_RE.sub(" ", p.lower())).strip()
+        m = _STATE_ZIP_RE.match(raw)
+        if m:
+            state = state or m.group(1) or ""
+            zip_code = zip_code or m.group(2) or m.group(3) or ""
+        elif raw and not city:
+            # "New York NY 10010" -> "new york"
+            tail = _CITY_STATE_ZIP_RE.search(raw)
+            if tail:
+                state, zip_code = state or tail.group(1), zip_code or tail.group(2) or ""
+                raw = raw[:tail.start()]
+            city = canon_words(raw)
+
+    tokens = line.split()
+    number = ""
+    num_m = _NUMBER_RE.match(parts[0]) if parts else None
+    if num_m:
+        number = num_m.group(1).lower()
+        tokens = tokens[len(canon_words(number).split()):]
+    direction = ""
+    if (len(tokens) > 1 and tokens[1] not in _TYPE_NAMES
+            and DIAGONALS.get(tokens[0], tokens[0]) in _DIRECTION_NAMES):
+        direction, tokens = DIAGONALS.get(tokens[0], tokens[0]), tokens[1:]
+        if num_m:
+            line = " ".join([canon_words(number), direction] + tokens)
+    street_type = ""
+    for i in range(len(tokens) - 1, 0, -1):
+        if tokens[i] in _TYPE_NAMES:
+            street_type, tokens = tokens[i], tokens[:i]
+            break
+    return AddressParts(line, number, direction, " ".join(tokens), street_type, unit, city, state, zip_code)
+
+
+def address_keys(address: str) -> Tuple[str, str]:
+    """(building_key, unit_key) for an address; unit_key == building_key when there is no unit.
+
+    '305 E 24th St, Apt 8C, New York, NY 10010' and '305 East 24th Street #8c'
+    share building key '305 east 24 street' and unit key '305 east 24
+    street|8c'. City, state and ZIP are ignored so their presence or absence
+    doesn't split a building.
+    """
+    parts = parse_address(str(address or ""))
+    return parts.building_key, parts.unit_key
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def strip_unit(address: str) -> str:
+    """Lowercase address without unit / apt / suite / floor designations or
+    parentheticals: '350 E 24th St Apt 8C (rear)' -> '350 e 24th st'."""
+    if not address:
+        return ""
+    addr = address.strip()
+    for pattern, repl in _STRIP_UNIT_RES:
+        addr = pattern.sub(repl, addr)
+    return addr.strip().rstrip(",").rstrip(".").strip().lower()
+
+
+@lru_cache(maxsize=_MEMO_SIZE)
+def clean_address(address: str) -> str:
+    """Clean and standardize address format"""
+    address = " ".join(address.split())
+    address = _CLEAN_UNIT_RE.sub(r"Apt \2", address)
+    for pattern, repl in _CLEAN_ABBR_RES:
+        address = pattern.sub(repl, address)
+    return address
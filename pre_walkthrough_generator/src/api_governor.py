@@ -0,0 +1,194 @@
+"""Process-wide adaptive concurrency limit for Anthropic calls.
+
+Every report job — extraction, research rounds and sub-queries, floor-plan
+vision checks — calls Anthropic on its own, and several jobs run at once
+(async reports, pre-research). Under load the API answers 429 (rate limited)
+or 529 (overloaded), and a research call that just fails costs the report its
+property section. ``ConcurrencyGovernor`` sits in front of all of them:
+
+  - a call takes a slot before it starts; at most ``limit`` calls are in flight
+    process-wide and the rest wait, highest priority first (interactive
+    requests, then async jobs, then background pre-research), FIFO within a
+    priority
+  - the limit adapts AIMD-style: +1/limit per successful call (about +1 per
+    "window" of calls), halved on a 429/529 (at most once per cooldown), and
+    held — not raised — while calls run slower than LATENCY_FACTOR x the
+    usual latency for that task
+  - after a 429/529, new calls pause for the server's retry-after (or an
+    exponential backoff) so the queue drains instead of hammering the API
+
+Callers retry an overloaded call through the queue while their deadline
+allows, rather than failing it. Waiting respects the caller's Deadline.
+
+Configure with ANTHROPIC_CONCURRENCY (starting limit, default 6),
+ANTHROPIC_MIN_CONCURRENCY (1), ANTHROPIC_MAX_CONCURRENCY (16); API_GOVERNOR=off
+disables it.
+"""
+import heapq
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional
+
+try:
+    from deadline import Deadline, DeadlineExceeded
+except ImportError:
+    from .deadline import Deadline, DeadlineExceeded
+
+logger = logging.getLogger(__name__)
+
+# Lower runs first.
+PRIORITY_INTERACTIVE = 0   # a caller is waiting on the HTTP response
+PRIORITY_NORMAL = 1        # async report jobs
+PRIORITY_BACKGROUND = 2    # pre-research and other speculative work
+
+API_GOVERNOR = os.environ.get("API_GOVERNOR", "on").strip().lower() not in ("off", "0", "false", "no")
+ANTHROPIC_CONCURRENCY = int(os.environ.get("ANTHROPIC_CONCURRENCY", 6))
+ANTHROPIC_MIN_CONCURRENCY = int(os.environ.get("ANTHROPIC_MIN_CONCURRENCY", 1))
+ANTHROPIC_MAX_CONCURRENCY = int(os.environ.get("ANTHROPIC_MAX_CONCURRENCY", 16))
+
+_DECREASE = 0.5            # multiplicative decrease on overload
+_DECREASE_COOLDOWN_S = 5.0 # one burst of 429s counts as one congestion signal
+_LATENCY_FACTOR = 2.0      # slower than this x a task's usual latency -> hold the limit
+_BASELINE_ALPHA = 0.1      # EWMA weight of a new latency sample
+_BACKOFF_BASE_S, _BACKOFF_CAP_S = 1.0, 30.0
+_OVERLOAD_STATUS = (429, 529)
+_OVERLOAD_ERRORS = ("RateLimitError", "OverloadedError")
+
+
+def is_overload(exc: BaseException) -> bool:
+    """True for a 429 rate-limit or 529 overloaded response."""
+    return (getattr(exc, "status_code", None) in _OVERLOAD_STATUS
+            or type(exc).__name__ in _OVERLOAD_ERRORS)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    """Seconds from the response's retry-after header, if any."""
+    headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+    try:
+        value = float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+    return value if value >= 0 else None
+
+
+class ConcurrencyGovernor:
+    """AIMD in-flight limit with a priority wait queue."""
+
+    def __init__(self, start: int = ANTHROPIC_CONCURRENCY, min_limit: int = ANTHROPIC_MIN_CONCURRENCY,
+                 max_limit: int = ANTHROPIC_MAX_CONCURRENCY, enabled: bool = API_GOVERNOR):
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(self.max_limit, max(self.min_limit, start)))
+        self.enabled = enabled
+        self.in_flight = 0
+        self.paused_until = 0.0
+        self.counts = {"calls": 0, "overloads": 0, "decreases": 0, "queued": 0, "timeouts": 0}
+        self.max_wait_s = 0.0
+        self._consecutive_overloads = 0
+        self._last_decrease = 0.0
+        self._baseline: Dict[str, float] = {}
+        self._waiting: list = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+
+    def _can_start(self, ticket) -> bool:
+        return (self._waiting[0] == ticket and self.in_flight < int(self.limit)
+                and time.monotonic() >= self.paused_until)
+
+    def acquire(self, priority: int = PRIORITY_NORMAL, deadline: Optional[Deadline] = None,
+                step: str = "anthropic call") -> None:
+        """Wait for a slot; DeadlineExceeded if ``deadline`` runs out first."""
+        if not self.enabled:
+            return
+        ticket = (priority, next(self._seq))
+        started = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._waiting, ticket)
+            if not self._can_start(ticket):
+                self.counts["queued"] += 1
+            try:
+                while not self._can_start(ticket):
+                    paused_s = self.paused_until - time.monotonic()
+                    wait = paused_s if paused_s > 0 else 1.0
+                    if deadline is not None:
+                        if deadline.remaining() <= 0 or deadline.cancelled:
+                            self.counts["timeouts"] += 1
+                            raise DeadlineExceeded(f"{step}: no API slot within the job budget "
+                                                   f"({self.in_flight} in flight, limit {int(self.limit)})")
+                        wait = min(wait, deadline.remaining())
+                    self._cond.wait(min(wait, 1.0))
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            self.counts["calls"] += 1
+            self.max_wait_s = max(self.max_wait_s, time.monotonic() - started)
+            self._cond.notify_all()
+
+    def release(self, task: str, latency_s: float, error: Optional[BaseException] = None) -> None:
+        """Free a slot and feed the call's outcome into the limit."""
+        if not self.enabled:
+            return
+        with self._cond:
+            self.in_flight -= 1
+            now = time.monotonic()
+            if error is not None and is_overload(error):
+                self.counts["overloads"] += 1
+                decrease = now - self._last_decrease >= _DECREASE_COOLDOWN_S
+                if decrease:
+                    # Calls failing together are one congestion event: one cut, one backoff step.
+                    self._last_decrease = now
+                    self._consecutive_overloads += 1
+                    self.counts["decreases"] += 1
+                    self.limit = max(float(self.min_limit), self.limit * _DECREASE)
+                backoff = _retry_after(error)
+                if backoff is None:
+                    backoff = _BACKOFF_BASE_S * 2 ** max(0, self._consecutive_overloads - 1)
+                backoff = min(backoff, _BACKOFF_CAP_S)
+                self.paused_until = max(self.paused_until, now + backoff)
+                if decrease:
+                    logger.warning("Anthropic %s — concurrency limit down to %d, pausing %.1fs",
+                                   type(error).__name__, int(self.limit), backoff)
+            elif error is None:
+                self._consecutive_overloads = 0
+                baseline = self._baseline.get(task)
+                if baseline is not None and latency_s > _LATENCY_FACTOR * baseline:
+                    pass  # slow responses: hold the limit, don't add load
+                else:
+                    self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+                self._baseline[task] = (latency_s if baseline is None
+                                        else baseline + _BASELINE_ALPHA * (latency_s - baseline))
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, task: str, priority: int = PRIORITY_NORMAL,
+             deadline: Optional[Deadline] = None) -> Iterator[None]:
+        """Hold a slot for one call; its outcome (error or latency) adjusts the limit."""
+        self.acquire(priority, deadline, task)
+        started = time.monotonic()
+        try:
+            yield
+        except BaseException as e:
+            self.release(task, time.monotonic() - started, e)
+            raise
+        self.release(task, time.monotonic() - started)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {"enabled": self.enabled, "limit": round(self.limit, 2), "in_flight": self.in_flight,
+                    "waiting": len(self._waiting), "max_wait_s": round(self.max_wait_s, 2),
+                    "paused_s": round(max(0.0, self.paused_until - time.monotonic()), 1), **self.counts}
+
+
+_governor = ConcurrencyGovernor()
+
+
+def get_governor() -> ConcurrencyGovernor:
+    return _governor
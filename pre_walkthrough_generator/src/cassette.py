@@ -0,0 +1,261 @@
+"""Record/replay for the pipeline's paid and rate-limited external calls.
+
+The report pipeline talks to three outside services: Anthropic (extraction,
+web-search research, vision checks), Zoho CRM and Nominatim geocoding. None of
+them can be benchmarked or regression-tested for free. This module wraps those
+calls so that:
+
+  - record : real responses are saved to cassette files (one JSON file per
+             distinct request) alongside the wall time the call took
+  - replay : responses are served from the cassette, deterministically, with
+             zero latency or the recorded ("realistic") latency; a request that
+             was never recorded raises CassetteMiss instead of going live
+  - off    : (default) calls pass straight through, no overhead
+
+Configure with PREWALK_CASSETTE_MODE (off/record/replay), PREWALK_CASSETTE_DIR
+(default data/cassettes) and PREWALK_CASSETTE_LATENCY ("zero", "realistic" or a
+float scale factor on the recorded latency), or programmatically via
+``configure()`` (the benchmarks do this).
+
+Requests are keyed by a SHA-256 of their canonical JSON, so the same transcript
+and address always map to the same recorded response.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+MODES = ("off", "record", "replay")
+_DEFAULT_DIR = Path(__file__).parent.parent.parent / "data" / "cassettes"
+
+
+class CassetteMiss(LookupError):
+    """A replayed request has no recorded response."""
+
+
+def _jsonable(obj: Any) -> Any:
+    """Plain-JSON view of SDK responses, replayed namespaces and request kwargs."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    if isinstance(obj, SimpleNamespace):
+        return {k: _jsonable(v) for k, v in vars(obj).items()}
+    if isinstance(obj, dict):
+        return {str(k): _jsonable(v) for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [_jsonable(v) for v in obj]
+    if isinstance(obj, (str, int, float, bool)) or obj is None:
+        return obj
+    return str(obj)
+
+
+def _to_namespace(obj: Any) -> Any:
+    """Rebuild attribute access (``resp.content[0].text``) from recorded JSON."""
+    if isinstance(obj, dict):
+        return SimpleNamespace(**{k: _to_namespace(v) for k, v in obj.items()})
+    if isinstance(obj, list):
+        return [_to_namespace(v) for v in obj]
+    return obj
+
+
+class Cassette:
+    """Process-wide record/replay store."""
+
+    def __init__(self, mode: str = "off", directory: Optional[str] = None, latency: str = "zero"):
+        self.configure(mode, directory, latency)
+        self.hits = 0
+        self.misses = 0
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def configure(self, mode: str = "off", directory: Optional[str] = None, latency: str = "zero") -> None:
+        mode = (mode or "off").strip().lower()
+        if mode not in MODES:
+            logger.warning("Unknown cassette mode %r — using 'off'", mode)
+            mode = "off"
+        self.mode = mode
+        self.directory = Path(directory) if directory else _DEFAULT_DIR
+        self.latency = str(latency or "zero").strip().lower()
+        if mode != "off":
+            logger.info("Cassette %s mode (dir=%s, latency=%s)", mode, self.directory, self.latency)
+
+    @property
+    def replaying(self) -> bool:
+        return self.mode == "replay"
+
+    @staticmethod
+    def key(service: str, request: Any) -> str:
+        blob = json.dumps({"service": service, "request": _jsonable(request)}, sort_keys=True)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, service: str, key: str) -> Path:
+        return self.directory / service / f"{key}.json"
+
+    def _replay_delay(self, recorded_s: float) -> float:
+        if self.latency == "zero":
+            return 0.0
+        if self.latency == "realistic":
+            return recorded_s
+        try:
+            return recorded_s * float(self.latency)
+        except ValueError:
+            return 0.0
+
+    def call(self, service: str, request: Any, live: Callable[[], Any],
+             encode: Callable[[Any], Any] = _jsonable,
+             decode: Callable[[Any], Any] = lambda v: v) -> Any:
+        """Run ``live()`` (off/record) or serve its recorded result (replay).
+
+        ``encode`` turns the live result into JSON for the cassette; ``decode``
+        turns the stored JSON back into what callers expect.
+        """
+        if self.mode == "off":
+            return live()
+        key = self.key(service, request)
+        path = self._path(service, key)
+        if self.mode == "replay":
+            try:
+                with open(path) as f:
+                    entry = json.load(f)
+            except FileNotFoundError:
+                with self._lock:
+                    self.misses += 1
+                raise CassetteMiss(f"No recorded {service} response for request {key[:12]}")
+            with self._lock:
+                self.hits += 1
+            delay = self._replay_delay(float(entry.get("latency_s") or 0.0))
+            if delay > 0:
+                time.sleep(delay)
+            return decode(entry["response"])
+
+        started = time.monotonic()
+        result = live()
+        entry = {
+            "service": service,
+            "request": _jsonable(request),
+            "response": encode(result),
+            "latency_s": round(time.monotonic() - started, 4),
+            "recorded_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry, f, indent=1)
+            os.replace(tmp, path)
+            with self._lock:
+                self.recorded += 1
+        except OSError as e:
+            logger.warning("Could not record %s cassette %s: %s", service, key[:12], e)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        return {"mode": self.mode, "hits": self.hits, "misses": self.misses, "recorded": self.recorded}
+
+
+_cassette = Cassette(
+    os.environ.get("PREWALK_CASSETTE_MODE", "off"),
+    os.environ.get("PREWALK_CASSETTE_DIR"),
+    os.environ.get("PREWALK_CASSETTE_LATENCY", "zero"),
+)
+
+
+def get_cassette() -> Cassette:
+    return _cassette
+
+
+def configure(mode: str = "off", directory: Optional[str] = None, latency: str = "zero") -> Cassette:
+    """(Re)configure the process-wide cassette, e.g. from a benchmark harness."""
+    _cassette.configure(mode, directory, latency)
+    return _cassette
+
+
+def is_replaying() -> bool:
+    """True when external calls are served from recordings (skip politeness sleeps)."""
+    return _cassette.replaying
+
+
+# Per-request transport options; they don't change the response, so they are
+# left out of the cassette key (deadline-sized timeouts vary run to run).
+_TRANSPORT_KWARGS = ("timeout", "extra_headers")
+
+
+class RecordedStream:
+    """``messages.stream`` stand-in over a complete (recorded) message.
+
+    Yields the two MessageStream events the pipeline reads — ``text`` deltas and
+    ``content_block_stop`` carrying the finished block — then serves
+    ``get_final_message()``.
+    """
+
+    def __init__(self, message):
+        self._message = message
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def __iter__(self):
+        for block in getattr(self._message, "content", None) or []:
+            if getattr(block, "type", None) == "text":
+                yield SimpleNamespace(type="text", text=block.text)
+            yield SimpleNamespace(type="content_block_stop", content_block=block)
+
+    def get_final_message(self):
+        return self._message
+
+
+class _CassetteMessages:
+    """``client.messages`` proxy that records/replays ``create`` and ``stream``."""
+
+    def __init__(self, messages, cassette: Cassette):
+        self._messages = messages
+        self._cassette = cassette
+
+    def create(self, **kwargs):
+        request = {k: v for k, v in kwargs.items() if k not in _TRANSPORT_KWARGS}
+        return self._cassette.call("anthropic", request, lambda: self._messages.create(**kwargs),
+                                   decode=_to_namespace)
+
+    def stream(self, **kwargs):
+        """Streams are recorded as their final message, under the same key as
+        ``create``, and replayed through RecordedStream."""
+        request = {k: v for k, v in kwargs.items() if k not in _TRANSPORT_KWARGS}
+
+        def live():
+            with self._messages.stream(**kwargs) as stream:
+                return stream.get_final_message()
+
+        return RecordedStream(self._cassette.call("anthropic", request, live, decode=_to_namespace))
+
+    def __getattr__(self, name):
+        return getattr(self._messages, name)
+
+
+class _CassetteClient:
+    """Anthropic client proxy; everything except ``messages`` passes through."""
+
+    def __init__(self, client, cassette: Cassette):
+        self._client = client
+        self.messages = _CassetteMessages(client.messages, cassette)
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def wrap_anthropic(client):
+    """Route an Anthropic client's ``messages.create`` / ``stream`` through the cassette.
+
+    Returns the client unchanged when record/replay is off.
+    """
+    if _cassette.mode == "off":
+        return client
+    return _CassetteClient(client, _cassette)
@@ -24,6 +24,11 @@ class Config:
         # but it is no longer used by the pipeline (migrated to Anthropic Claude).
         self.openai_api_key = os.getenv('OPENAI_API_KEY')
 
+        # Per-deployment model routing rules (see model_router). The MODEL_ROUTES
+        # env var is read by the router itself; config.json may carry a
+        # top-level "model_routing" block instead.
+        self.model_routing = None
+
         # Fill any still-missing values from config.json. Both the package-level and
         # repo-root files are consulted and merged (each only fills values still unset),
         # so a key present in either location is found regardless of which file holds it.
@@ -40,6 +45,9 @@ class Config:
                 print(f"Warning: Could not load {config_path}: {e}")
                 continue
 
+            if self.model_routing is None and isinstance(config_data.get('model_routing'), dict):
+                self.model_routing = config_data['model_routing']
+
             # Support both the nested {"api_keys": {...}} shape and a flat shape.
             api_keys = config_data.get('api_keys', config_data)
 
@@ -0,0 +1,84 @@
+"""Per-job latency budget shared by every step of a report.
+
+A report has to finish inside the 600s gunicorn worker window, but each step
+used to carry its own fixed timeout (a 420s research client timeout, a 240s
+"skip the gap-fill" heuristic) with no idea how much time the job as a whole had
+left. A ``Deadline`` is created once per job and passed down; each step asks it
+for a timeout, scales its search budget to what is left, and stops cleanly
+(``DeadlineExceeded`` / ``cancelled``) when the budget runs out.
+"""
+import threading
+import time
+from typing import Optional
+
+
+class DeadlineExceeded(TimeoutError):
+    """The job's latency budget ran out before a step could start or finish."""
+
+
+class Deadline:
+    """Monotonic-clock deadline with a cooperative cancel flag."""
+
+    def __init__(self, budget_s: float, started: Optional[float] = None,
+                 parent: Optional["Deadline"] = None):
+        self.budget_s = float(budget_s)
+        self.started = time.monotonic() if started is None else started
+        self.expires_at = self.started + self.budget_s
+        self._cancel = threading.Event()
+        self._parent = parent
+
+    def __repr__(self) -> str:
+        return f"Deadline({self.remaining():.1f}s of {self.budget_s:.0f}s left)"
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def remaining(self) -> float:
+        if self.cancelled:
+            return 0.0
+        left = self.expires_at - time.monotonic()
+        if self._parent is not None:
+            left = min(left, self._parent.remaining())
+        return max(0.0, left)
+
+    @property
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+    def cancel(self) -> None:
+        """Tell cooperating steps (e.g. sibling sub-queries) to stop."""
+        self._cancel.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancel.is_set() or (self._parent is not None and self._parent.cancelled)
+
+    def timeout(self, cap: float, reserve: float = 0.0) -> float:
+        """Seconds a step may take: at most ``cap``, leaving ``reserve`` for later steps."""
+        return max(0.0, min(cap, self.remaining() - reserve))
+
+    def check(self, step: str, need_s: float = 0.0) -> None:
+        """Raise DeadlineExceeded unless at least ``need_s`` seconds are left."""
+        if self.cancelled:
+            raise DeadlineExceeded(f"{step}: job cancelled")
+        if self.remaining() <= need_s:
+            raise DeadlineExceeded(f"{step}: {self.remaining():.0f}s left, needs {need_s:.0f}s")
+
+    def scaled(self, n: int, full_at_s: float, reserve: float = 0.0) -> int:
+        """Scale a tool budget (e.g. web_search max_uses) to the time left.
+
+        Full ``n`` when at least ``full_at_s`` seconds remain after ``reserve``,
+        proportionally fewer below that, never less than 1.
+        """
+        usable = self.remaining() - reserve
+        if usable >= full_at_s:
+            return n
+        return max(1, int(n * max(0.0, usable) / full_at_s))
+
+    def child(self, budget_s: float) -> "Deadline":
+        """A sub-deadline ending ``budget_s`` from now or with this one, whichever is first.
+
+        Cancelling the parent cancels the child; cancelling the child (e.g. to
+        stop a group of sub-queries) leaves the parent running.
+        """
+        return Deadline(max(0.0, min(budget_s, self.remaining())), parent=self)
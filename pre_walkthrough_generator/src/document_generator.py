@@ -11,18 +11,19 @@ from typing import Dict, Any, Optional
 from datetime import datetime
 import logging
 import re
-import requests
+import uuid
 from io import BytesIO
-from PIL import Image
+
+try:
+    from image_prefetch import get_image_prefetcher, report_image_urls
+except ImportError:
+    from .image_prefetch import get_image_prefetcher, report_image_urls
 
 logger = logging.getLogger(__name__)
 
 # Brand heading color (#231f20) applied to every report heading.
 HEADING_COLOR = RGBColor(0x23, 0x1F, 0x20)
 
-# Network timeout (seconds) for downloading images / floor plans.
-IMAGE_DOWNLOAD_TIMEOUT = 15
-
 # Cap how many neighboring projects are listed in the report so a large
 # neighborhood doesn't produce a giant table. The list is pre-sorted
 # (same-building first, then by amount), so the most relevant are shown.
@@ -130,6 +131,7 @@ def _address_kind(data: Dict[str, Any]):
 class DocumentGenerator:
     def __init__(self):
         self.doc = Document()
+        self._prefetch_token = ""
         self._setup_document()
 
     def _setup_document(self):
@@ -436,12 +438,12 @@ class DocumentGenerator:
             para = self.doc.add_paragraph(text)
             para.paragraph_format.space_after = Pt(6)
 
-    def _add_property_details(self, data: Dict[str, Any]):
+    def _add_property_details(self, data: Dict[str, Any], heading: str = 'Property Details', level: int = 1):
         """Add the Property Details section, adapted to what the address is:
         a park/landmark/area (no parcel) gets an explanatory note; a
         non-residential parcel drops beds/baths/HOA; a residential parcel gets
         the full table (with a note if no record was found at all)."""
-        self._heading('Property Details', level=1)
+        self._heading(heading, level=level)
 
         property_info = data.get('property_details', {}) or {}
         address = data.get('property_address') or property_info.get('address') or 'this address'
@@ -571,30 +573,9 @@ class DocumentGenerator:
         # photo_url; re-enable by restoring the embed here if wanted later.)
 
     def _download_image(self, url: str) -> Optional[BytesIO]:
-        """Download an image, downscale + re-encode as JPEG so an embedded photo or
-        floor plan can't bloat the .docx (a full-res photo was producing ~4 MB
-        reports — bad for SharePoint upload + mobile preview). If PIL can't process
-        it, return None (skip the embed) rather than dumping un-sized raw bytes."""
-        MAX_DIM = 1400  # px on the long side — plenty for a report image
-        try:
-            response = requests.get(url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
-            if response.status_code != 200:
-                logger.error("Image download failed: %s (status %s)", url, response.status_code)
-                return None
-            try:
-                img = Image.open(BytesIO(response.content)).convert('RGB')
-                if max(img.size) > MAX_DIM:
-                    img.thumbnail((MAX_DIM, MAX_DIM))
-                output = BytesIO()
-                img.save(output, format='JPEG', quality=85, optimize=True)
-                output.seek(0)
-                return output
-            except Exception as pil_e:
-                logger.error("PIL could not process image %s: %s", url, pil_e)
-                return None
-        except Exception as e:
-            logger.error("Exception downloading image %s: %s", url, e)
-        return None
+        """The downscaled JPEG for an image / floor plan URL, from the prefetch
+        started in generate_report (or fetched now); None if it can't be embedded."""
+        return get_image_prefetcher().take(url, self._prefetch_token)
 
     def _add_client_details(self, data: Dict[str, Any]):
         """Add client details section. Leads with the research-derived background
@@ -1218,7 +1199,7 @@ class DocumentGenerator:
                 f"Showing the {len(display)} most relevant of {len(neighboring_projects)} projects in this neighborhood."
             )
 
-    def _add_site_feasibility(self, data: Dict[str, Any]):
+    def _add_site_feasibility(self, data: Dict[str, Any], heading: str = 'Site & Feasibility', level: int = 1):
         """Zoning, flood zone, and renovation-feasibility notes from public-records research."""
         NA = (None, '', 'Information not available')
         zoning = data.get('research_zoning')
@@ -1228,7 +1209,7 @@ class DocumentGenerator:
         has_kv = zoning not in NA or flood not in NA
         if not has_kv and not notes:
             return  # nothing researched — skip the section entirely
-        self._heading('Site & Feasibility', level=1)
+        self._heading(heading, level=level)
         if has_kv:
             table = self.doc.add_table(rows=0, cols=2)
             table.style = 'Table Grid'
@@ -1263,6 +1244,18 @@ class DocumentGenerator:
             r.font.size = Pt(8)
             r.font.color.rgb = RGBColor(0x88, 0x88, 0x88)
 
+    def _add_additional_properties(self, data: Dict[str, Any]):
+        """One Property Details + Site & Feasibility block per other property the
+        consultation covered (rental unit, second home, ...)."""
+        for prop in data.get('additional_properties') or []:
+            if not isinstance(prop, dict) or not prop.get('property_address'):
+                continue
+            role = str(prop.get('role') or '').strip()
+            title = f"Additional Property: {prop['property_address']}"
+            self._heading(f"{title} ({role})" if role else title, level=1)
+            self._add_property_details(prop, heading='Property Details', level=2)
+            self._add_site_feasibility(prop, heading='Site & Feasibility', level=2)
+
     def _add_owner_profile(self, data: Dict[str, Any]):
         """Ownership + public professional context (no personal/financial/family/social detail)."""
         summary = data.get('owner_summary')
@@ -1288,21 +1281,29 @@ class DocumentGenerator:
         for n in notes:
             self.doc.add_paragraph(f"• {n}")
 
-    def generate_report(self, data: Dict[str, Any], output_dir: str = "data", file_name: str = None) -> Optional[str]:
+    def generate_report(self, data: Dict[str, Any], output_dir: str = "data", file_name: str = None,
+                        prefetch_token: Optional[str] = None) -> Optional[str]:
         """Generate the pre-walkthrough report.
 
         Each section is rendered in its own try/except so a single bad field can
-        never abort the entire report.
+        never abort the entire report. ``prefetch_token`` names image prefetches
+        the caller already started for this report (image_prefetch); they are
+        released when the report is done either way.
         """
+        self._prefetch_token = prefetch_token or uuid.uuid4().hex
         try:
             output_dir = Path(output_dir)
             output_dir.mkdir(parents=True, exist_ok=True)
 
+            # Images download while the sections ahead of Property Links render.
+            get_image_prefetcher().prefetch(report_image_urls(data), self._prefetch_token)
+
             sections = [
                 ('Header', self._add_header),
                 ('Executive Summary', self._add_executive_summary),
                 ('Property Details', self._add_property_details),
                 ('Site & Feasibility', self._add_site_feasibility),
+                ('Additional Properties', self._add_additional_properties),
                 ('Client Details', self._add_client_details),
                 # Owner Profile content is now folded into Client Details (top).
                 ('Property Links', self._add_property_links),
@@ -1345,6 +1346,8 @@ class DocumentGenerator:
         except Exception as e:
             logger.error("Error generating report: %s", e, exc_info=True)
             return None
+        finally:
+            get_image_prefetcher().release(self._prefetch_token)
 
     @staticmethod
     def _sanitize_filename(text: str, max_length: int = 100) -> str:
@@ -0,0 +1,274 @@
+"""Local floor-plan / photo classifier in front of the vision-model check.
+
+Research often proposes a ``floor_plan_url`` that is really a room photo, so each
+candidate used to go to a vision model call that fetched the image remotely.
+Most candidates are clear-cut, though: a floor plan is a line drawing — mostly
+white background, a handful of flat colours, thin dark edges — and a listing
+photo is none of those. ``FloorPlanClassifier`` therefore:
+
+  1. returns a cached verdict for the URL (no download at all)
+  2. downloads the candidate once, capped at FLOOR_PLAN_MAX_BYTES
+  3. returns a cached verdict for the content hash (same image, other URL)
+  4. decides locally from PIL statistics — palette size, edge density,
+     white-background ratio, saturation — when the numbers are unambiguous
+  5. only otherwise asks the model, sending the downloaded bytes (base64) so the
+     image is not fetched a second time
+
+Verdicts are cached by content hash (an image's verdict never changes) and by
+URL (re-checked after FLOOR_PLAN_URL_TTL_DAYS, since a URL's content can) in
+data/cache/floor_plan_verdicts.json. Any doubt — download failure, unreadable
+image, model error — counts as NOT a floor plan, as before.
+"""
+import base64
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from io import BytesIO
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from PIL import Image, ImageChops, ImageFilter
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_FILE = Path(__file__).parent.parent.parent / "data" / "cache" / "floor_plan_verdicts.json"
+
+FLOOR_PLAN_MAX_BYTES = int(os.environ.get("FLOOR_PLAN_MAX_BYTES", 8 * 1024 * 1024))
+FLOOR_PLAN_URL_TTL_DAYS = float(os.environ.get("FLOOR_PLAN_URL_TTL_DAYS", 30))
+DOWNLOAD_TIMEOUT = 10.0
+
+# Images are analysed at this size (long side, px); plenty for the statistics.
+_ANALYSIS_DIM = 256
+# A pixel is "white background" when every channel is at least this bright.
+_WHITE_LEVEL = 225
+# Gradient magnitude (0-255, FIND_EDGES on greyscale) counted as an edge.
+_EDGE_LEVEL = 48
+# Colours are bucketed to 4 bits per channel; the palette size is the number of
+# buckets needed to cover _PALETTE_COVERAGE of the pixels.
+_PALETTE_COVERAGE = 0.95
+
+# Clear-cut thresholds. Anything between the two profiles goes to the model.
+_PLAN_MIN_WHITE, _PLAN_MAX_PALETTE, _PLAN_MAX_SATURATION = 0.55, 24, 40.0
+_PLAN_EDGE_RANGE = (0.015, 0.25)
+_PHOTO_MAX_WHITE, _PHOTO_MIN_PALETTE, _PHOTO_MIN_SATURATION = 0.20, 60, 60.0
+
+# Vision API image limits: formats it accepts inline, and a raw-byte ceiling
+# that keeps the base64 payload under 5 MB.
+_MODEL_FORMATS = {"JPEG": "image/jpeg", "PNG": "image/png", "GIF": "image/gif", "WEBP": "image/webp"}
+_MODEL_MAX_BYTES = 3_500_000
+_MODEL_MAX_DIM = 1568
+
+_USER_AGENT = ("Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+               "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+# ask_model(image_source) -> True / False, or None when the model gave no verdict.
+AskModel = Callable[[Dict[str, Any]], Optional[bool]]
+
+
+def download_image(url: str, max_bytes: int = FLOOR_PLAN_MAX_BYTES,
+                   timeout: float = DOWNLOAD_TIMEOUT) -> Optional[bytes]:
+    """GET ``url`` streaming, giving up past ``max_bytes``; None on any failure."""
+    try:
+        with requests.get(url, headers={"User-Agent": _USER_AGENT}, timeout=timeout, stream=True) as resp:
+            if resp.status_code != 200:
+                logger.info("Floor-plan candidate %s: HTTP %s", url, resp.status_code)
+                return None
+            declared = resp.headers.get("Content-Length")
+            if declared and declared.isdigit() and int(declared) > max_bytes:
+                logger.info("Floor-plan candidate %s too large (%s bytes)", url, declared)
+                return None
+            buf, size = [], 0
+            for chunk in resp.iter_content(64 * 1024):
+                size += len(chunk)
+                if size > max_bytes:
+                    logger.info("Floor-plan candidate %s exceeded %d bytes — abandoned", url, max_bytes)
+                    return None
+                buf.append(chunk)
+            return b"".join(buf)
+    except requests.RequestException as e:
+        logger.info("Floor-plan candidate %s download failed: %s", url, e)
+        return None
+
+
+def image_stats(img: Image.Image) -> Dict[str, float]:
+    """Line-drawing statistics of an image (downscaled for speed)."""
+    img = img.convert("RGB")
+    img.thumbnail((_ANALYSIS_DIM, _ANALYSIS_DIM))
+    n = img.size[0] * img.size[1]
+
+    # Darkest channel per pixel >= _WHITE_LEVEL  <=>  every channel is bright.
+    r, g, b = img.split()
+    darkest = ImageChops.darker(ImageChops.darker(r, g), b)
+    white_ratio = sum(darkest.histogram()[_WHITE_LEVEL:]) / n
+
+    edges = img.convert("L").filter(ImageFilter.FIND_EDGES)
+    edge_density = sum(edges.histogram()[_EDGE_LEVEL:]) / n
+
+    counts = sorted((c for c, _ in img.point(lambda v: v & 0xF0).getcolors(n) or []), reverse=True)
+    covered, palette = 0, 0
+    for c in counts:
+        covered += c
+        palette += 1
+        if covered >= _PALETTE_COVERAGE * n:
+            break
+
+    sat_hist = img.convert("HSV").split()[1].histogram()
+    saturation = sum(i * c for i, c in enumerate(sat_hist)) / n
+
+    return {"white_ratio": round(white_ratio, 4), "edge_density": round(edge_density, 4),
+            "palette": palette, "saturation": round(saturation, 1)}
+
+
+def classify_stats(stats: Dict[str, float]) -> Optional[bool]:
+    """True (floor plan) / False (photo) when the statistics are clear-cut, else None."""
+    lo, hi = _PLAN_EDGE_RANGE
+    if (stats["white_ratio"] >= _PLAN_MIN_WHITE and stats["palette"] <= _PLAN_MAX_PALETTE
+            and stats["saturation"] <= _PLAN_MAX_SATURATION and lo <= stats["edge_density"] <= hi):
+        return True
+    if stats["white_ratio"] <= _PHOTO_MAX_WHITE and (
+            stats["palette"] >= _PHOTO_MIN_PALETTE or stats["saturation"] >= _PHOTO_MIN_SATURATION):
+        return False
+    return None
+
+
+def _model_source(data: bytes, img: Image.Image) -> Dict[str, Any]:
+    """Base64 image source for the vision call, re-encoded only when the API needs it."""
+    media_type = _MODEL_FORMATS.get(img.format or "")
+    if media_type is None or len(data) > _MODEL_MAX_BYTES or max(img.size) > _MODEL_MAX_DIM:
+        small = img.convert("RGB")
+        small.thumbnail((_MODEL_MAX_DIM, _MODEL_MAX_DIM))
+        out = BytesIO()
+        small.save(out, format="PNG", optimize=True)
+        data, media_type = out.getvalue(), "image/png"
+    return {"type": "base64", "media_type": media_type, "data": base64.b64encode(data).decode("ascii")}
+
+
+class FloorPlanClassifier:
+    """Cached local-first floor-plan check."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = Path(path) if path else _DEFAULT_FILE
+        self.url_ttl_s = FLOOR_PLAN_URL_TTL_DAYS * 86400.0
+        self.counts = {"cache": 0, "local": 0, "model": 0, "unreadable": 0}
+        self._lock = threading.Lock()
+        self._store: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._store is None:
+            try:
+                with open(self.path) as f:
+                    store = json.load(f)
+                if not isinstance(store, dict):
+                    raise ValueError("not an object")
+            except FileNotFoundError:
+                store = {}
+            except (OSError, ValueError) as e:
+                logger.warning("Floor-plan verdict cache %s unreadable (%s) — starting fresh", self.path, e)
+                store = {}
+            store.setdefault("urls", {})
+            store.setdefault("hashes", {})
+            self._store = store
+        return self._store
+
+    def _save(self) -> None:
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(self._store, f, indent=1)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            logger.warning("Could not write floor-plan verdict cache %s: %s", self.path, e)
+
+    def _cached(self, url: str, digest: Optional[str] = None) -> Optional[bool]:
+        with self._lock:
+            store = self._load()
+            if digest is None:
+                entry = store["urls"].get(url)
+                if not entry or time.time() - float(entry.get("ts", 0)) > self.url_ttl_s:
+                    return None
+                digest = entry.get("hash")
+            verdict = store["hashes"].get(digest or "")
+        if verdict is None:
+            return None
+        self.counts["cache"] += 1
+        return bool(verdict["floor_plan"])
+
+    def _remember(self, url: str, digest: str, floor_plan: bool, by: str, stats: Optional[Dict] = None) -> None:
+        with self._lock:
+            store = self._load()
+            store["hashes"][digest] = {"floor_plan": floor_plan, "by": by, "stats": stats}
+            store["urls"][url] = {"hash": digest, "ts": time.time()}
+            self._save()
+
+    def is_floor_plan(self, url: str, ask_model: AskModel, timeout: float = DOWNLOAD_TIMEOUT) -> bool:
+        """Verdict for a candidate floor-plan URL (never raises)."""
+        try:
+            return self._is_floor_plan(url, ask_model, timeout)
+        except Exception as e:
+            logger.info("Floor-plan check failed for %s (%s) — treating as not a floor plan", url, type(e).__name__)
+            return False
+
+    def _is_floor_plan(self, url: str, ask_model: AskModel, timeout: float) -> bool:
+        verdict = self._cached(url)
+        if verdict is not None:
+            logger.info("Floor-plan verdict for %s from cache: %s", url, verdict)
+            return verdict
+
+        data = download_image(url, timeout=max(1.0, timeout))
+        if data is None:
+            # Our fetch can be refused where the API's isn't; fall back to a remote check.
+            self.counts["model"] += 1
+            return bool(ask_model({"type": "url", "url": url}))
+        digest = hashlib.sha256(data).hexdigest()
+        verdict = self._cached(url, digest)
+        if verdict is not None:
+            with self._lock:
+                self._load()["urls"][url] = {"hash": digest, "ts": time.time()}
+                self._save()
+            return verdict
+
+        try:
+            img = Image.open(BytesIO(data))
+            img.load()
+        except Exception as e:
+            self.counts["unreadable"] += 1
+            logger.info("Floor-plan candidate %s is not a readable image (%s)", url, e)
+            self._remember(url, digest, False, "unreadable")
+            return False
+
+        stats = image_stats(img)
+        verdict = classify_stats(stats)
+        if verdict is not None:
+            self.counts["local"] += 1
+            logger.info("Floor-plan verdict for %s decided locally: %s %s", url, verdict, stats)
+            self._remember(url, digest, verdict, "local", stats)
+            return verdict
+
+        self.counts["model"] += 1
+        logger.info("Floor-plan candidate %s ambiguous %s — asking the vision model", url, stats)
+        verdict = ask_model(_model_source(data, img))
+        if verdict is None:
+            return False
+        self._remember(url, digest, bool(verdict), "model", stats)
+        return bool(verdict)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            store = self._load()
+            return {**self.counts, "urls": len(store["urls"]), "images": len(store["hashes"])}
+
+
+_classifier: Optional[FloorPlanClassifier] = None
+
+
+def get_floor_plan_classifier() -> FloorPlanClassifier:
+    """Process-wide classifier (FLOOR_PLAN_CACHE_FILE overrides the cache location)."""
+    global _classifier
+    if _classifier is None:
+        _classifier = FloorPlanClassifier(os.environ.get("FLOOR_PLAN_CACHE_FILE"))
+    return _classifier
@@ -0,0 +1,226 @@
+"""Pooled keep-alive HTTP sessions, one per host.
+
+PropertyAPI used to open a fresh ``http.client.HTTPSConnection`` per RapidAPI
+call and the SerpAPI / Realtor / DuckDuckGo helpers each called
+``requests.get`` with no shared session, so every lookup paid TCP + TLS setup
+again. ``HttpPool`` keeps one ``requests.Session`` per host, each mounted with
+an urllib3 connection pool of HTTP_POOL_SIZE keep-alive connections, so
+repeated lookups reuse warm connections (urllib3 pools are thread-safe; the
+sessions are shared across threads).
+
+Each host has its own timeout (DEFAULT_HOST_TIMEOUTS, overridable with
+HTTP_HOST_TIMEOUTS='{"serpapi.com": 20}'; HTTP_TIMEOUT for other hosts).
+``stats()`` reports requests, new connections and the reuse rate per host.
+
+Every request first waits for its host's token bucket (rate_limiter), so
+provider rate limits hold across threads without fixed sleeps at call sites.
+GETs the response cache (response_cache) knows how to keep are answered from
+disk when fresh, without a request or a rate-limit token.
+
+``stream()`` is for scrapers that can stop reading once they have what they
+need: the body comes in chunks, closing early drops the rest of the download,
+and only a body read to the end is cached. Search-result pages are cached only
+when the scraper ``commit()``s them after validating a result; the bytes read
+so far are enough to find that result again.
+"""
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Iterator, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    from rate_limiter import RateLimiter, get_rate_limiter
+    from response_cache import ResponseCache, get_response_cache
+except ImportError:
+    from .rate_limiter import RateLimiter, get_rate_limiter
+    from .response_cache import ResponseCache, get_response_cache
+
+logger = logging.getLogger(__name__)
+
+HTTP_POOL_SIZE = int(os.environ.get("HTTP_POOL_SIZE", 10))
+HTTP_TIMEOUT = float(os.environ.get("HTTP_TIMEOUT", 10))
+STREAM_CHUNK_BYTES = 16 * 1024
+
+# Seconds per request (connect + read), per host.
+DEFAULT_HOST_TIMEOUTS: Dict[str, float] = {
+    "us-real-estate-listings.p.rapidapi.com": 15.0,
+    "serpapi.com": 12.0,
+    "www.realtor.com": 8.0,
+    "duckduckgo.com": 6.0,
+}
+
+
+def _env_timeouts() -> Dict[str, float]:
+    raw = os.environ.get("HTTP_HOST_TIMEOUTS")
+    if not raw:
+        return {}
+    try:
+        return {str(k): float(v) for k, v in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError):
+        logger.warning("Ignoring invalid HTTP_HOST_TIMEOUTS=%r", raw)
+        return {}
+
+
+class StreamedResponse:
+    """A GET whose body is read chunk by chunk; ``close()`` (or leaving the
+    ``with`` block) stops the download wherever the reader got to."""
+
+    def __init__(self, pool: "HttpPool", url: str, params: Optional[Dict[str, Any]],
+                 resp: requests.Response, chunk_size: int = STREAM_CHUNK_BYTES):
+        self._pool = pool
+        self._url = url
+        self._params = params
+        self._resp = resp
+        self._chunk_size = chunk_size
+        self.status_code = resp.status_code
+        self.from_cache = getattr(resp, "from_cache", False)
+        self.bytes_read = 0
+        self.complete = False
+        self._chunks = []
+
+    def __iter__(self) -> Iterator[bytes]:
+        if self.from_cache:
+            body = self._resp.content
+            for start in range(0, len(body), self._chunk_size):
+                chunk = body[start:start + self._chunk_size]
+                self.bytes_read += len(chunk)
+                yield chunk
+            self.complete = True
+            return
+        for chunk in self._resp.iter_content(self._chunk_size):
+            self._chunks.append(chunk)
+            self.bytes_read += len(chunk)
+            yield chunk
+        self.complete = True
+        # Read to the end: the whole page is known, so it can be cached.
+        self._pool.cache.put("GET", self._url, self._params, self._read_so_far())
+
+    def _read_so_far(self) -> requests.Response:
+        self._resp._content = b"".join(self._chunks)
+        self._resp._content_consumed = True
+        return self._resp
+
+    def commit(self) -> None:
+        """Cache the body read so far: the caller found a validated result in it."""
+        if not self.from_cache and self._chunks:
+            self._pool.cache.put("GET", self._url, self._params, self._read_so_far(), committed=True)
+
+    def close(self) -> None:
+        self._resp.close()
+
+    def __enter__(self) -> "StreamedResponse":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class HttpPool:
+    """Per-host keep-alive ``requests`` sessions with per-host timeouts."""
+
+    def __init__(self, pool_size: int = HTTP_POOL_SIZE, timeouts: Optional[Dict[str, float]] = None,
+                 default_timeout: float = HTTP_TIMEOUT, limiter: Optional[RateLimiter] = None,
+                 cache: Optional[ResponseCache] = None):
+        self.pool_size = max(1, pool_size)
+        self.limiter = limiter or get_rate_limiter()
+        self.cache = cache or get_response_cache()
+        self.timeouts = {**DEFAULT_HOST_TIMEOUTS, **(timeouts or {})}
+        self.default_timeout = default_timeout
+        self._sessions: Dict[str, requests.Session] = {}
+        self._lock = threading.Lock()
+
+    def session(self, host: str) -> requests.Session:
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                # Retries stay with the callers (they know what's worth retrying).
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=0)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+            return session
+
+    def timeout(self, host: str) -> float:
+        return self.timeouts.get(host, self.default_timeout)
+
+    def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> requests.Response:
+        """``requests.request`` over the host's pooled session, within the host's
+        rate limit (raises like requests); served from the response cache when fresh."""
+        params = kwargs.get("params")
+        cached = self.cache.get(method, url, params)
+        if cached is not None:
+            return cached
+        host = urlsplit(url).hostname or ""
+        self.limiter.wait(host)
+        resp = self.session(host).request(method, url, timeout=timeout or self.timeout(host), **kwargs)
+        self.cache.put(method, url, params, resp)
+        return resp
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def stream(self, url: str, timeout: Optional[float] = None, chunk_size: int = STREAM_CHUNK_BYTES,
+               **kwargs) -> StreamedResponse:
+        """GET ``url`` with the body left unread (raises like requests); iterate the
+        result for body chunks and close it to stop early."""
+        params = kwargs.get("params")
+        cached = self.cache.get("GET", url, params)
+        if cached is not None:
+            return StreamedResponse(self, url, params, cached, chunk_size)
+        host = urlsplit(url).hostname or ""
+        self.limiter.wait(host)
+        resp = self.session(host).get(url, timeout=timeout or self.timeout(host), stream=True, **kwargs)
+        return StreamedResponse(self, url, params, resp, chunk_size)
+
+    def forget(self, url: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Drop a cached GET response the caller couldn't use (bot-check page, bad JSON)."""
+        self.cache.discard("GET", url, params)
+
+    def backoff(self, url: str, seconds: float) -> None:
+        """Hold every request to ``url``'s host off for ``seconds`` (it pushed back)."""
+        self.limiter.backoff(urlsplit(url).hostname, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        hosts, total_requests, total_connections = {}, 0, 0
+        with self._lock:
+            sessions = list(self._sessions.items())
+        for host, session in sessions:
+            n_req = n_conn = 0
+            for adapter in set(session.adapters.values()):
+                pools = getattr(getattr(adapter, "poolmanager", None), "pools", None)
+                for key in list(pools.keys()) if pools is not None else []:
+                    pool = pools.get(key)
+                    n_req += getattr(pool, "num_requests", 0)
+                    n_conn += getattr(pool, "num_connections", 0)
+            hosts[host] = {"requests": n_req, "connections": n_conn,
+                           "reuse_rate": round(1 - n_conn / n_req, 3) if n_req else None}
+            total_requests += n_req
+            total_connections += n_conn
+        return {"pool_size": self.pool_size, "requests": total_requests, "connections": total_connections,
+                "reuse_rate": round(1 - total_connections / total_requests, 3) if total_requests else None,
+                "hosts": hosts}
+
+    def close(self) -> None:
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for session in sessions:
+            session.close()
+
+
+_pool: Optional[HttpPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_http_pool() -> HttpPool:
+    """Process-wide pool configured from the environment."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HttpPool(timeouts=_env_timeouts())
+        return _pool
@@ -0,0 +1,197 @@
+"""On-disk cache of the processed (downscaled, re-encoded) report images.
+
+Every report for a property downloaded its floor plans again and re-ran the
+PIL resize to IMAGE_MAX_DIM + JPEG encode (quality 85, optimize) on each — the
+slowest part of embedding an image after the download itself. image_prefetch
+keeps the result here instead:
+
+  - processed JPEGs are content-addressed: the key is a SHA-256 of the source
+    image bytes plus the processing settings, so the same image behind two URLs
+    is encoded once, and changing the settings never serves a stale rendition
+  - each URL remembers which JPEG it produced, with the response's ETag /
+    Last-Modified. Within IMAGE_CACHE_URL_TTL_HOURS (default 168) the JPEG is
+    used without touching the network; after that the URL is revalidated with a
+    conditional GET, and a 304 reuses the JPEG. A changed image is downloaded,
+    and only re-encoded if its bytes are new
+  - JPEGs are evicted least-recently-used once they exceed IMAGE_CACHE_MAX_MB
+    (default 100); a URL whose JPEG was evicted is simply fetched again
+
+Files live under IMAGE_CACHE_DIR (default data/cache/images): ``jpeg/`` for the
+images, ``urls/`` for the small per-URL records. Failed downloads are never
+cached. ``stats()`` reports hits by kind, misses and the store size.
+IMAGE_CACHE=off disables it.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path(__file__).parent.parent.parent / "data" / "cache" / "images"
+_HOUR = 3600.0
+
+IMAGE_CACHE = os.environ.get("IMAGE_CACHE", "on").strip().lower() not in ("off", "0", "false", "no")
+IMAGE_CACHE_MAX_MB = float(os.environ.get("IMAGE_CACHE_MAX_MB", 100))
+IMAGE_CACHE_URL_TTL_HOURS = float(os.environ.get("IMAGE_CACHE_URL_TTL_HOURS", 168))
+
+
+def _sha256(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class ImageCache:
+    """Size-bounded LRU store of processed JPEGs, keyed by source content."""
+
+    def __init__(self, directory: Optional[str] = None, max_mb: float = IMAGE_CACHE_MAX_MB,
+                 url_ttl_hours: float = IMAGE_CACHE_URL_TTL_HOURS, enabled: bool = IMAGE_CACHE):
+        self.directory = Path(directory) if directory else _DEFAULT_DIR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.url_ttl_s = max(0.0, url_ttl_hours) * _HOUR
+        self.enabled = enabled
+        self.counts = {"url_hits": 0, "revalidated": 0, "content_hits": 0, "misses": 0,
+                       "stores": 0, "evictions": 0}
+        self._index: Optional[Dict[Path, list]] = None  # path -> [size, last used]
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def content_key(content: bytes, variant: str) -> str:
+        """Key of the rendition ``variant`` (processing settings) of an image's bytes."""
+        h = hashlib.sha256(content)
+        h.update(f"|{variant}".encode("utf-8"))
+        return h.hexdigest()
+
+    def _jpeg_path(self, key: str) -> Path:
+        return self.directory / "jpeg" / key[:2] / f"{key}.jpg"
+
+    def _url_path(self, url: str) -> Path:
+        key = _sha256(url)
+        return self.directory / "urls" / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[Path, list]:
+        """Scan the JPEG store once (caller holds the lock)."""
+        if self._index is None:
+            self._index, self._bytes = {}, 0
+            root = self.directory / "jpeg"
+            for path in root.glob("*/*.jpg") if root.exists() else []:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                self._index[path] = [st.st_size, st.st_mtime]
+                self._bytes += st.st_size
+        return self._index
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """What ``url`` produced last time — {key, etag, last_modified, fresh} — or None."""
+        if not self.enabled:
+            return None
+        try:
+            with open(self._url_path(url)) as f:
+                rec = json.load(f)
+            rec["fresh"] = time.time() - float(rec["checked"]) < self.url_ttl_s
+            return rec if rec.get("key") else None
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+
+    def remember(self, url: str, key: str, etag: Optional[str] = None,
+                 last_modified: Optional[str] = None) -> None:
+        """Record that ``url`` currently yields rendition ``key`` (never raises)."""
+        if not self.enabled:
+            return
+        rec = {"url": url, "key": key, "etag": etag, "last_modified": last_modified, "checked": time.time()}
+        self._write(self._url_path(url), json.dumps(rec).encode("utf-8"))
+
+    def read(self, key: str, kind: str) -> Optional[bytes]:
+        """The stored JPEG for ``key``, or None; ``kind`` is the hit counter to bump."""
+        if not self.enabled:
+            return None
+        path = self._jpeg_path(key)
+        try:
+            data = path.read_bytes()
+        except OSError:
+            return None
+        with self._lock:
+            rec = self._load_index().get(path)
+            if rec is not None:
+                rec[1] = time.time()
+            self.counts[kind] += 1
+        try:
+            os.utime(path)  # LRU order survives restarts
+        except OSError:
+            pass
+        return data
+
+    def store(self, key: str, data: bytes) -> None:
+        """Keep a freshly processed JPEG (never raises)."""
+        with self._lock:
+            self.counts["misses"] += 1
+        if not self.enabled:
+            return
+        path = self._jpeg_path(key)
+        if not self._write(path, data):
+            return
+        with self._lock:
+            index = self._load_index()
+            old = index.get(path)
+            self._bytes += len(data) - (old[0] if old else 0)
+            index[path] = [len(data), time.time()]
+            self.counts["stores"] += 1
+            self._evict()
+
+    def _write(self, path: Path, data: bytes) -> bool:
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, path)
+            return True
+        except OSError as e:
+            logger.warning("Could not write image cache entry %s: %s", path.name, e)
+            return False
+
+    def _evict(self) -> None:
+        """Drop least-recently-used JPEGs until under the size bound (caller holds the lock)."""
+        if self._bytes <= self.max_bytes:
+            return
+        for path, (size, _used) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not evict image cache entry %s: %s", path.name, e)
+                continue
+            del self._index[path]
+            self._bytes -= size
+            self.counts["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._index) if self._index is not None else None
+            size_mb = round(self._bytes / 1024 / 1024, 2) if self._index is not None else None
+            counts = dict(self.counts)
+        hits = counts["url_hits"] + counts["revalidated"] + counts["content_hits"]
+        lookups = hits + counts["misses"]
+        return {"enabled": self.enabled, **counts, "hit_rate": round(hits / lookups, 3) if lookups else None,
+                "entries": entries, "size_mb": size_mb, "max_mb": round(self.max_bytes / 1024 / 1024, 1)}
+
+
+_cache: Optional[ImageCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_image_cache() -> ImageCache:
+    """Process-wide image cache configured from the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ImageCache(os.environ.get("IMAGE_CACHE_DIR"))
+        return _cache
@@ -0,0 +1,212 @@
+"""Concurrent prefetch of the images a report embeds.
+
+DocumentGenerator used to download the research floor plan and every legacy
+``floor_plans`` entry one after another with a bare ``requests.get``, in the
+middle of rendering the Property Links section — a slow image host held the
+whole report up for up to IMAGE_DOWNLOAD_TIMEOUT per image. Now:
+
+  - ``report_image_urls(data)`` lists the image URLs a report will try to embed,
+    in the order the renderer tries them
+  - ``ImagePrefetcher.prefetch(urls)`` starts downloading (and downscaling) them
+    on a small worker pool through the shared keep-alive sessions (http_pool),
+    as soon as the URLs are known — the server calls it when the main property
+    research returns, while other properties may still be researched, and
+    ``generate_report`` calls it again before rendering the first section (a
+    URL already in flight is not fetched twice)
+  - ``take(url)`` hands the renderer the finished buffer, waiting only for
+    whatever is still downloading; a URL that was never prefetched is fetched
+    inline, as before; ``release()`` drops the ones it didn't need
+
+Pending downloads belong to a report: each call takes the report's ``token``,
+so two reports sharing a floor-plan URL never take or release each other's
+download (the second one's fetch is a cache hit in image_cache anyway).
+
+Processed images are cached on disk (image_cache), so a repeat report for the
+same property skips both the download and the re-encode.
+
+Pending entries are capped at IMAGE_PREFETCH_MAX_PENDING (oldest dropped) so
+prefetches for reports that never rendered don't pile up. IMAGE_PREFETCH=off
+fetches every image inline at render time.
+"""
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from io import BytesIO
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from PIL import Image
+
+try:
+    from http_pool import HttpPool, get_http_pool
+    from image_cache import ImageCache, get_image_cache
+except ImportError:
+    from .http_pool import HttpPool, get_http_pool
+    from .image_cache import ImageCache, get_image_cache
+
+logger = logging.getLogger(__name__)
+
+# Network timeout (seconds) for downloading images / floor plans.
+IMAGE_DOWNLOAD_TIMEOUT = 15
+# px on the long side — plenty for a report image.
+IMAGE_MAX_DIM = 1400
+IMAGE_JPEG_QUALITY = 85
+# Processed JPEGs are cached per (source bytes, these settings).
+_VARIANT = f"jpeg-{IMAGE_MAX_DIM}-q{IMAGE_JPEG_QUALITY}"
+
+IMAGE_PREFETCH = os.environ.get("IMAGE_PREFETCH", "on").strip().lower() not in ("off", "0", "false", "no")
+IMAGE_PREFETCH_WORKERS = int(os.environ.get("IMAGE_PREFETCH_WORKERS", 4))
+IMAGE_PREFETCH_MAX_PENDING = int(os.environ.get("IMAGE_PREFETCH_MAX_PENDING", 32))
+
+
+def _usable_url(url) -> Optional[str]:
+    url = str(url or "").strip()
+    return url if url.startswith(("http://", "https://")) else None
+
+
+def report_image_urls(data: Dict[str, Any]) -> List[str]:
+    """Image URLs DocumentGenerator._add_property_links may embed: the research
+    floor plan first, then the legacy ``floor_plans`` entries."""
+    property_details = data.get('property_details') or {}
+    if not isinstance(property_details, dict):
+        property_details = {}
+    floor_plans = (data.get('floor_plans') or {}).get('floor_plans', []) or property_details.get('floor_plans', [])
+    urls = [_usable_url(property_details.get('floor_plan_url'))]
+    urls += [_usable_url(p.get('url')) for p in floor_plans or [] if isinstance(p, dict)]
+    return list(dict.fromkeys(u for u in urls if u))
+
+
+def _process(content: bytes) -> bytes:
+    """Downscale to IMAGE_MAX_DIM and re-encode as JPEG (raises if PIL can't read it)."""
+    img = Image.open(BytesIO(content)).convert('RGB')
+    if max(img.size) > IMAGE_MAX_DIM:
+        img.thumbnail((IMAGE_MAX_DIM, IMAGE_MAX_DIM))
+    output = BytesIO()
+    img.save(output, format='JPEG', quality=IMAGE_JPEG_QUALITY, optimize=True)
+    return output.getvalue()
+
+
+def fetch_image(url: str, http: Optional[HttpPool] = None, timeout: float = IMAGE_DOWNLOAD_TIMEOUT,
+                cache: Optional[ImageCache] = None) -> Optional[BytesIO]:
+    """Download an image, downscale + re-encode as JPEG so an embedded photo or
+    floor plan can't bloat the .docx (a full-res photo was producing ~4 MB
+    reports — bad for SharePoint upload + mobile preview). If PIL can't process
+    it, return None (skip the embed) rather than dumping un-sized raw bytes.
+
+    The processed JPEG is kept in the image cache: a recently checked URL skips
+    the download, and a 304 or already-seen image skips the re-encode."""
+    cache = cache or get_image_cache()
+    try:
+        rec = cache.lookup(url)
+        if rec and rec["fresh"]:
+            data = cache.read(rec["key"], "url_hits")
+            if data is not None:
+                return BytesIO(data)
+        http = http or get_http_pool()
+        headers = {}
+        if rec and rec.get("etag"):
+            headers["If-None-Match"] = rec["etag"]
+        if rec and rec.get("last_modified"):
+            headers["If-Modified-Since"] = rec["last_modified"]
+        response = http.get(url, timeout=timeout, headers=headers)
+        if response.status_code == 304 and rec:
+            data = cache.read(rec["key"], "revalidated")
+            if data is not None:
+                cache.remember(url, rec["key"], rec.get("etag"), rec.get("last_modified"))
+                return BytesIO(data)
+            # Evicted since: fetch it again in full.
+            response = http.get(url, timeout=timeout)
+        if response.status_code != 200:
+            logger.error("Image download failed: %s (status %s)", url, response.status_code)
+            return None
+        key = cache.content_key(response.content, _VARIANT)
+        data = cache.read(key, "content_hits")
+        if data is None:
+            try:
+                data = _process(response.content)
+            except Exception as pil_e:
+                logger.error("PIL could not process image %s: %s", url, pil_e)
+                return None
+            cache.store(key, data)
+        cache.remember(url, key, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return BytesIO(data)
+    except Exception as e:
+        logger.error("Exception downloading image %s: %s", url, e)
+    return None
+
+
+class ImagePrefetcher:
+    """Downloads report images on a worker pool ahead of rendering."""
+
+    def __init__(self, workers: int = IMAGE_PREFETCH_WORKERS, max_pending: int = IMAGE_PREFETCH_MAX_PENDING,
+                 http: Optional[HttpPool] = None, enabled: bool = IMAGE_PREFETCH):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.http = http
+        self.enabled = enabled
+        self._pending: "OrderedDict[Tuple[str, str], Future]" = OrderedDict()  # (token, url)
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.counts = {"prefetched": 0, "ready": 0, "waited": 0, "inline": 0, "dropped": 0}
+
+    def prefetch(self, urls: Iterable[str], token: str = "") -> None:
+        """Start downloading ``urls`` for report ``token`` (never raises; URLs
+        already in flight for it are skipped)."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="image-prefetch")
+            for url in urls:
+                if not url or (token, url) in self._pending:
+                    continue
+                self._pending[(token, url)] = self._pool.submit(fetch_image, url, self.http)
+                self.counts["prefetched"] += 1
+            while len(self._pending) > self.max_pending:
+                _, stale = self._pending.popitem(last=False)
+                stale.cancel()
+                self.counts["dropped"] += 1
+
+    def take(self, url: str, token: str = "") -> Optional[BytesIO]:
+        """The processed image for ``url`` (prefetched for ``token`` if it was, else
+        fetched now); None on failure."""
+        with self._lock:
+            future = self._pending.pop((token, url), None)
+        if future is None:
+            self.counts["inline"] += 1
+            return fetch_image(url, self.http)
+        self.counts["ready" if future.done() else "waited"] += 1
+        try:
+            # The download carries its own timeout; this only guards a wedged worker.
+            return future.result(timeout=IMAGE_DOWNLOAD_TIMEOUT * 2)
+        except FutureTimeout:
+            logger.error("Timed out waiting for prefetched image %s", url)
+        except Exception as e:
+            logger.error("Prefetched image %s failed: %s", url, e)
+        return None
+
+    def release(self, token: str) -> None:
+        """Drop report ``token``'s prefetches the renderer didn't take (e.g. legacy
+        floor plans once the research floor plan embedded, or a failed report)."""
+        with self._lock:
+            for key in [k for k in self._pending if k[0] == token]:
+                self._pending.pop(key).cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            pending = len(self._pending)
+        return {"enabled": self.enabled, "workers": self.workers, "pending": pending, **self.counts}
+
+
+_prefetcher: Optional[ImagePrefetcher] = None
+_prefetcher_lock = threading.Lock()
+
+
+def get_image_prefetcher() -> ImagePrefetcher:
+    """Process-wide prefetcher configured from the environment."""
+    global _prefetcher
+    with _prefetcher_lock:
+        if _prefetcher is None:
+            _prefetcher = ImagePrefetcher()
+        return _prefetcher
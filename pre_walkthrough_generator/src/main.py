@@ -5,6 +5,7 @@ from pathlib import Path
 import re
 import json
 from .config import Config
+from .address_canon import clean_address
 
 logger = logging.getLogger(__name__)
 from .transcript_processor import TranscriptProcessor
@@ -17,26 +18,6 @@ def clean_transcript(raw_transcript: str) -> str:
     transcript = raw_transcript.strip()
     return transcript
 
-def clean_address(address: str) -> str:
-    """Clean and standardize address format"""
-    # Remove extra whitespace
-    address = ' '.join(address.split())
-    # Convert apartment/unit variations to standard format
-    address = re.sub(r'(?i)\b(apartment|apt\.?|unit)\s*#?\s*(\w+)', r'Apt \2', address)
-    # Only expand abbreviations that are clearly street names, not state abbreviations
-    # Use word boundaries and context to avoid changing state abbreviations
-    abbr = {
-        r'\b(\d+\s+\w+\s+)Pl\b\.?' : r'\1Place',  # Only expand Pl when it's clearly a street
-        r'\b(\d+\s+\w+\s+)St\b\.?' : r'\1Street',  # Only expand St when it's clearly a street
-        r'\b(\d+\s+\w+\s+)Ave\b\.?' : r'\1Avenue',
-        r'\b(\d+\s+\w+\s+)Rd\b\.?' : r'\1Road',
-        r'\bPkwy\b\.?' : 'Parkway'
-        # Don't expand Ct as it could be Connecticut
-    }
-    for pat, repl in abbr.items():
-        address = re.sub(pat, repl, address, flags=re.IGNORECASE)
-    return address
-
 def save_json(data: dict, filename: str):
     """Save data to JSON file"""
     output_path = Path("data") / filename
@@ -0,0 +1,194 @@
+"""Per-task Claude model routing.
+
+Every Anthropic call in the pipeline used to go to the same flagship model with
+the same thinking setting, including tiny calls like ``extract_address`` and
+very short transcripts. The router picks a model + adaptive-thinking setting per
+call from three signals:
+
+  - the TASK (extract_info, extract_address, analyze_client, research,
+    structure, floor_plan_check)
+  - the size of the input (transcript length in characters)
+  - the remaining latency budget of the job, when the caller knows it
+
+Routes are an ordered list of rules per task; the first rule whose conditions
+match wins. A rule with ``"model": null`` means "the caller's default model"
+(i.e. CLAUDE_MODEL), so existing deployments keep their configured model for
+the heavy calls. Override per deployment with the MODEL_ROUTES env var (inline
+JSON or a path to a JSON file) or a ``model_routing`` block in config.json:
+
+    {"extract_info": [{"max_chars": 2500, "model": "claude-haiku-4-5", "thinking": false},
+                      {"model": null, "thinking": true}]}
+
+Each call's latency and token usage is recorded per (task, model, thinking) so
+``/metrics`` shows what every routing choice actually costs.
+"""
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = "claude-haiku-4-5"
+
+# First matching rule wins. Conditions:
+#   max_chars      - input is at most this many characters
+#   max_remaining  - job has at most this many seconds of budget left
+# "model": None -> the caller's default model (CLAUDE_MODEL).
+DEFAULT_ROUTES: Dict[str, List[Dict[str, Any]]] = {
+    "extract_info": [
+        # Short transcripts carry little nuance to reason over.
+        {"max_chars": 2500, "model": FAST_MODEL, "thinking": False},
+        # Running out of time: keep the flagship model but skip thinking.
+        {"max_remaining": 60, "model": None, "thinking": False},
+        {"model": None, "thinking": True},
+    ],
+    "extract_address": [{"model": FAST_MODEL, "thinking": False}],
+    "analyze_client": [
+        {"max_chars": 2500, "model": FAST_MODEL, "thinking": False},
+        {"model": None, "thinking": False},
+    ],
+    "research": [
+        {"max_remaining": 90, "model": FAST_MODEL, "thinking": False},
+        {"model": None, "thinking": False},
+    ],
+    "structure": [{"model": None, "thinking": False}],
+    "floor_plan_check": [{"model": FAST_MODEL, "thinking": False}],
+}
+
+# USD per million tokens (input, output). Override with MODEL_PRICES (JSON).
+DEFAULT_PRICES: Dict[str, tuple] = {
+    "claude-opus-4-8": (5.0, 25.0),
+    "claude-sonnet-4-5": (3.0, 15.0),
+    "claude-haiku-4-5": (1.0, 5.0),
+}
+
+
+class Route(NamedTuple):
+    task: str
+    model: str
+    thinking: bool
+    rule: int  # index of the matched rule (for stats/logs)
+
+
+def _load_json_setting(value: Optional[str]) -> Optional[Any]:
+    """Parse an env setting that is either inline JSON or a path to a JSON file."""
+    if not value:
+        return None
+    try:
+        text = value
+        if not value.lstrip().startswith(("{", "[")) and Path(value).exists():
+            text = Path(value).read_text()
+        return json.loads(text)
+    except (OSError, json.JSONDecodeError) as e:
+        logger.warning("Ignoring invalid routing setting %r: %s", value[:80], e)
+        return None
+
+
+def usage_of(response) -> Dict[str, int]:
+    """Token usage of a Messages API response as a plain dict (zeros if absent)."""
+    usage = getattr(response, "usage", None)
+    return {
+        "input_tokens": int(getattr(usage, "input_tokens", 0) or 0),
+        "output_tokens": int(getattr(usage, "output_tokens", 0) or 0),
+    }
+
+
+class ModelRouter:
+    """Choose a model per task and keep latency/cost stats for each choice."""
+
+    def __init__(self, routes: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 prices: Optional[Dict[str, Any]] = None):
+        self.routes = {k: list(v) for k, v in DEFAULT_ROUTES.items()}
+        for task, rules in (routes or {}).items():
+            if isinstance(rules, list) and rules:
+                self.routes[task] = rules
+        self.prices = dict(DEFAULT_PRICES)
+        for model, price in (prices or {}).items():
+            try:
+                self.prices[model] = (float(price[0]), float(price[1]))
+            except (TypeError, ValueError, IndexError):
+                logger.warning("Ignoring invalid price for %s: %r", model, price)
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def choose(self, task: str, default_model: str, input_chars: int = 0,
+               remaining_s: Optional[float] = None) -> Route:
+        """Pick the model + thinking setting for one call.
+
+        ``remaining_s`` is the job's remaining latency budget; rules with a
+        ``max_remaining`` condition only match when it is known.
+        """
+        for i, rule in enumerate(self.routes.get(task) or []):
+            max_chars = rule.get("max_chars")
+            if max_chars is not None and input_chars > max_chars:
+                continue
+            max_remaining = rule.get("max_remaining")
+            if max_remaining is not None and (remaining_s is None or remaining_s > max_remaining):
+                continue
+            route = Route(task, rule.get("model") or default_model, bool(rule.get("thinking")), i)
+            logger.debug("Routed %s (%d chars, %s s left) -> %s thinking=%s",
+                         task, input_chars, remaining_s, route.model, route.thinking)
+            return route
+        return Route(task, default_model, False, -1)
+
+    def cost_usd(self, model: str, usage: Dict[str, int]) -> float:
+        in_price, out_price = self.prices.get(model, (0.0, 0.0))
+        return (usage.get("input_tokens", 0) * in_price + usage.get("output_tokens", 0) * out_price) / 1_000_000
+
+    def record(self, route: Route, latency_s: float, response=None, ok: bool = True) -> None:
+        """Accumulate latency + token usage for a completed (or failed) call."""
+        usage = usage_of(response) if response is not None else {"input_tokens": 0, "output_tokens": 0}
+        key = f"{route.task}|{route.model}|{'thinking' if route.thinking else 'no_thinking'}"
+        with self._lock:
+            s = self._stats.setdefault(key, {
+                "task": route.task, "model": route.model, "thinking": route.thinking,
+                "calls": 0, "errors": 0, "total_latency_s": 0.0, "max_latency_s": 0.0,
+                "input_tokens": 0, "output_tokens": 0, "cost_usd": 0.0,
+            })
+            s["calls"] += 1
+            s["errors"] += 0 if ok else 1
+            s["total_latency_s"] += latency_s
+            s["max_latency_s"] = max(s["max_latency_s"], latency_s)
+            s["input_tokens"] += usage["input_tokens"]
+            s["output_tokens"] += usage["output_tokens"]
+            s["cost_usd"] += self.cost_usd(route.model, usage)
+        logger.info("LLM call %s via %s (thinking=%s): %.1fs, %d in / %d out tokens",
+                    route.task, route.model, route.thinking, latency_s,
+                    usage["input_tokens"], usage["output_tokens"])
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """Snapshot of per-route stats, with mean latency, for /metrics."""
+        with self._lock:
+            out = []
+            for s in self._stats.values():
+                row = dict(s)
+                row["mean_latency_s"] = round(s["total_latency_s"] / s["calls"], 3) if s["calls"] else 0.0
+                row["cost_usd"] = round(s["cost_usd"], 4)
+                out.append(row)
+        return sorted(out, key=lambda r: (r["task"], r["model"]))
+
+
+_router_instance: Optional[ModelRouter] = None
+
+
+def get_router() -> ModelRouter:
+    """Process-wide router configured from MODEL_ROUTES / config.json."""
+    global _router_instance
+    if _router_instance is None:
+        routes = _load_json_setting(os.getenv("MODEL_ROUTES"))
+        prices = _load_json_setting(os.getenv("MODEL_PRICES"))
+        if routes is None:
+            try:
+                try:
+                    from config import get_config
+                except ImportError:
+                    from .config import get_config
+                routes = getattr(get_config(), "model_routing", None)
+            except Exception as e:  # config is optional for routing
+                logger.debug("No config.json routing block: %s", e)
+        _router_instance = ModelRouter(routes if isinstance(routes, dict) else None,
+                                       prices if isinstance(prices, dict) else None)
+    return _router_instance
@@ -9,10 +9,14 @@ from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
 from pathlib import Path
 import logging
-import re
 
 logger = logging.getLogger(__name__)
 
+try:
+    from address_canon import parse_address
+except ImportError:
+    from pre_walkthrough_generator.src.address_canon import parse_address
+
 # Import neighborhood-resolution helpers once, at module load, so an import
 # failure is logged loudly instead of being silently swallowed on every call
 # (which previously degraded matching to "same building only" with no signal).
@@ -48,36 +52,13 @@ class NeighboringProjectsManager:
         self.cache_file = self.cache_dir / "zoho_deals_cache.json"
         self.cache_ttl_hours = 48  # Consider the cache stale after 2 days (auto-refreshed on a timer)
 
-    def _normalize_address(self, address: str) -> str:
-        """Normalize address for comparison"""
-        if not address:
-            return ""
-        addr = address.lower().strip()
-        # Remove apartment/unit numbers
-        addr = re.sub(r'\s*[,]?\s*[#]?\s*(apt\.?|apartment|unit)\s+[#]?\s*[a-zA-Z0-9/\-]+', '', addr, flags=re.IGNORECASE)
-        addr = re.sub(r'\s+unit\s+[a-zA-Z0-9/\-]+', '', addr, flags=re.IGNORECASE)
-        addr = re.sub(r'\s*[,]?\s*#[a-zA-Z0-9/\-]+', '', addr)
-        # Normalize street abbreviations
-        replacements = {
-            ' street': ' st', ' avenue': ' ave', ' road': ' rd',
-            ' boulevard': ' blvd', ' place': ' pl',
-            ' west ': ' w ', ' east ': ' e ',
-            ' north ': ' n ', ' south ': ' s ',
-        }
-        for old, new in replacements.items():
-            addr = addr.replace(old, new)
-        addr = ' '.join(addr.split())
-        return addr
-
     def _is_same_building(self, address1: str, address2: str) -> bool:
-        """Check if two addresses are in the same building"""
-        norm1 = self._normalize_address(address1)
-        norm2 = self._normalize_address(address2)
-        if not norm1 or not norm2:
+        """Check if two addresses are in the same building (same canonical street line)."""
+        line1 = parse_address(address1).line if address1 else ""
+        line2 = parse_address(address2).line if address2 else ""
+        if not line1 or not line2:
             return False
-        street1 = norm1.split(',')[0].strip()
-        street2 = norm2.split(',')[0].strip()
-        return street1 == street2
+        return line1 == line2
 
     def _read_cache_file(self) -> Optional[Dict[str, Any]]:
         """Read and parse the raw cache file (no freshness check)."""
@@ -937,13 +937,21 @@ BROOKLYN_NAMED_STREETS = {
 
 import re
 import json
-import time
 import logging
 import urllib.request
 import urllib.parse
 from typing import Optional, Dict, Tuple
 from pathlib import Path
 
+try:
+    from address_canon import strip_unit
+    from cassette import get_cassette, is_replaying
+    from rate_limiter import get_rate_limiter
+except ImportError:
+    from .address_canon import strip_unit
+    from .cassette import get_cassette, is_replaying
+    from .rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 # Direct street-range → neighborhood mapping for Manhattan areas where ZIP is too coarse
@@ -1070,23 +1078,14 @@ def _save_geocode_cache():
         logger.error(f"Error saving geocode cache: {e}")
 
 
-def _clean_address(address: str) -> str:
-    """Clean address for lookup: remove unit/apt, normalize"""
-    if not address:
-        return ""
-    addr = address.strip()
-    # Remove unit/apt info - be careful not to match "United" or "Eastern"
-    # Only match apt/unit/suite/floor when followed by a space and then the unit identifier
-    addr = re.sub(r'\s*[,]?\s*[#]?\s*(?:apt\.?|apartment|suite|ste\.?)\s+[#]?\s*[a-zA-Z0-9/\-]+', '', addr, flags=re.IGNORECASE)
-    # Match "unit" only as a standalone word followed by unit number (not "United")
-    addr = re.sub(r'\s+unit\s+[a-zA-Z0-9/\-]+', '', addr, flags=re.IGNORECASE)
-    # Match "Fl" or "Floor" followed by number
-    addr = re.sub(r'\s+(?:fl\.?|floor)\s*\d+', '', addr, flags=re.IGNORECASE)
-    # Remove # followed by unit number
-    addr = re.sub(r'\s*[,]?\s*#[a-zA-Z0-9/\-]+', '', addr)
-    addr = re.sub(r'\s*\(.*?\)', '', addr)  # Remove parenthetical like (EXT)
-    addr = re.sub(r'\s+', ' ', addr).strip().rstrip(',').rstrip('.').strip()
-    return addr.lower()
+def _remember_geocode(cache: Dict[str, Optional[Dict]], key: str, result: Optional[Dict]) -> None:
+    """Cache a geocode result (None = nothing relevant) and persist it. Not while
+    replaying recordings: a replay, and a cassette miss in particular, must not
+    write entries into the production geocode cache."""
+    if is_replaying():
+        return
+    cache[key] = result
+    _save_geocode_cache()
 
 
 def _is_miami_address(addr_lower: str) -> bool:
@@ -1121,7 +1120,7 @@ def _get_miami_zip(address: str) -> Optional[str]:
         return z.group(1)
     # Check geocode cache
     cache = _load_geocode_cache()
-    cache_key = _clean_address(address)
+    cache_key = strip_unit(address)
     if cache_key in cache and cache[cache_key]:
         pc = cache[cache_key].get('postcode')
         if pc:
@@ -1158,7 +1157,7 @@ def _get_queens_zip(address: str) -> Optional[str]:
         return z.group(1)
     # Check geocode cache
     cache = _load_geocode_cache()
-    cache_key = _clean_address(address)
+    cache_key = strip_unit(address)
     if cache_key in cache and cache[cache_key]:
         pc = cache[cache_key].get('postcode')
         if pc:
@@ -1175,7 +1174,7 @@ def get_zip_from_address(address: str) -> Optional[str]:
         return None
 
     addr = address.lower().strip()
-    addr_clean = _clean_address(addr)
+    addr_clean = strip_unit(addr)
 
     # 0. Check if address already contains a ZIP code
     # Only match ZIP codes that are NOT at the very start of the address
@@ -1217,7 +1216,7 @@ def get_zip_from_address(address: str) -> Optional[str]:
         if z and z.group(1) in ZIP_TO_NEIGHBORHOOD:
             return z.group(1)
         cache = _load_geocode_cache()
-        cache_key = _clean_address(address)
+        cache_key = strip_unit(address)
         if cache_key in cache and cache[cache_key]:
             pc = cache[cache_key].get('postcode')
             if pc:
@@ -1423,15 +1422,33 @@ def get_zip_from_address(address: str) -> Optional[str]:
     return None
 
 
+def _nominatim_search(query: str) -> list:
+    """One live Nominatim search (parsed JSON list of matches), within the
+    Nominatim policy of 1 request/second across all threads (shared rate limiter;
+    replayed responses never get here, so they don't wait)."""
+    params = urllib.parse.urlencode({
+        'q': query,
+        'format': 'json',
+        'addressdetails': 1,
+        'limit': 1,
+        'countrycodes': 'us'
+    })
+    url = f'https://nominatim.openstreetmap.org/search?{params}'
+    get_rate_limiter().wait('nominatim.openstreetmap.org')
+    req = urllib.request.Request(url, headers={'User-Agent': 'PreWalkthroughGenerator/1.0'})
+    resp = urllib.request.urlopen(req, timeout=10)
+    return json.loads(resp.read())
+
+
 def geocode_address(address: str) -> Optional[Dict]:
     """
     Geocode an address using Nominatim (OpenStreetMap).
     Returns dict with 'postcode', 'neighbourhood', 'suburb', 'city', 'state' or None.
     Results are cached to avoid repeated API calls.
-    Rate limited to 1 request/second per Nominatim policy.
+    Rate limited to 1 request/second per Nominatim policy (see _nominatim_search).
     """
     cache = _load_geocode_cache()
-    cache_key = _clean_address(address)
+    cache_key = strip_unit(address)
 
     if cache_key in cache:
         return cache[cache_key]
@@ -1464,17 +1481,8 @@ def geocode_address(address: str) -> Optional[Dict]:
 
     for query in queries_to_try:
         try:
-            params = urllib.parse.urlencode({
-                'q': query,
-                'format': 'json',
-                'addressdetails': 1,
-                'limit': 1,
-                'countrycodes': 'us'
-            })
-            url = f'https://nominatim.openstreetmap.org/search?{params}'
-            req = urllib.request.Request(url, headers={'User-Agent': 'PreWalkthroughGenerator/1.0'})
-            resp = urllib.request.urlopen(req, timeout=10)
-            data = json.loads(resp.read())
+            # Record/replay-able (a pass-through unless the cassette is enabled).
+            data = get_cassette().call("geocode", {"q": query}, lambda: _nominatim_search(query))
 
             if data and len(data) > 0:
                 addr_info = data[0].get('address', {})
@@ -1495,20 +1503,14 @@ def geocode_address(address: str) -> Optional[Dict]:
                         'state': state,
                         'display_name': data[0].get('display_name', ''),
                     }
-                    cache[cache_key] = result
-                    _save_geocode_cache()
-                    time.sleep(1.1)
+                    _remember_geocode(cache, cache_key, result)
                     return result
 
-            time.sleep(1.1)  # Rate limit between queries
-
         except Exception as e:
             logger.warning(f"Geocoding failed for '{query}': {e}")
-            time.sleep(1.1)
 
     # No relevant result found
-    cache[cache_key] = None
-    _save_geocode_cache()
+    _remember_geocode(cache, cache_key, None)
     return None
 
 
@@ -1537,7 +1539,7 @@ def get_neighborhood_from_address(address: str, use_geocoding: bool = False) ->
 
     # Strategy 3: Check geocode cache
     cache = _load_geocode_cache()
-    cache_key = _clean_address(address)
+    cache_key = strip_unit(address)
     if cache_key in cache:
         geo = cache[cache_key]
         if geo:
@@ -1660,7 +1662,7 @@ def get_locality(address: str, use_geocoding: bool = False) -> Optional[str]:
         return loc
     # 3. Geocode (cached, or live if requested), then neighborhood or City, ST.
     cache = _load_geocode_cache()
-    ck = _clean_address(address)
+    ck = strip_unit(address)
     geo = cache.get(ck) if ck in cache else (geocode_address(address) if use_geocoding else None)
     if geo:
         hood = _neighborhood_from_geocode(geo)
@@ -1679,7 +1681,7 @@ def _neighborhood_from_street(address: str) -> Optional[str]:
         return None
     
     addr = address.lower().strip()
-    addr_clean = _clean_address(addr)
+    addr_clean = strip_unit(addr)
     
     # Early exit: Miami/FL addresses should NOT match Manhattan/Brooklyn patterns
     if _is_miami_address(addr):
@@ -0,0 +1,294 @@
+"""Batch pre-research of upcoming walkthrough addresses.
+
+Most walkthrough addresses are in Zoho days before the transcript arrives: the
+contact's Mailing_Street (the property address, see
+ZohoAPI.get_contact_by_address) and the deal's Deal_Name. Research is the
+multi-minute step of a report, so a scheduled job researches those addresses
+ahead of time and warms the research cache; when the transcript comes in, the
+lookup is a full hit and the report builds in seconds.
+
+A run:
+
+  1. collects candidates from the cached Zoho data — recently modified contacts
+     (data/cache/zoho_contacts_cache.json, refreshed with the deals cache) and
+     open deals whose name is a street address — skipping closed/lost ones
+  2. drops addresses whose research is already fresh for that client
+  3. hands the rest, as one batch, to a submitter that runs at most
+     PRE_RESEARCH_CONCURRENCY at a time, at background priority in the
+     api_governor queue, so live reports keep their share of the API rate limit
+
+Candidates are researched for the same owner identity the report will use
+(the contact's Full_Name plus property_research.client_context_for), otherwise
+the owner brief would be stale at report time and the lookup would miss.
+
+Submitters are pluggable: anything with ``submit(jobs) -> results`` works (a
+local stand-in in tests, or a queue in front of another worker pool). The
+default, ``LocalBatchSubmitter``, runs the batch on an in-process worker pool.
+Enable the schedule with PRE_RESEARCH=on.
+"""
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional
+
+try:
+    import property_research
+    from api_governor import PRIORITY_BACKGROUND
+    from research_cache import address_keys, get_research_cache
+except ImportError:
+    from . import property_research
+    from .api_governor import PRIORITY_BACKGROUND
+    from .research_cache import address_keys, get_research_cache
+
+logger = logging.getLogger(__name__)
+
+_CACHE_DIR = Path(__file__).parent.parent.parent / "data" / "cache"
+_CONTACTS_FILE = _CACHE_DIR / "zoho_contacts_cache.json"
+
+PRE_RESEARCH = os.environ.get("PRE_RESEARCH", "off").strip().lower() in ("on", "1", "true", "yes")
+PRE_RESEARCH_INTERVAL_HOURS = float(os.environ.get("PRE_RESEARCH_INTERVAL_HOURS", 6))
+PRE_RESEARCH_CONCURRENCY = int(os.environ.get("PRE_RESEARCH_CONCURRENCY", 2))
+PRE_RESEARCH_MAX_ADDRESSES = int(os.environ.get("PRE_RESEARCH_MAX_ADDRESSES", 25))
+PRE_RESEARCH_RECENT_DAYS = float(os.environ.get("PRE_RESEARCH_RECENT_DAYS", 14))
+PRE_RESEARCH_TIER = os.environ.get("PRE_RESEARCH_TIER", "standard").strip().lower()
+# How many of the most recently modified contacts the Zoho sync keeps.
+PRE_RESEARCH_CONTACTS = int(os.environ.get("PRE_RESEARCH_CONTACTS", 200))
+
+# Contact fields the Zoho sync caches for pre-research.
+CONTACT_FIELDS = ["Full_Name", "Mailing_Street", "Mailing_City", "Mailing_State", "Mailing_Zip",
+                  "Propery_Status", "Description", "Status", "Modified_Time"]
+
+# Contact Status / deal Stage words meaning no walkthrough is coming.
+_INACTIVE_RE = re.compile(r"\b(closed|lost|dead|cancel\w*|inactive|junk|not interested)\b", re.IGNORECASE)
+# A deal name is only a usable address when it starts with a street number.
+_STREET_NUMBER_RE = re.compile(r"^\s*\d+[a-z]?(-\d+)?\s+\S", re.IGNORECASE)
+
+
+class PreResearchJob(NamedTuple):
+    address: str
+    owner_name: Optional[str]
+    client_context: Optional[str]
+    source: str                       # "contact" or "deal"
+    modified: Optional[str] = None    # Zoho Modified_Time, newest first
+
+
+# submit(jobs) -> one research result (or None) per job, in order.
+Submitter = Callable[[List[PreResearchJob]], List[Optional[Dict[str, Any]]]]
+
+
+def save_contacts(contacts: List[Dict[str, Any]], path: Optional[Path] = None) -> None:
+    """Write the recent-contacts cache (atomic; never raises)."""
+    path = Path(path) if path else _CONTACTS_FILE
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"timestamp": datetime.now().isoformat(), "count": len(contacts),
+                       "contacts": contacts}, f, indent=1)
+        os.replace(tmp, path)
+        logger.info("Saved %d recent Zoho contacts for pre-research", len(contacts))
+    except OSError as e:
+        logger.warning("Could not write Zoho contacts cache %s: %s", path, e)
+
+
+def load_contacts(path: Optional[Path] = None) -> List[Dict[str, Any]]:
+    path = Path(path) if path else _CONTACTS_FILE
+    try:
+        with open(path) as f:
+            return list(json.load(f).get("contacts") or [])
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError, AttributeError) as e:
+        logger.warning("Zoho contacts cache %s unreadable: %s", path, e)
+        return []
+
+
+def _text(value: Any) -> str:
+    if isinstance(value, dict):  # Zoho lookup field: {"name": ..., "id": ...}
+        value = value.get("name")
+    return str(value).strip() if value not in (None, "", "null", []) else ""
+
+
+def _modified_since(record: Dict[str, Any], cutoff: datetime) -> bool:
+    """True when the record was modified after ``cutoff`` (or carries no timestamp)."""
+    raw = _text(record.get("Modified_Time"))
+    if not raw:
+        return True
+    try:
+        modified = datetime.fromisoformat(raw)
+    except ValueError:
+        return True
+    if modified.tzinfo is None:
+        modified = modified.replace(tzinfo=timezone.utc)
+    return modified >= cutoff
+
+
+def upcoming_jobs(contacts: Iterable[Dict[str, Any]], deals: Iterable[Dict[str, Any]],
+                  recent_days: float = PRE_RESEARCH_RECENT_DAYS,
+                  limit: int = PRE_RESEARCH_MAX_ADDRESSES) -> List[PreResearchJob]:
+    """Candidate addresses from cached Zoho contacts and deals, newest first, one per unit."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=recent_days)
+    jobs: List[PreResearchJob] = []
+    contact_by_id: Dict[str, Dict[str, Any]] = {}
+
+    for c in contacts:
+        contact_by_id[_text(c.get("id"))] = c
+        street = _text(c.get("Mailing_Street"))
+        if not street or _INACTIVE_RE.search(_text(c.get("Status"))) or not _modified_since(c, cutoff):
+            continue
+        state_zip = " ".join(p for p in (_text(c.get("Mailing_State")), _text(c.get("Mailing_Zip"))) if p)
+        address = ", ".join(p for p in (street, _text(c.get("Mailing_City")), state_zip) if p)
+        owner = _text(c.get("Full_Name")) or None
+        context = property_research.client_context_for(
+            owner, _text(c.get("Propery_Status")), _text(c.get("Description")))
+        jobs.append(PreResearchJob(address, owner, context, "contact", _text(c.get("Modified_Time"))))
+
+    for d in deals:
+        name = _text(d.get("Deal_Name"))
+        if not _STREET_NUMBER_RE.match(name) or _INACTIVE_RE.search(_text(d.get("Stage"))):
+            continue
+        if not _modified_since(d, cutoff):
+            continue
+        link = d.get("Contact_Name")
+        contact = contact_by_id.get(_text(link.get("id")), {}) if isinstance(link, dict) else {}
+        address = name
+        if "," not in name:
+            # Deal names carry no city; without one the cache key can't match the report's.
+            city = _text(contact.get("Mailing_City"))
+            if not city:
+                continue
+            address = f"{name}, {city}"
+        owner = _text(contact.get("Full_Name")) or _text(d.get("Contact_Name")) or None
+        context = property_research.client_context_for(
+            owner, _text(contact.get("Propery_Status")), _text(contact.get("Description")))
+        jobs.append(PreResearchJob(address, owner, context, "deal", _text(d.get("Modified_Time"))))
+
+    jobs.sort(key=lambda j: j.modified or "", reverse=True)
+    seen, unique = set(), []
+    for job in jobs:
+        key = address_keys(job.address)[1]
+        if key and key not in seen:
+            seen.add(key)
+            unique.append(job)
+    return unique[:max(0, limit)]
+
+
+class LocalBatchSubmitter:
+    """Runs a batch on an in-process worker pool, at most ``concurrency`` at a time."""
+
+    def __init__(self, research: Callable[[PreResearchJob], Optional[Dict[str, Any]]],
+                 concurrency: int = PRE_RESEARCH_CONCURRENCY):
+        self.research = research
+        self.concurrency = max(1, concurrency)
+
+    def _run_one(self, job: PreResearchJob) -> Optional[Dict[str, Any]]:
+        try:
+            return self.research(job)
+        except Exception as e:  # one bad address never sinks the batch
+            logger.warning("Pre-research failed for '%s': %s", job.address, e)
+            return None
+
+    def submit(self, jobs: List[PreResearchJob]) -> List[Optional[Dict[str, Any]]]:
+        if not jobs:
+            return []
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(jobs)),
+                                thread_name_prefix="pre-research") as pool:
+            return list(pool.map(self._run_one, jobs))
+
+
+def _tier() -> str:
+    """PRE_RESEARCH_TIER, falling back to the default when it is unknown or doesn't cache."""
+    try:
+        name, depth = property_research.resolve_tier(PRE_RESEARCH_TIER)
+    except ValueError as e:
+        logger.warning("%s — pre-research uses the %s tier", e, property_research.DEFAULT_TIER)
+        return property_research.DEFAULT_TIER
+    if not depth.cache_results:
+        logger.warning("Research tier %r doesn't cache results — pre-research uses 'standard'", name)
+        return "standard"
+    return name
+
+
+class PreResearcher:
+    """Runs pre-research batches, one at a time, and keeps the last run's stats."""
+
+    def __init__(self):
+        self.last_run: Dict[str, Any] = {}
+        self.runs = 0
+        self._running = threading.Lock()
+
+    def run(self, anthropic_api_key: str, submitter: Optional[Submitter] = None,
+            contacts: Optional[List[Dict[str, Any]]] = None,
+            deals: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Research the upcoming addresses not already fresh in the cache.
+
+        ``contacts`` / ``deals`` default to the cached Zoho data; ``submitter``
+        defaults to a LocalBatchSubmitter over property_research. Blocking —
+        call via ``asyncio.to_thread`` from async code. Never raises.
+        """
+        if not self._running.acquire(blocking=False):
+            logger.info("Pre-research already running — skipping this run")
+            return {"skipped": "already running"}
+        started = time.monotonic()
+        try:
+            stats = self._run(anthropic_api_key, submitter, contacts, deals)
+        except Exception as e:
+            logger.error("Pre-research run failed: %s", e)
+            stats = {"error": type(e).__name__}
+        finally:
+            self._running.release()
+        stats["elapsed_s"] = round(time.monotonic() - started, 1)
+        logger.info("Pre-research run: %s", stats)
+        self.runs += 1
+        self.last_run = {**stats, "finished_at": datetime.now().isoformat()}
+        return stats
+
+    def _run(self, anthropic_api_key: str, submitter: Optional[Submitter],
+             contacts: Optional[List[Dict[str, Any]]],
+             deals: Optional[List[Dict[str, Any]]]) -> Dict[str, Any]:
+        if contacts is None:
+            contacts = load_contacts()
+        if deals is None:
+            try:
+                from neighboring_projects import NeighboringProjectsManager
+            except ImportError:
+                from .neighboring_projects import NeighboringProjectsManager
+            deals = (NeighboringProjectsManager().load_cache() or {}).get("deals") or []
+        candidates = upcoming_jobs(contacts, deals)
+        cache = get_research_cache()
+        jobs = [j for j in candidates if not cache.is_fresh(j.address, j.owner_name, j.client_context)]
+        stats = {"candidates": len(candidates), "fresh": len(candidates) - len(jobs),
+                 "submitted": 0, "researched": 0, "failed": 0}
+        if not jobs:
+            return stats
+        if submitter is None:
+            if not anthropic_api_key:
+                logger.info("Pre-research skipped (no Anthropic key)")
+                return {**stats, "skipped": "no key"}
+            tier = _tier()
+            submitter = LocalBatchSubmitter(lambda job: property_research.research_property(
+                job.address, anthropic_api_key, owner_name=job.owner_name,
+                client_context=job.client_context, tier=tier, priority=PRIORITY_BACKGROUND)).submit
+        logger.info("Pre-researching %d upcoming address(es) (%d already fresh)", len(jobs), stats["fresh"])
+        results = submitter(jobs)
+        stats["submitted"] = len(jobs)
+        stats["researched"] = sum(1 for r in results if r and not r.get("partial"))
+        stats["failed"] = len(jobs) - stats["researched"]
+        return stats
+
+    def stats(self) -> Dict[str, Any]:
+        return {"enabled": PRE_RESEARCH, "running": self._running.locked(), "runs": self.runs,
+                "last_run": self.last_run}
+
+
+_pre_researcher = PreResearcher()
+
+
+def get_pre_researcher() -> PreResearcher:
+    return _pre_researcher
@@ -1,25 +1,150 @@
-import requests
 import re
-from typing import Dict, Any, Optional
-import time
-import http.client
+from typing import Dict, Any, Iterable, Iterator, NamedTuple, Optional, Tuple
 import json
+import os
+import threading
 import urllib.parse
 import logging
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 
-# Try to import BeautifulSoup4, but make it optional for deployment
 try:
-    from bs4 import BeautifulSoup
-    HAS_BS4 = True
+    from address_canon import DIAGONALS, DIRECTIONS, STREET_TYPES, parse_address
+    from http_pool import HttpPool, get_http_pool
 except ImportError:
-    BeautifulSoup = None
-    HAS_BS4 = False
-    print("Warning: BeautifulSoup4 not available. Web scraping features will be disabled.")
+    from .address_canon import DIAGONALS, DIRECTIONS, STREET_TYPES, parse_address
+    from .http_pool import HttpPool, get_http_pool
+
+# Try to import lxml, but make it optional for deployment
+try:
+    from lxml import etree
+    HAS_LXML = True
+except ImportError:
+    etree = None
+    HAS_LXML = False
+    print("Warning: lxml not available. Web scraping features will be disabled.")
 
 logger = logging.getLogger(__name__)
 
+DIRECTION_WORDS = frozenset(DIRECTIONS) | frozenset(DIRECTIONS.values()) | frozenset(DIAGONALS) | frozenset(DIAGONALS.values())
+
+# get_property_id races its lookup strategies (SerpAPI, Realtor.com site search,
+# DuckDuckGo) instead of running them back to back: each starts this many
+# seconds after the previous one unless that one has already finished empty,
+# and the first ID found wins. PROPERTY_ID_HEDGE=off restores the sequential
+# order.
+PROPERTY_ID_HEDGE = os.environ.get("PROPERTY_ID_HEDGE", "on").strip().lower() not in ("off", "0", "false", "no")
+PROPERTY_ID_HEDGE_DELAY_S = float(os.environ.get("PROPERTY_ID_HEDGE_DELAY_S", 1.5))
+
+
+class PropertyIdMatch(NamedTuple):
+    """A lookup strategy's answer: ``exact`` is False for a same-building
+    fallback (right building, another or no unit)."""
+    prop_id: str
+    exact: bool
+
+# Fallbacks for fields the structured /v2/property payload leaves empty, read
+# from the free-text ``details`` groups: (field, trigger, pattern) in priority
+# order per field. Group 1 of the pattern is the value; a None pattern takes
+# the text after its last ':'. The trigger is a lowercase substring every
+# matching text contains: each text is lowercased once, and only the
+# extractors whose trigger it contains run their regex.
+_DETAIL_EXTRACTORS = tuple(
+    (field, trigger, re.compile(pattern) if pattern else None)
+    for field, trigger, pattern in (
+        ("price", "price:", r'Price: \$?([\d,]+)'),
+        ("bedrooms", "bedroom", r'Bedrooms: (\d+)'),
+        ("bedrooms", "beds:", r'Beds: (\d+)'),
+        ("bedrooms", "bedroom", r'Bedroom[s]?: (\d+)'),
+        ("bathrooms", "bathroom", r'Bathrooms: (\d+)'),
+        ("bathrooms", "baths:", r'Baths: (\d+)'),
+        ("bathrooms", "bathroom", r'Bathroom[s]?: (\d+)'),
+        ("rooms", "total rooms:", r'Total Rooms: (\d+)'),
+        ("sqft", "sqft", r'(\d{3,5})\s*sqft'),
+        ("year_built", "year built:", r'Year Built: (\d{4})'),
+        ("hoa_fee", "association fee:", r'Association Fee: (\d+)'),
+        ("property_type", "property subtype", r'Property Subtype: ([\w-]+)'),
+        ("property_type", "property subtype", None),
+        ("neighborhood", "neighborhood", r'Neighborhood: ([\w\s-]+)'),
+        ("neighborhood", "neighborhood", None),
+    )
+)
+_EXTRACTORS_BY_TRIGGER: Dict[str, tuple] = {
+    trigger: tuple(i for i, (_, t, _) in enumerate(_DETAIL_EXTRACTORS) if t == trigger)
+    for _, trigger, _ in _DETAIL_EXTRACTORS
+}
+
+
+def index_details(details) -> Dict[str, str]:
+    """Field -> fallback value from a RapidAPI ``details`` list, in one pass.
+
+    Equivalent to trying each field's patterns in order, each over every text,
+    and keeping the first text the highest-priority matching pattern hits.
+    """
+    found: Dict[int, str] = {}
+    for det in details or []:
+        for text in (det or {}).get('text') or []:
+            if not isinstance(text, str):
+                continue
+            lowered = text.lower()
+            for trigger, extractors in _EXTRACTORS_BY_TRIGGER.items():
+                if trigger not in lowered:
+                    continue
+                for i in extractors:
+                    if i in found:
+                        continue
+                    pattern = _DETAIL_EXTRACTORS[i][2]
+                    if pattern is None:
+                        found[i] = text.split(':')[-1].strip()
+                    else:
+                        m = pattern.search(text)
+                        if m:
+                            found[i] = m.group(1)
+    values: Dict[str, str] = {}
+    for i in sorted(found):
+        values.setdefault(_DETAIL_EXTRACTORS[i][0], found[i])
+    return values
+
+
+# Realtor.com listing URL: slug and the _M<property id> suffix.
+_LISTING_URL_RE = re.compile(r'https://www\.realtor\.com/realestateandhomes-detail/([^"?#]*?)_M([\d-]+)')
+
+
+def _stream_links(body: Iterable[bytes]) -> Iterator[Tuple[str, str]]:
+    """(href, class) of each <a> in an HTML body, yielded as soon as the parser
+    reaches the tag.
+
+    The body is fed to lxml's pull parser chunk by chunk, so a caller that stops
+    iterating (and closes the response) never downloads or parses the rest.
+    """
+    parser = etree.HTMLPullParser(events=("start",), tag="a")
+    for chunk in body:
+        parser.feed(chunk)
+        for _event, el in parser.read_events():
+            yield el.get("href") or "", el.get("class") or ""
+    parser.close()
+    for _event, el in parser.read_events():
+        yield el.get("href") or "", el.get("class") or ""
+
+
+def _result_target(href: str) -> str:
+    """Where a DuckDuckGo result link points (its ``uddg`` param), else the href itself."""
+    if "uddg=" in href:
+        return urllib.parse.parse_qs(urllib.parse.urlparse(href).query).get("uddg", [""])[0]
+    return href
+
+
+def _realtor_listing_ids(links: Iterable[Tuple[str, str]]) -> Iterator[Tuple[str, str]]:
+    """(url slug, property id) of each distinct Realtor.com listing link, in page order."""
+    seen = set()
+    for href, _cls in links:
+        m = _LISTING_URL_RE.search(_result_target(href))
+        if m and m.groups() not in seen:
+            seen.add(m.groups())
+            yield m.groups()
+
+
 class PropertyAPI:
-    def __init__(self, api_key: str, serpapi_key: str = None):
+    def __init__(self, api_key: str, serpapi_key: str = None, http: Optional[HttpPool] = None):
         self.api_key = api_key
         self.serpapi_key = serpapi_key
         self.host = "us-real-estate-listings.p.rapidapi.com"
@@ -27,14 +152,14 @@ class PropertyAPI:
             'x-rapidapi-key': api_key,
             'x-rapidapi-host': self.host
         }
+        # Keep-alive sessions per host, shared process-wide so repeated lookups
+        # (and other PropertyAPI instances) reuse warm connections.
+        self.http = http or get_http_pool()
         logger.info("PropertyAPI initialized")
 
     def _make_request(self, endpoint: str, params: Dict[str, str] = None) -> Optional[Dict]:
         """Make a request to the RapidAPI endpoint"""
-        conn = None
         try:
-            conn = http.client.HTTPSConnection(self.host)
-
             # Build query string if params provided
             query = ""
             if params:
@@ -42,25 +167,24 @@ class PropertyAPI:
                 encoded_params = {k: urllib.parse.quote(str(v)) for k, v in params.items()}
                 query = "?" + "&".join(f"{k}={v}" for k, v in encoded_params.items())
 
-            conn.request("GET", f"{endpoint}{query}", headers=self.headers)
-            res = conn.getresponse()
-            data = res.read()
+            url = f"https://{self.host}{endpoint}{query}"
+            res = self.http.get(url, headers=self.headers)
+            data = res.content
 
-            if res.status != 200:
-                logger.error("Error from RapidAPI: HTTP %s", res.status)
+            if res.status_code != 200:
+                logger.error("Error from RapidAPI: HTTP %s", res.status_code)
                 logger.debug("Response body: %s", data.decode('utf-8', errors='replace'))
                 return None
 
-            return json.loads(data.decode('utf-8'))
+            try:
+                return json.loads(data.decode('utf-8'))
+            except ValueError:
+                self.http.forget(url)  # don't serve a garbled body from the response cache
+                raise
 
         except Exception as e:
             logger.error("Error making RapidAPI request: %s", e)
             return None
-        finally:
-            # conn may be None if HTTPSConnection() itself raised; guard before closing
-            # so we don't mask the original error with an UnboundLocalError.
-            if conn is not None:
-                conn.close()
 
     def get_property_details(self, property_id: str) -> Dict[str, Any]:
         """Get detailed property information using property ID (live RapidAPI)."""
@@ -75,39 +199,14 @@ class PropertyAPI:
                 return {}
             d = data['data']
 
-            def search_details(category=None, regex=None, contains=None):
-                details_list = d.get('details') or []
-                for det in details_list:
-                    if category and det.get('category', '').lower() == category.lower():
-                        text_list = det.get('text') or []
-                        for t in text_list:
-                            if regex:
-                                m = re.search(regex, t)
-                                if m:
-                                    return m.group(1)
-                            elif contains and contains.lower() in t.lower():
-                                return t
-                            else:
-                                return t
-                    text_list = det.get('text') or []
-                    for t in text_list:
-                        if contains and contains.lower() in t.lower():
-                            return t
-                        if regex:
-                            m = re.search(regex, t)
-                            if m:
-                                return m.group(1)
-                return None
+            # The free-text details are only indexed if a structured field is missing.
+            fallback_values = None
 
-            def search_details_any(regex):
-                details_list = d.get('details') or []
-                for det in details_list:
-                    text_list = det.get('text') or []
-                    for t in text_list:
-                        m = re.search(regex, t)
-                        if m:
-                            return m.group(1)
-                return None
+            def fallback(field):
+                nonlocal fallback_values
+                if fallback_values is None:
+                    fallback_values = index_details(d.get('details'))
+                return fallback_values.get(field)
 
             # Address fields
             # Safely handle cases where 'location' or 'address' may be None instead of a dict
@@ -123,7 +222,7 @@ class PropertyAPI:
             # Price
             price = d.get('list_price')
             if not price:
-                price = search_details_any(r'Price: \$?([\d,]+)')
+                price = fallback('price')
                 if price:
                     price = int(price.replace(',', ''))
             logger.debug(f"[DEBUG] Price: {price}")
@@ -146,13 +245,7 @@ class PropertyAPI:
             description = d.get('description') or {}
             bedrooms = description.get('beds')
             if not bedrooms:
-                bedrooms = search_details('Bedrooms', r'Bedrooms: (\d+)')
-            if not bedrooms:
-                bedrooms = search_details_any(r'Bedrooms: (\d+)')
-            if not bedrooms:
-                bedrooms = search_details_any(r'Beds: (\d+)')
-            if not bedrooms:
-                bedrooms = search_details_any(r'Bedroom[s]?: (\d+)')
+                bedrooms = fallback('bedrooms')
             if not bedrooms:
                 bedrooms = 'Information not available'
             logger.debug(f"[DEBUG] Bedrooms: {bedrooms}")
@@ -160,21 +253,13 @@ class PropertyAPI:
             # Bathrooms
             bathrooms = description.get('baths') or description.get('baths_consolidated')
             if not bathrooms:
-                bathrooms = search_details('Bathrooms', r'Bathrooms: (\d+)')
-            if not bathrooms:
-                bathrooms = search_details_any(r'Bathrooms: (\d+)')
-            if not bathrooms:
-                bathrooms = search_details_any(r'Baths: (\d+)')
-            if not bathrooms:
-                bathrooms = search_details_any(r'Bathroom[s]?: (\d+)')
+                bathrooms = fallback('bathrooms')
             if not bathrooms:
                 bathrooms = 'Information not available'
             logger.debug(f"[DEBUG] Bathrooms: {bathrooms}")
 
             # Rooms (total rooms)
-            rooms = search_details('Other Rooms', r'Total Rooms: (\d+)')
-            if not rooms:
-                rooms = search_details_any(r'Total Rooms: (\d+)')
+            rooms = fallback('rooms')
             if not rooms:
                 rooms = 'Information not available'
             logger.debug(f"[DEBUG] Rooms: {rooms}")
@@ -182,7 +267,7 @@ class PropertyAPI:
             # Sqft
             sqft = description.get('sqft')
             if not sqft:
-                sqft = search_details_any(r'(\d{3,5})\s*sqft')
+                sqft = fallback('sqft')
             if not sqft:
                 # Try property_history
                 for hist in (d.get('property_history') or []):
@@ -198,7 +283,7 @@ class PropertyAPI:
             # Year Built
             year_built = description.get('year_built')
             if not year_built:
-                year_built = search_details_any(r'Year Built: (\d{4})')
+                year_built = fallback('year_built')
             if not year_built:
                 year_built = 'Information not available'
             logger.debug(f"[DEBUG] Year Built: {year_built}")
@@ -208,9 +293,7 @@ class PropertyAPI:
             hoa_obj = d.get('hoa') or {}
             hoa_fee = hoa_obj.get('fee')
             if not hoa_fee:
-                hoa_fee = search_details('Homeowners Association', r'Association Fee: (\d+)')
-            if not hoa_fee:
-                hoa_fee = search_details_any(r'Association Fee: (\d+)')
+                hoa_fee = fallback('hoa_fee')
             if not hoa_fee:
                 hoa_fee = 'Information not available'
             logger.debug(f"[DEBUG] HOA Fee: {hoa_fee}")
@@ -218,15 +301,7 @@ class PropertyAPI:
             # Property Type
             property_type = description.get('type') or description.get('sub_type')
             if not property_type:
-                property_type = search_details_any(r'Property Subtype: ([\w-]+)')
-            if not property_type:
-                details_list = d.get('details') or []
-                for det in details_list:
-                    text_list = det.get('text') or []
-                    for t in text_list:
-                        if 'property subtype' in t.lower():
-                            property_type = t.split(':')[-1].strip()
-                            break
+                property_type = fallback('property_type')
             if not property_type:
                 property_type = 'Information not available'
             logger.debug(f"[DEBUG] Property Type: {property_type}")
@@ -237,15 +312,7 @@ class PropertyAPI:
             if neighborhoods:
                 neighborhood = neighborhoods[0].get('name')
             if not neighborhood:
-                neighborhood = search_details_any(r'Neighborhood: ([\w\s-]+)')
-            if not neighborhood:
-                details_list = d.get('details') or []
-                for det in details_list:
-                    text_list = det.get('text') or []
-                    for t in text_list:
-                        if 'neighborhood' in t.lower():
-                            neighborhood = t.split(':')[-1].strip()
-                            break
+                neighborhood = fallback('neighborhood')
             if not neighborhood:
                 neighborhood = 'Information not available'
             logger.debug(f"[DEBUG] Neighborhood: {neighborhood}")
@@ -373,45 +440,103 @@ class PropertyAPI:
             return numeric if numeric.isdigit() else None
         return None
 
-    def get_property_id(self, address: str) -> Optional[str]:
-        """High-level helper to get property ID via multiple strategies."""
-        logger.info(f"Getting property ID for: {address}")
-        
-        # Strategy 1: Try SerpAPI if configured (most reliable)
+    def _property_id_strategies(self):
+        """(name, fn(address, cancel)) lookups in order of preference."""
+        strategies = []
         if self.serpapi_key:
-            logger.info("Trying SerpAPI (Google Search)...")
-            prop_id = self._get_property_id_serpapi(address)
-            if prop_id:
-                logger.info(f"SerpAPI returned property ID: {prop_id}")
-                return prop_id
-        
-        # Strategy 2: Try web scraping if BeautifulSoup4 is available
-        if HAS_BS4:
-            logger.info("Trying web scraping methods...")
-            
-            # 2a: Try Realtor.com site search first (more reliable than DuckDuckGo)
-            logger.info("Attempting Realtor.com site search...")
-            realtor_url = self._realtor_site_search_url(address)
-            if realtor_url:
-                prop_id = self.extract_property_id_from_url(realtor_url)
-                if prop_id:
-                    logger.info(f"Realtor.com site search returned property ID: {prop_id}")
-                    return prop_id
-            
-            # 2b: Try DuckDuckGo as fallback
-            logger.info("Attempting DuckDuckGo search...")
-            prop_id = self._scrape_property_id_duckduckgo(address)
-            if prop_id:
-                logger.info(f"DuckDuckGo returned property ID: {prop_id}")
-                return prop_id
+            strategies.append(("SerpAPI", self._get_property_id_serpapi))
+        if HAS_LXML:
+            strategies.append(("Realtor.com site search", self._get_property_id_realtor_search))
+            strategies.append(("DuckDuckGo", self._scrape_property_id_duckduckgo))
         else:
-            logger.warning("BeautifulSoup4 not available, cannot perform web scraping")
-        
+            logger.warning("lxml not available, cannot perform web scraping")
+        return strategies
+
+    def _get_property_id_realtor_search(self, address: str, cancel: Optional[threading.Event] = None) -> Optional[PropertyIdMatch]:
+        """Property ID of the first Realtor.com search result; exact only when the
+        requested unit (if any) is the one in the listing URL."""
+        realtor_url = self._realtor_site_search_url(address, cancel)
+        prop_id = self.extract_property_id_from_url(realtor_url) if realtor_url else None
+        if not prop_id:
+            return None
+        unit = self._extract_apartment_from_address(address)
+        url_unit = self._extract_apartment_from_url(realtor_url)
+        return PropertyIdMatch(prop_id, not unit or (url_unit or '').upper() == unit.upper())
+
+    def get_property_id(self, address: str) -> Optional[str]:
+        """High-level helper to get property ID via multiple strategies.
+
+        Strategies are hedged: the next one starts PROPERTY_ID_HEDGE_DELAY_S
+        after the previous (at once if that one came back empty or with only a
+        same-building fallback). The first exact-unit ID wins and the others
+        are told to stop between queries; a fallback is used only once every
+        strategy has finished without an exact match, the preferred one first.
+        """
+        logger.info(f"Getting property ID for: {address}")
+        strategies = self._property_id_strategies()
+
+        if not PROPERTY_ID_HEDGE or len(strategies) < 2:
+            for name, lookup in strategies:
+                logger.info(f"Trying {name}...")
+                match = lookup(address)
+                if match:
+                    logger.info(f"{name} returned property ID: {match.prop_id}"
+                                + ("" if match.exact else " (same-building fallback)"))
+                    return match.prop_id
+            logger.warning("All property ID lookup methods failed")
+            return None
+
+        preference = {name: i for i, (name, _) in enumerate(strategies)}
+        cancel = threading.Event()
+        queued = list(strategies)
+        running = {}
+        fallbacks = {}
+        pool = ThreadPoolExecutor(max_workers=len(strategies), thread_name_prefix="property-id")
+        try:
+            while queued or running:
+                if queued:
+                    name, lookup = queued.pop(0)
+                    logger.info(f"Trying {name}...")
+                    running[pool.submit(lookup, address, cancel)] = name
+                done, _ = wait(running, timeout=PROPERTY_ID_HEDGE_DELAY_S if queued else None,
+                               return_when=FIRST_COMPLETED)
+                # Several can finish together; keep the preferred strategy's answer.
+                for future in sorted(done, key=lambda f: preference[running[f]]):
+                    name = running.pop(future)
+                    try:
+                        match = future.result()
+                    except Exception as e:
+                        logger.warning(f"{name} property ID lookup failed: {e}")
+                        continue
+                    if not match:
+                        continue
+                    if not match.exact:
+                        # Right building, wrong unit: a slower strategy may still find the unit.
+                        logger.info(f"{name} returned same-building fallback ID: {match.prop_id}")
+                        fallbacks[name] = match.prop_id
+                        continue
+                    if running:
+                        logger.info(f"{name} returned property ID: {match.prop_id} "
+                                    f"(cancelling {', '.join(running.values())})")
+                    else:
+                        logger.info(f"{name} returned property ID: {match.prop_id}")
+                    return match.prop_id
+        finally:
+            cancel.set()
+            pool.shutdown(wait=False, cancel_futures=True)
+
+        if fallbacks:
+            name = min(fallbacks, key=preference.get)
+            logger.info(f"No exact unit match; using {name} same-building fallback ID: {fallbacks[name]}")
+            return fallbacks[name]
         logger.warning("All property ID lookup methods failed")
         return None
-    
-    def _get_property_id_serpapi(self, address: str) -> Optional[str]:
-        """Get property ID using SerpAPI (Google Search) - Most reliable method."""
+
+    def _get_property_id_serpapi(self, address: str, cancel: Optional[threading.Event] = None) -> Optional[PropertyIdMatch]:
+        """Get property ID using SerpAPI (Google Search) - Most reliable method.
+
+        Stops between queries once ``cancel`` is set (another strategy won).
+        """
         if not self.serpapi_key:
             return None
 
@@ -453,6 +578,9 @@ class PropertyAPI:
             search_queries = [q for q in search_queries if q]  # Remove None entries
             
             for query in search_queries:
+                if cancel is not None and cancel.is_set():
+                    logger.info("SerpAPI lookup cancelled - property ID already resolved")
+                    return None
                 params = {
                     "engine": "google",
                     "q": query,
@@ -464,7 +592,7 @@ class PropertyAPI:
                 # A single query's timeout must not abort the whole lookup — catch
                 # it and move on so we can still return the building-level fallback.
                 try:
-                    resp = requests.get("https://serpapi.com/search.json", params=params, timeout=12)
+                    resp = self.http.get("https://serpapi.com/search.json", params=params)
                     if resp.status_code != 200:
                         logger.warning(f"SerpAPI returned status {resp.status_code}")
                         continue
@@ -609,7 +737,7 @@ class PropertyAPI:
                         prop_id = self.extract_property_id_from_url(link)
                         if prop_id:
                             logger.info(f"SerpAPI validated and returning property ID: {prop_id}")
-                            return prop_id
+                            return PropertyIdMatch(prop_id, True)
                 
                 logger.info(f"Query '{query}' found no valid property ID after validation")
             
@@ -617,34 +745,20 @@ class PropertyAPI:
             # This gives us building-level data (year built, neighborhood, etc.)
             if best_same_building_id:
                 logger.info(f"SerpAPI: Exact unit not found, using same-building fallback ID: {best_same_building_id}")
-                return best_same_building_id
+                return PropertyIdMatch(best_same_building_id, False)
             
             logger.warning("All SerpAPI queries failed to find valid property ID")
             return None
             
         except Exception as e:
             logger.error(f"Error in SerpAPI lookup: {e}")
-            return best_same_building_id  # use building-level fallback if we found one
+            # use building-level fallback if we found one
+            return PropertyIdMatch(best_same_building_id, False) if best_same_building_id else None
 
     def _normalize_street_type(self, street_type: str) -> str:
         """Normalize street type to a canonical form for comparison."""
         st = street_type.lower().strip().rstrip('.')
-        type_map = {
-            'street': 'street', 'st': 'street',
-            'avenue': 'avenue', 'ave': 'avenue', 'av': 'avenue',
-            'road': 'road', 'rd': 'road',
-            'place': 'place', 'pl': 'place',
-            'plaza': 'plaza', 'plz': 'plaza',
-            'drive': 'drive', 'dr': 'drive',
-            'boulevard': 'boulevard', 'blvd': 'boulevard',
-            'lane': 'lane', 'ln': 'lane',
-            'terrace': 'terrace', 'ter': 'terrace',
-            'court': 'court', 'ct': 'court',
-            'way': 'way',
-            'circle': 'circle', 'cir': 'circle',
-            'parkway': 'parkway', 'pkwy': 'parkway',
-        }
-        return type_map.get(st, st)
+        return STREET_TYPES.get(st, st)
 
     def _extract_city_from_address(self, address: str) -> Optional[str]:
         """Extract city name from a full address string."""
@@ -673,97 +787,49 @@ class PropertyAPI:
         """
         if not requested_address or not returned_address:
             return False
-        
-        # Normalize addresses for comparison
-        req_lower = requested_address.lower().strip()
-        ret_lower = returned_address.lower().strip()
-        
+
+        req = parse_address(requested_address)
+        ret = parse_address(returned_address)
+
         # --- City validation ---
-        # Extract city from the full requested address (before stripping to base)
-        req_city = self._extract_city_from_address(req_lower)
-        ret_city = self._extract_city_from_address(ret_lower)
-        
-        if req_city and ret_city:
+        if req.city and ret.city:
             # Normalize NYC borough names
             nyc_names = {'new york', 'new york city', 'manhattan', 'nyc'}
-            req_city_norm = req_city if req_city not in nyc_names else 'new york'
-            ret_city_norm = ret_city if ret_city not in nyc_names else 'new york'
+            req_city_norm = req.city if req.city not in nyc_names else 'new york'
+            ret_city_norm = ret.city if ret.city not in nyc_names else 'new york'
             
             if req_city_norm != ret_city_norm:
-                logger.warning(f"City mismatch: requested '{req_city}', got '{ret_city}'")
+                logger.warning(f"City mismatch: requested '{req.city}', got '{ret.city}'")
                 return False
-        
-        # Remove unit/apt info for comparison (including units with slashes like #10/11)
-        req_base = re.sub(r'\s*[,]?\s*[#]?\s*(apt|apartment|unit)\s*[a-zA-Z0-9/]+', '', req_lower, flags=re.IGNORECASE)
-        ret_base = re.sub(r'\s*[,]?\s*[#]?\s*(apt|apartment|unit)\s*[a-zA-Z0-9/]+', '', ret_lower, flags=re.IGNORECASE)
-        req_base = re.sub(r'\s*[,]?\s*#[a-zA-Z0-9/]+', '', req_base)
-        ret_base = re.sub(r'\s*[,]?\s*#[a-zA-Z0-9/]+', '', ret_base)
-        req_base = req_base.strip().rstrip(',').strip()
-        ret_base = ret_base.strip().rstrip(',').strip()
-        
-        # Extract street number, street name, and street type separately
-        street_type_pattern = r'(street|st|avenue|ave|av|road|rd|place|pl|plaza|plz|drive|dr|boulevard|blvd|lane|ln|terrace|ter|court|ct|way|circle|cir|parkway|pkwy)'
-        req_match = re.match(rf'(\d+)\s+(.+?)\s+{street_type_pattern}\b', req_base, re.IGNORECASE)
-        ret_match = re.match(rf'(\d+)\s+(.+?)\s+{street_type_pattern}\b', ret_base, re.IGNORECASE)
-        
-        if not req_match or not ret_match:
+
+        if not (req.number and req.street_type and ret.number and ret.street_type):
             # If we can't parse the address format, check if the street numbers match at minimum
-            req_num = re.match(r'(\d+)', req_base)
-            ret_num = re.match(r'(\d+)', ret_base)
-            if req_num and ret_num and req_num.group(1) == ret_num.group(1):
-                logger.info(f"Address format not fully parseable but street numbers match: '{req_base}' vs '{ret_base}'")
+            if req.number and req.number == ret.number:
+                logger.info(f"Address format not fully parseable but street numbers match: '{req.line}' vs '{ret.line}'")
                 return True
-            logger.warning(f"Could not parse addresses for validation: '{req_base}' vs '{ret_base}'")
+            logger.warning(f"Could not parse addresses for validation: '{req.line}' vs '{ret.line}'")
             return True  # Allow through rather than discarding valid data
         
-        req_number = req_match.group(1)
-        req_street = req_match.group(2).strip()
-        req_type = req_match.group(3).strip()
-        ret_number = ret_match.group(1)
-        ret_street = ret_match.group(2).strip()
-        ret_type = ret_match.group(3).strip()
-        
         # Street numbers must match exactly
-        if req_number != ret_number:
-            logger.warning(f"Street number mismatch: requested {req_number}, got {ret_number}")
+        if req.number != ret.number:
+            logger.warning(f"Street number mismatch: requested {req.number}, got {ret.number}")
             return False
         
         # Street type must match (Avenue != Street, Place != Plaza, etc.)
-        if self._normalize_street_type(req_type) != self._normalize_street_type(ret_type):
-            logger.warning(f"Street type mismatch: requested '{req_type}' ({self._normalize_street_type(req_type)}), got '{ret_type}' ({self._normalize_street_type(ret_type)})")
+        if req.street_type != ret.street_type:
+            logger.warning(f"Street type mismatch: requested '{req.street_type}', got '{ret.street_type}'")
             return False
         
-        # Street names must have significant overlap
-        # Normalize directional prefixes before comparison (northeast -> ne, southwest -> sw, etc.)
-        direction_normalize = {
-            'northeast': 'ne', 'northwest': 'nw', 'southeast': 'se', 'southwest': 'sw',
-            'north': 'n', 'south': 's', 'east': 'e', 'west': 'w',
-        }
-        direction_words = set(direction_normalize.keys()) | set(direction_normalize.values())
-
-        def normalize_street_words(words):
-            normalized = set()
-            for w in words:
-                w = direction_normalize.get(w, w)
-                # Strip ordinal suffixes: 27th -> 27, 3rd -> 3, 21st -> 21
-                w = re.sub(r'^(\d+)(st|nd|rd|th)$', r'\1', w)
-                normalized.add(w)
-            return normalized
-
-        req_words = set(req_street.split())
-        ret_words = set(ret_street.split())
-
-        # Normalize directions and ordinals, then filter out direction words
-        req_normalized = normalize_street_words(req_words)
-        ret_normalized = normalize_street_words(ret_words)
-        req_significant = {w for w in req_normalized if w not in direction_words}
-        ret_significant = {w for w in ret_normalized if w not in direction_words}
+        # Street names must have significant overlap (directions aside; ordinals
+        # and abbreviations are already canonical: "E 27th" == "East 27")
+        req_significant = {w for w in req.street.split() if w not in DIRECTION_WORDS}
+        ret_significant = {w for w in ret.street.split() if w not in DIRECTION_WORDS}
 
         # Check for overlap
         if req_significant and ret_significant:
             overlap = req_significant & ret_significant
             if not overlap:
-                logger.warning(f"Street name mismatch: requested '{req_street}' ({req_significant}), got '{ret_street}' ({ret_significant})")
+                logger.warning(f"Street name mismatch: requested '{req.street}' ({req_significant}), got '{ret.street}' ({ret_significant})")
                 return False
         
         logger.info(f"Address validation passed: '{requested_address}' matches '{returned_address}'")
@@ -784,26 +850,30 @@ class PropertyAPI:
         property_id = self.get_property_id(address)
         if property_id:
             result["property_id"] = property_id
-            # Get property details
-            time.sleep(1)  # Rate limiting
-            details = self.get_property_details(property_id)
+            # Details and photos are independent calls: issue both at once (the
+            # shared rate limiter still spaces them on the RapidAPI host).
+            pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="property-photos")
+            try:
+                photos_future = pool.submit(self.get_property_photos, property_id)
+                details = self.get_property_details(property_id)
+                if details:
+                    # CRITICAL: Validate that the returned property matches the requested address
+                    returned_address = details.get('address', '')
+                    if not self._validate_address_match(address, returned_address):
+                        logger.error(f"Address mismatch! Requested: '{address}', Got: '{returned_address}'")
+                        logger.error(f"Property ID {property_id} does not match the requested address. Discarding results.")
+                        return result  # Return empty result; photos for the wrong property are dropped
+                photos = photos_future.result()
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+
             if details:
-                # CRITICAL: Validate that the returned property matches the requested address
-                returned_address = details.get('address', '')
-                if not self._validate_address_match(address, returned_address):
-                    logger.error(f"Address mismatch! Requested: '{address}', Got: '{returned_address}'")
-                    logger.error(f"Property ID {property_id} does not match the requested address. Discarding results.")
-                    return result  # Return empty result
-                
                 result["property_details"] = details
                 # Check if API response includes the URL
                 if details.get('listing_url'):
                     result["realtor_url"] = details['listing_url']
                     logger.info(f"Got Realtor URL from API response: {details['listing_url']}")
-            
-            # Get photos and floor plans
-            time.sleep(1)  # Rate limiting
-            photos = self.get_property_photos(property_id)
+
             if photos:
                 result["images"] = {"images": photos["images"]}
                 result["floor_plans"] = {"floor_plans": photos["floor_plans"]}
@@ -909,12 +979,12 @@ class PropertyAPI:
         match = re.search(r'Apt-([a-zA-Z0-9]+)', url, re.IGNORECASE)
         return match.group(1) if match else None
 
-    def _scrape_property_id_duckduckgo(self, address: str) -> Optional[str]:
-        """Search DuckDuckGo for the realtor listing and extract property ID."""
+    def _scrape_property_id_duckduckgo(self, address: str, cancel: Optional[threading.Event] = None) -> Optional[PropertyIdMatch]:
+        """Search DuckDuckGo for the realtor listing and extract property ID.
+
+        Stops between queries once ``cancel`` is set (another strategy won).
+        """
         try:
-            import random
-            import time
-            
             # Extract key components for better matching
             # Normalize # to Apt for search (search engines strip #)
             search_address = re.sub(r'#\s*([a-zA-Z0-9/]+)', r'Apt \1', address)
@@ -942,12 +1012,36 @@ class PropertyAPI:
                 f"{base_address} site:realtor.com/realestateandhomes-detail",      # Without unit
             ]
             
+            # Extract street name from requested address for validation
+            # e.g., "305 East 24th Street" -> "24"
+            requested_street_name = None
+            street_name_match = re.search(r'\d+\s+(?:east|west|north|south|e|w|n|s)\s+(\d+)(?:st|nd|rd|th)?', base_address, re.IGNORECASE)
+            if street_name_match:
+                requested_street_name = street_name_match.group(1)  # e.g., "24"
+            
+            # Extract named street and type for non-numbered streets
+            requested_named_street = None
+            requested_street_type = None
+            named_match = re.search(
+                r'(\d+)\s+(?:(?:east|west|north|south|e|w|n|s)\s+)?([a-zA-Z]+)\s+(street|st|avenue|ave|av|road|rd|place|pl|plaza|plz|drive|dr|boulevard|blvd|lane|ln|terrace|ter|court|ct|way|parkway|pkwy)',
+                base_address, re.IGNORECASE
+            )
+            if named_match:
+                candidate = named_match.group(2).lower()
+                if not re.match(r'^\d+', candidate):
+                    requested_named_street = candidate
+                    requested_street_type = self._normalize_street_type(named_match.group(3))
+            
+            # Extract city from requested address
+            requested_city = self._extract_city_from_address(base_address.lower())
+            
             # Track best same-building fallback (right building, wrong unit)
             best_same_building_id = None
             
-            session = requests.Session()
-            
             for query in search_queries:
+                if cancel is not None and cancel.is_set():
+                    logger.info("DuckDuckGo lookup cancelled - property ID already resolved")
+                    return None
                 try:
                     # Enhanced headers to avoid bot detection
                     headers = {
@@ -970,61 +1064,21 @@ class PropertyAPI:
                     
                     logger.info(f"DuckDuckGo search URL: {url}")
                     
-                    # Add random delay to avoid rate limiting
-                    time.sleep(random.uniform(1, 3))
-                    
-                    resp = session.get(url, headers=headers, timeout=6)
-                    logger.info(f"DuckDuckGo response status: {resp.status_code}")
-                    
-                    if resp.status_code == 202:
-                        logger.warning("DuckDuckGo returned status 202 - request accepted but not processed")
-                        continue
-                    elif resp.status_code != 200:
-                        logger.warning(f"DuckDuckGo returned status {resp.status_code}")
-                        continue
-                    
-                    # Check response length to ensure we got actual content
-                    logger.info(f"DuckDuckGo response length: {len(resp.text)} chars")
-                    if len(resp.text) < 5000:
-                        logger.warning(f"DuckDuckGo returned short response ({len(resp.text)} chars)")
-                        continue
-                    
-                    # Debug: Log response details
-                    logger.info(f"DuckDuckGo HTML response received successfully")
-                    
-                    # Look for realtor.com URLs in the response text
-                    # Extract both URL and surrounding text for validation
-                    url_pattern = r'https://www\.realtor\.com/realestateandhomes-detail/([^"]*?)_M([\d-]+)'
-                    matches = re.findall(url_pattern, resp.text)
-                    
-                    if matches:
-                        logger.info(f"Found {len(matches)} potential property URLs in response")
-                        
-                        # Extract street name from requested address for validation
-                        # e.g., "305 East 24th Street" -> "24"
-                        requested_street_name = None
-                        street_name_match = re.search(r'\d+\s+(?:east|west|north|south|e|w|n|s)\s+(\d+)(?:st|nd|rd|th)?', base_address, re.IGNORECASE)
-                        if street_name_match:
-                            requested_street_name = street_name_match.group(1)  # e.g., "24"
-                        
-                        # Extract named street and type for non-numbered streets
-                        requested_named_street = None
-                        requested_street_type = None
-                        named_match = re.search(
-                            r'(\d+)\s+(?:(?:east|west|north|south|e|w|n|s)\s+)?([a-zA-Z]+)\s+(street|st|avenue|ave|av|road|rd|place|pl|plaza|plz|drive|dr|boulevard|blvd|lane|ln|terrace|ter|court|ct|way|parkway|pkwy)',
-                            base_address, re.IGNORECASE
-                        )
-                        if named_match:
-                            candidate = named_match.group(2).lower()
-                            if not re.match(r'^\d+', candidate):
-                                requested_named_street = candidate
-                                requested_street_type = self._normalize_street_type(named_match.group(3))
+                    with self.http.stream(url, headers=headers) as resp:
+                        logger.info(f"DuckDuckGo response status: {resp.status_code}")
                         
-                        # Extract city from requested address
-                        requested_city = self._extract_city_from_address(base_address.lower())
+                        if resp.status_code == 202:
+                            logger.warning("DuckDuckGo returned status 202 - request accepted but not processed")
+                            continue
+                        elif resp.status_code != 200:
+                            logger.warning(f"DuckDuckGo returned status {resp.status_code}")
+                            continue
                         
-                        # Validate each match against the original address
-                        for url_slug, prop_id in matches:
+                        # Validate each listing link as soon as the parser reaches it;
+                        # returning closes the stream, so the rest of the page is never read
+                        candidates = 0
+                        for url_slug, prop_id in _realtor_listing_ids(_stream_links(resp)):
+                            candidates += 1
                             clean_id = prop_id.replace('-', '')
                             if clean_id.isdigit() and len(clean_id) >= 8:
                                 # Extract street name from URL slug for validation
@@ -1128,12 +1182,20 @@ class PropertyAPI:
                                        (significant_addr_words & significant_url_words):
                                         logger.info(f"DuckDuckGo: Validated property ID {clean_id} - address match confirmed")
                                         logger.info(f"URL slug: {url_slug}")
-                                        return clean_id
+                                        resp.commit()
+                                        return PropertyIdMatch(clean_id, True)
                                     else:
                                         logger.warning(f"DuckDuckGo: Property ID {clean_id} rejected - address mismatch")
                                         logger.warning(f"Expected words: {significant_addr_words}, URL words: {significant_url_words}")
                         
-                        logger.warning("DuckDuckGo: Found property IDs but none matched the address validation")
+                        logger.info(f"DuckDuckGo read {resp.bytes_read} bytes, {candidates} potential property URLs")
+                        if candidates:
+                            logger.warning("DuckDuckGo: Found property IDs but none matched the address validation")
+                        elif resp.bytes_read < 5000:
+                            # No results at all on a near-empty page: a bot check, not an answer
+                            logger.warning(f"DuckDuckGo returned short response ({resp.bytes_read} bytes)")
+                            self.http.forget(url)
+                            continue
                     
                     logger.info(f"Query '{query}' found no valid property IDs")
                     
@@ -1145,7 +1207,7 @@ class PropertyAPI:
             # This gives us building-level data (year built, neighborhood, etc.)
             if best_same_building_id:
                 logger.info(f"DuckDuckGo: Exact unit not found, using same-building fallback ID: {best_same_building_id}")
-                return best_same_building_id
+                return PropertyIdMatch(best_same_building_id, False)
             
             logger.warning("All DuckDuckGo search queries failed to find property ID")
             return None
@@ -1157,8 +1219,8 @@ class PropertyAPI:
         """Return canonical Realtor.com URL using cost-free layered strategy."""
         logger.info(f"Getting Realtor link for: {address}")
         
-        if not HAS_BS4:
-            logger.warning("BeautifulSoup4 not available, skipping web scraping methods")
+        if not HAS_LXML:
+            logger.warning("lxml not available, skipping web scraping methods")
             # Skip directly to property ID construction
             pid = self.get_property_id(address)
             logger.info(f"get_property_id returned: {pid}")
@@ -1226,8 +1288,11 @@ class PropertyAPI:
             result = re.sub(pattern, '', result, flags=re.IGNORECASE)
         return result.strip()
 
-    def _realtor_site_search_url(self, address: str) -> Optional[str]:
-        """Query Realtor.com's own search page and return first result URL."""
+    def _realtor_site_search_url(self, address: str, cancel: Optional[threading.Event] = None) -> Optional[str]:
+        """Query Realtor.com's own search page and return first result URL.
+
+        Gives up between attempts once ``cancel`` is set (another strategy won).
+        """
         try:
             address_no_unit = self._remove_unit_part(address)
             slug = self._slugify_address(address_no_unit)
@@ -1240,26 +1305,27 @@ class PropertyAPI:
 
             # Retry up to 3 times with small back-off when Realtor blocks (429) or temporary error
             for attempt in range(3):
-                resp = requests.get(search_url, headers=headers, timeout=8)
-                logger.debug(f"[DEBUG] _realtor_site_search_url: Attempt {attempt+1}, status: {resp.status_code}")
-                if resp.status_code == 200:
-                    break
+                if cancel is not None and cancel.is_set():
+                    logger.info("Realtor.com site search cancelled - property ID already resolved")
+                    return None
+                with self.http.stream(search_url, headers=headers) as resp:
+                    logger.debug(f"[DEBUG] _realtor_site_search_url: Attempt {attempt+1}, status: {resp.status_code}")
+                    if resp.status_code == 200:
+                        # First anchor with a detail link wins; the rest of the page is never read
+                        for href, _cls in _stream_links(resp):
+                            if '/realestateandhomes-detail/' in href:
+                                full_url = href if href.startswith('http') else 'https://www.realtor.com' + href
+                                logger.debug(f"[DEBUG] _realtor_site_search_url: Found detail link: {full_url} "
+                                             f"after {resp.bytes_read} bytes")
+                                resp.commit()
+                                return full_url
+                        logger.debug("[DEBUG] _realtor_site_search_url: No detail link found on search page.")
+                        return None
                 if resp.status_code in {429, 403, 502} and attempt < 2:
-                    time.sleep(2 + attempt)  # incremental back-off
+                    # Incremental back-off for every Realtor request, not just this one.
+                    self.http.backoff(search_url, 2 + attempt)
                     continue
                 return None
-            soup = BeautifulSoup(resp.text, "html.parser")
-            for a in soup.select('a'):  # look for anchor tags with detail links
-                href = a.get('href', '')
-                if '/realestateandhomes-detail/' in href:
-                    if href.startswith('http'):
-                        logger.debug(f"[DEBUG] _realtor_site_search_url: Found detail link: {href}")
-                        return href
-                    else:
-                        full_url = 'https://www.realtor.com' + href
-                        logger.debug(f"[DEBUG] _realtor_site_search_url: Found detail link: {full_url}")
-                        return full_url
-            logger.debug("[DEBUG] _realtor_site_search_url: No detail link found on search page.")
             return None
         except Exception as e:
             logger.debug(f"[DEBUG] _realtor_site_search_url: Exception: {e}")
@@ -1296,21 +1362,19 @@ class PropertyAPI:
                 query = urllib.parse.quote_plus(f"{v} site:realtor.com/realestateandhomes-detail")
                 url = f"https://duckduckgo.com/html/?q={query}"
                 logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: Searching DuckDuckGo with URL: {url}")
-                resp = requests.get(url, headers=headers, timeout=6)
-                logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: DuckDuckGo status: {resp.status_code}")
-                if resp.status_code != 200:
-                    continue
-                soup = BeautifulSoup(resp.text, "html.parser")
-                for a in soup.select('a.result__a'):
-                    href = a.get('href', '')
-                    if 'uddg=' in href:
-                        real_url = urllib.parse.parse_qs(urllib.parse.urlparse(href).query).get('uddg', [None])[0]
-                    else:
-                        real_url = href
-                    logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: Found link: {real_url}")
-                    if real_url and 'realtor.com/realestateandhomes-detail' in real_url:
-                        logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: Returning detail link: {real_url}")
-                        return real_url
+                with self.http.stream(url, headers=headers) as resp:
+                    logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: DuckDuckGo status: {resp.status_code}")
+                    if resp.status_code != 200:
+                        continue
+                    for href, cls in _stream_links(resp):
+                        if 'result__a' not in cls.split():
+                            continue
+                        real_url = _result_target(href)
+                        logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: Found link: {real_url}")
+                        if real_url and 'realtor.com/realestateandhomes-detail' in real_url:
+                            logger.debug(f"[DEBUG] _scrape_realtor_url_duckduckgo: Returning detail link: {real_url}")
+                            resp.commit()
+                            return real_url
             logger.debug("[DEBUG] _scrape_realtor_url_duckduckgo: No detail link found in DuckDuckGo results.")
             return None
         except Exception as e:
@@ -1332,7 +1396,7 @@ class PropertyAPI:
             }
             # Log only the query — never the params dict (it contains the SerpAPI api_key).
             logger.debug("_serpapi_realtor_url query: %s", params["q"])
-            resp = requests.get("https://serpapi.com/search.json", params=params, timeout=10)
+            resp = self.http.get("https://serpapi.com/search.json", params=params)
             logger.debug("_serpapi_realtor_url SerpAPI status: %s", resp.status_code)
             if resp.status_code != 200:
                 return None
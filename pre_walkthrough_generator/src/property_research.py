@@ -19,18 +19,60 @@ pipeline degrades gracefully.
 """
 import json
 import logging
+import math
+import os
 import time
-from typing import Any, Dict, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, NamedTuple, Optional, Tuple
 
 try:
     import anthropic
 except ImportError:  # keep import-safe for environments without the SDK
     anthropic = None
 
+try:
+    from model_router import FAST_MODEL, get_router
+    from cassette import wrap_anthropic
+    from deadline import Deadline, DeadlineExceeded
+    from research_cache import get_research_cache
+    from floor_plan_classifier import get_floor_plan_classifier
+    from api_governor import PRIORITY_NORMAL, get_governor, is_overload
+except ImportError:
+    from .model_router import FAST_MODEL, get_router
+    from .cassette import wrap_anthropic
+    from .deadline import Deadline, DeadlineExceeded
+    from .research_cache import get_research_cache
+    from .floor_plan_classifier import get_floor_plan_classifier
+    from .api_governor import PRIORITY_NORMAL, get_governor, is_overload
+
 logger = logging.getLogger(__name__)
 
+# API errors worth a retry when the job's deadline still has room (one retry;
+# a 429/529 waits for the api_governor and retries while the deadline allows).
+_TRANSIENT_ERRORS = tuple(
+    getattr(anthropic, name)
+    for name in ("RateLimitError", "OverloadedError", "InternalServerError", "APIConnectionError")
+    if anthropic is not None and hasattr(anthropic, name)
+)
+
 DEFAULT_MODEL = "claude-opus-4-8"
 
+# Run the research as concurrent sub-queries (owner / parcel / listing / zoning)
+# instead of one monolithic agentic search. RESEARCH_PARALLEL=off restores the
+# single-call brief.
+RESEARCH_PARALLEL = os.environ.get("RESEARCH_PARALLEL", "on").strip().lower() not in ("off", "0", "false", "no")
+
+# Have each search round answer directly in _RESEARCH_SCHEMA JSON instead of
+# prose that a second call then structures — one LLM round trip (and one resend
+# of the findings) less per pass. Rounds whose JSON can't be used fall back to
+# the separate structuring call. Opt in with RESEARCH_STRUCTURED_SEARCH=on.
+RESEARCH_STRUCTURED_SEARCH = os.environ.get("RESEARCH_STRUCTURED_SEARCH", "off").strip().lower() in ("on", "1", "true", "yes")
+
+# Set once the API rejects output_config.format alongside the search tools, so
+# later rounds go straight to the two-step path.
+_structured_search_rejected = False
+_BAD_REQUEST = getattr(anthropic, "BadRequestError", ()) if anthropic is not None else ()
+
 # Structured-output schema (strings throughout so "Information not available"
 # is always valid and the report's suppression logic can handle blanks).
 _RESEARCH_SCHEMA = {
@@ -76,9 +118,29 @@ _RESEARCH_SCHEMA = {
 }
 
 
-def _research_prompt(address: str, owner_name: Optional[str],
-                     owner_email: Optional[str] = None, owner_phone: Optional[str] = None,
-                     client_context: Optional[str] = None) -> str:
+def client_context_for(owner_name: Optional[str], property_status: Optional[str] = None,
+                       description: Optional[str] = None) -> Optional[str]:
+    """Research framing from the CRM contact: an in-contract unit's contact is the
+    incoming BUYER, not the deed owner. None when no special framing applies.
+
+    Part of the owner cache key, so everything that researches a contact ahead of
+    time must build it the same way the report does.
+    """
+    if "contract" in (property_status or "").lower() or "purchas" in (description or "").lower():
+        return (
+            f"IMPORTANT: per the CRM, {owner_name or 'the client'} is the INCOMING BUYER / new owner "
+            "of this unit (it is IN CONTRACT / being purchased). Research and describe THIS person as "
+            "the buyer. The public deed/tax record will still show the CURRENT owner (the SELLER) — do "
+            "not confuse the two; if you mention the deed owner, label them the seller."
+        )
+    return None
+
+
+def _prompt_blocks(address: str, owner_name: Optional[str],
+                   owner_email: Optional[str] = None, owner_phone: Optional[str] = None,
+                   client_context: Optional[str] = None,
+                   known_building: Optional[Dict[str, Any]] = None) -> Dict[str, str]:
+    """Named sections of the research brief, shared by the full prompt and the sub-queries."""
     person = owner_name.strip() if owner_name else None
     # Client-provided contact details (from the consultation) — used ONLY to
     # confirm WHICH public professional profile is the right person when the name
@@ -107,99 +169,178 @@ def _research_prompt(address: str, owner_name: Optional[str],
         if person else
         "Identify the current owner of record from the public deed/tax record.\n"
     ) + contact_line
-    return (
-        "You are preparing an internal pre-walkthrough research brief for a renovation contractor's "
-        "salesperson, who will meet the client at the property. Be THOROUGH and specific — this brief "
-        "should let the rep walk in fully informed. Research:\n\n"
-        f"    {address}\n\n"
-        + (f"{client_context}\n\n" if client_context else "") +
-        "=== FIRST: CLASSIFY THE ADDRESS ===\n"
-        "Decide what this address actually is and set two fields accordingly:\n"
-        "  - a specific home / condo / co-op unit -> address_resolves=true, property_kind='residential'\n"
-        "  - a specific commercial / mixed-use / institutional building -> address_resolves=true, property_kind='non_residential'\n"
-        "  - a PARK, landmark, open space, general area, or an address with NO street number (nothing to "
-        "look up as an individual parcel) -> address_resolves=false, property_kind='not_a_parcel'\n"
-        "  - genuinely unsure -> property_kind='unknown'\n"
-        "If not_a_parcel, do NOT invent parcel facts (beds/baths/sqft/owner): set those to 'Information "
-        "not available' and instead give useful AREA context in feasibility_notes (typical building "
-        "stock, zoning, historic-district risk, permit path).\n\n"
-        "=== OBJECTIVE 1: THE PERSON (owner / first-call contact) ===\n"
-        + person_line +
-        "Then gather PUBLIC, professionally-relevant context to help the rep gauge project scope/budget "
-        "and build rapport:\n"
-        "  - how long they have owned this home, and the purchase price/date (public record)\n"
-        "  - their profession, job title, and the employer or business they own or run\n"
-        "  - public professional profiles (LinkedIn, company website, professional bios, licensing "
-        "boards, notable press) — VERIFY it is the same person (matching locale/role); if a profile "
-        "might be a different individual with the same name, say so explicitly and do NOT rely on it\n"
-        "  - any OTHER properties they own per public records (a portfolio/repeat-client signal)\n"
-        "Compose owner_summary as short labeled lines separated by newlines, for example:\n"
-        "  'Ownership: ...' / 'Tenure: ...' / 'Profession: ...' / 'Business/Employer: ...' / "
-        "'Other properties: ...' / 'For the meeting: ...'.\n"
-        "For the Profession / Business-Employer lines specifically: if you can uniquely confirm the "
-        "person, state it plainly. If you CANNOT uniquely confirm (common name), do NOT leave it just "
-        "'Information not available' — instead give the most likely public professional candidate(s) for "
-        "this name in this area as clearly-labeled UNCONFIRMED leads (e.g. 'Likely finance — a Kapil "
-        "Gupta is a Managing Director at UBS; a physician and a tech founder also share the name — "
-        "unconfirmed, verify in person'). Use 'Information not available' only if you truly found NO "
-        "public professional profile for the name at all. Never assert a single identity you have not "
-        "verified.\n"
-        "PRIVACY BOUNDARY (strict): PUBLIC professional and property-record information ONLY. Do NOT "
-        "compile personal finances/income/net-worth estimates, family or household details, or "
-        "social-media / personal-life profiling. If something is not publicly and professionally "
-        "relevant, leave it out.\n\n"
-        "=== OBJECTIVE 2: THE PROPERTY (building, unit, and site) ===\n"
-        "Get everything available:\n"
-        "  - beds, baths, interior living square footage, year built, number of stories/floors, "
-        "property type, lot size. NOTE: bedroom/bathroom counts are usually NOT in assessor/tax records "
-        "— they are on LISTING pages (Zillow, Trulia, Realtor.com, Redfin, StreetEasy), shown as e.g. "
-        "'4 bd | 3 ba'. Open a current or past listing for this exact address to get the bed/bath count; "
-        "do not report beds/baths as unavailable without checking a listing.\n"
-        "  - for a CONDO or CO-OP unit: the UNIT's beds/baths/interior sqft and floor from listing "
-        "history, PLUS building info (year built, number of units/stories), the monthly HOA / "
-        "maintenance / common charges, and whether it is a condo vs. co-op\n"
-        "  - last sale price & date, and prior sale history if available. If the last recorded sale is "
-        "clearly NON-ARM'S-LENGTH or far below market (e.g. $1, a nominal/intra-family transfer, or a "
-        "price far under the unit's own recent listing/comparable sales), do NOT present it as the plain "
-        "value — append a short flag in last_sale_price like '(below-market/non-arm's-length transfer; "
-        "listed ~$770K)' so the rep isn't misled about value\n"
-        "  - assessed value and annual property taxes\n"
-        "  - zoning district with setback / lot-coverage / FAR limits\n"
-        "  - FEMA flood zone\n"
-        "  - renovation-relevant feasibility: municipal sewer vs. septic, any additions / permits / DOB "
-        "records, landmark or historic-district status, and whether the lot/unit has room to build out "
-        "or reconfigure within the zoning/board envelope\n"
-        "  - if a public listing shows a main exterior photo, capture its DIRECT image URL (ending "
-        ".jpg/.jpeg/.png/.webp) as photo_url; leave it 'Information not available' if none is clearly a "
-        "direct image link\n"
-        "  - FLOOR PLAN (high priority): actively hunt for one. A floor plan is a TOP-DOWN SCHEMATIC "
-        "LINE DRAWING of the unit layout (rooms, walls, dimensions) — it is NOT a photograph of a room. "
-        "Check the property's CURRENT and PAST listings on StreetEasy, Zillow, Realtor.com, and "
-        "CityRealty, and for a condo/co-op the building's line/stack floor plans. Once you find the "
-        "listing page, FETCH IT and look specifically for the floor-plan diagram image (often labeled "
-        "'floor plan' and visually a schematic, not a photo). Return that direct image URL as "
-        "floor_plan_url. Do NOT return a room/interior/exterior PHOTO as floor_plan_url — if you cannot "
-        "find an actual floor-plan diagram, set floor_plan_url to 'Information not available' (a photo "
-        "does not count). ALWAYS return the best listing page URL as listing_url (where the rep can open "
-        "the floor plan and photos).\n\n"
-        "=== SOURCES ===\n"
-        "Use authoritative PUBLIC sources and cross-check. For NYC: StreetEasy, PropertyShark, ACRIS "
-        "(a836-acris.nyc.gov), NYC ZoLa (zola.planning.nyc.gov), DOB NOW / BIS, and NYC landmark maps. "
-        "For NJ: njpropertyrecords, njparcels, and the county tax assessor. For CT/other: the county or "
-        "town assessor (e.g. vgsi) and GIS. Everywhere: Zillow/Redfin/Realtor/Trulia listing history, and "
-        "FEMA msc.fema.gov for flood. Prefer the county/assessor record for lot/sqft/year/taxes/sale, and "
-        "LISTING pages for beds/baths and floor plans (assessor records usually omit bed/bath counts).\n\n"
-        "\n=== GOAL ===\n"
-        "The salesperson should NOT have to research anything again before the walkthrough. Be "
-        "exhaustive on building/unit details, and do your best to capture the floor plan, a photo, and "
-        "the listing URL if they exist publicly.\n\n"
-        "TONE: this goes into a polished, professional report. Write owner_summary and feasibility_notes "
-        "in normal sentence case — do NOT use ALL-CAPS words for emphasis (write 'Not confirmed — verify "
-        "in person', never 'NOT CONFIRMED'). Keep genuine acronyms as-is (LLC, ACRIS, FEMA, DOB, HOA, "
-        "UBS). Keep each note concise and factual.\n\n"
-        "Be factual and cite your sources. If a specific fact cannot be found, use the exact phrase "
-        "'Information not available' for it rather than guessing."
+    # Building facts already established for another unit / an earlier report
+    # (research cache) — the search budget goes to the unit and owner instead.
+    known = {k: v for k, v in (known_building or {}).items()
+             if str(v or "").strip() and v != "Information not available"}
+    known_block = (
+        "=== ALREADY ESTABLISHED (building) ===\n"
+        "These building-level facts come from recent prior research of this building. Reuse them as-is "
+        "and do NOT spend searches re-deriving them:\n"
+        + "".join(f"  - {k}: {v}\n" for k, v in known.items()) + "\n"
+        if known else ""
     )
+    return {
+        "intro": (
+            "You are preparing an internal pre-walkthrough research brief for a renovation contractor's "
+            "salesperson, who will meet the client at the property. Be THOROUGH and specific — this brief "
+            "should let the rep walk in fully informed. Research:\n\n"
+            f"    {address}\n\n"
+            + (f"{client_context}\n\n" if client_context else "")
+            + known_block
+        ),
+        "classify": (
+            "=== FIRST: CLASSIFY THE ADDRESS ===\n"
+            "Decide what this address actually is and set two fields accordingly:\n"
+            "  - a specific home / condo / co-op unit -> address_resolves=true, property_kind='residential'\n"
+            "  - a specific commercial / mixed-use / institutional building -> address_resolves=true, property_kind='non_residential'\n"
+            "  - a PARK, landmark, open space, general area, or an address with NO street number (nothing to "
+            "look up as an individual parcel) -> address_resolves=false, property_kind='not_a_parcel'\n"
+            "  - genuinely unsure -> property_kind='unknown'\n"
+            "If not_a_parcel, do NOT invent parcel facts (beds/baths/sqft/owner): set those to 'Information "
+            "not available' and instead give useful AREA context in feasibility_notes (typical building "
+            "stock, zoning, historic-district risk, permit path).\n\n"
+        ),
+        "owner": (
+            "=== OBJECTIVE 1: THE PERSON (owner / first-call contact) ===\n"
+            + person_line +
+            "Then gather PUBLIC, professionally-relevant context to help the rep gauge project scope/budget "
+            "and build rapport:\n"
+            "  - how long they have owned this home, and the purchase price/date (public record)\n"
+            "  - their profession, job title, and the employer or business they own or run\n"
+            "  - public professional profiles (LinkedIn, company website, professional bios, licensing "
+            "boards, notable press) — VERIFY it is the same person (matching locale/role); if a profile "
+            "might be a different individual with the same name, say so explicitly and do NOT rely on it\n"
+            "  - any OTHER properties they own per public records (a portfolio/repeat-client signal)\n"
+            "Compose owner_summary as short labeled lines separated by newlines, for example:\n"
+            "  'Ownership: ...' / 'Tenure: ...' / 'Profession: ...' / 'Business/Employer: ...' / "
+            "'Other properties: ...' / 'For the meeting: ...'.\n"
+            "For the Profession / Business-Employer lines specifically: if you can uniquely confirm the "
+            "person, state it plainly. If you CANNOT uniquely confirm (common name), do NOT leave it just "
+            "'Information not available' — instead give the most likely public professional candidate(s) for "
+            "this name in this area as clearly-labeled UNCONFIRMED leads (e.g. 'Likely finance — a Kapil "
+            "Gupta is a Managing Director at UBS; a physician and a tech founder also share the name — "
+            "unconfirmed, verify in person'). Use 'Information not available' only if you truly found NO "
+            "public professional profile for the name at all. Never assert a single identity you have not "
+            "verified.\n"
+            "PRIVACY BOUNDARY (strict): PUBLIC professional and property-record information ONLY. Do NOT "
+            "compile personal finances/income/net-worth estimates, family or household details, or "
+            "social-media / personal-life profiling. If something is not publicly and professionally "
+            "relevant, leave it out.\n\n"
+        ),
+        "property_head": (
+            "=== OBJECTIVE 2: THE PROPERTY (building, unit, and site) ===\n"
+            "Get everything available:\n"
+        ),
+        "listing": (
+            "  - beds, baths, interior living square footage, year built, number of stories/floors, "
+            "property type, lot size. NOTE: bedroom/bathroom counts are usually NOT in assessor/tax records "
+            "— they are on LISTING pages (Zillow, Trulia, Realtor.com, Redfin, StreetEasy), shown as e.g. "
+            "'4 bd | 3 ba'. Open a current or past listing for this exact address to get the bed/bath count; "
+            "do not report beds/baths as unavailable without checking a listing.\n"
+            "  - for a CONDO or CO-OP unit: the UNIT's beds/baths/interior sqft and floor from listing "
+            "history, PLUS building info (year built, number of units/stories), the monthly HOA / "
+            "maintenance / common charges, and whether it is a condo vs. co-op\n"
+        ),
+        "parcel": (
+            "  - last sale price & date, and prior sale history if available. If the last recorded sale is "
+            "clearly NON-ARM'S-LENGTH or far below market (e.g. $1, a nominal/intra-family transfer, or a "
+            "price far under the unit's own recent listing/comparable sales), do NOT present it as the plain "
+            "value — append a short flag in last_sale_price like '(below-market/non-arm's-length transfer; "
+            "listed ~$770K)' so the rep isn't misled about value\n"
+            "  - assessed value and annual property taxes\n"
+        ),
+        "zoning": (
+            "  - zoning district with setback / lot-coverage / FAR limits\n"
+            "  - FEMA flood zone\n"
+            "  - renovation-relevant feasibility: municipal sewer vs. septic, any additions / permits / DOB "
+            "records, landmark or historic-district status, and whether the lot/unit has room to build out "
+            "or reconfigure within the zoning/board envelope\n"
+        ),
+        "media": (
+            "  - if a public listing shows a main exterior photo, capture its DIRECT image URL (ending "
+            ".jpg/.jpeg/.png/.webp) as photo_url; leave it 'Information not available' if none is clearly a "
+            "direct image link\n"
+            "  - FLOOR PLAN (high priority): actively hunt for one. A floor plan is a TOP-DOWN SCHEMATIC "
+            "LINE DRAWING of the unit layout (rooms, walls, dimensions) — it is NOT a photograph of a room. "
+            "Check the property's CURRENT and PAST listings on StreetEasy, Zillow, Realtor.com, and "
+            "CityRealty, and for a condo/co-op the building's line/stack floor plans. Once you find the "
+            "listing page, FETCH IT and look specifically for the floor-plan diagram image (often labeled "
+            "'floor plan' and visually a schematic, not a photo). Return that direct image URL as "
+            "floor_plan_url. Do NOT return a room/interior/exterior PHOTO as floor_plan_url — if you cannot "
+            "find an actual floor-plan diagram, set floor_plan_url to 'Information not available' (a photo "
+            "does not count). ALWAYS return the best listing page URL as listing_url (where the rep can open "
+            "the floor plan and photos).\n\n"
+        ),
+        "sources": (
+            "=== SOURCES ===\n"
+            "Use authoritative PUBLIC sources and cross-check. For NYC: StreetEasy, PropertyShark, ACRIS "
+            "(a836-acris.nyc.gov), NYC ZoLa (zola.planning.nyc.gov), DOB NOW / BIS, and NYC landmark maps. "
+            "For NJ: njpropertyrecords, njparcels, and the county tax assessor. For CT/other: the county or "
+            "town assessor (e.g. vgsi) and GIS. Everywhere: Zillow/Redfin/Realtor/Trulia listing history, and "
+            "FEMA msc.fema.gov for flood. Prefer the county/assessor record for lot/sqft/year/taxes/sale, and "
+            "LISTING pages for beds/baths and floor plans (assessor records usually omit bed/bath counts).\n\n"
+        ),
+        "goal": (
+            "\n=== GOAL ===\n"
+            "The salesperson should NOT have to research anything again before the walkthrough. Be "
+            "exhaustive on building/unit details, and do your best to capture the floor plan, a photo, and "
+            "the listing URL if they exist publicly.\n\n"
+        ),
+        "tone": (
+            "TONE: this goes into a polished, professional report. Write owner_summary and feasibility_notes "
+            "in normal sentence case — do NOT use ALL-CAPS words for emphasis (write 'Not confirmed — verify "
+            "in person', never 'NOT CONFIRMED'). Keep genuine acronyms as-is (LLC, ACRIS, FEMA, DOB, HOA, "
+            "UBS). Keep each note concise and factual.\n\n"
+            "Be factual and cite your sources. If a specific fact cannot be found, use the exact phrase "
+            "'Information not available' for it rather than guessing."
+        ),
+    }
+
+
+_FULL_PROMPT_ORDER = ("intro", "classify", "owner", "property_head", "listing", "parcel", "zoning",
+                      "media", "sources", "goal", "tone")
+
+
+def _research_prompt(address: str, owner_name: Optional[str],
+                     owner_email: Optional[str] = None, owner_phone: Optional[str] = None,
+                     client_context: Optional[str] = None,
+                     known_building: Optional[Dict[str, Any]] = None) -> str:
+    """The complete single-call research brief."""
+    blocks = _prompt_blocks(address, owner_name, owner_email, owner_phone, client_context, known_building)
+    return "".join(blocks[name] for name in _FULL_PROMPT_ORDER)
+
+
+# Independent sub-researches run concurrently: (brief sections, focus line,
+# web searches, page fetches). Each gets its own search budget so one slow
+# objective (the floor-plan hunt) no longer starves the others.
+_SUBQUERIES: Dict[str, Tuple[Tuple[str, ...], str, int, int]] = {
+    "owner": (("owner",),
+              "Research ONLY the person / ownership objective below; other parts of the brief are "
+              "handled separately.", 4, 1),
+    "parcel": (("classify", "property_head", "parcel"),
+               "Research ONLY the address classification and the parcel, sale and tax record below; "
+               "other parts of the brief are handled separately.", 4, 1),
+    "listing": (("property_head", "listing", "media"),
+                "Research ONLY the unit/building facts, photo and floor plan below from current and past "
+                "LISTINGS; other parts of the brief are handled separately.", 4, 3),
+    "zoning": (("property_head", "zoning"),
+               "Research ONLY the zoning, flood and renovation-feasibility facts below; other parts of the "
+               "brief are handled separately.", 3, 1),
+}
+
+
+_STRUCTURED_SEARCH_NOTE = (
+    "\n\nOUTPUT: when your research is done, answer with the required JSON record only. Use the exact "
+    "string 'Information not available' for any field you did not establish (including fields outside "
+    "your focus), and put every source URL you relied on in 'sources'."
+)
+
+
+def _subquery_prompt(name: str, blocks: Dict[str, str]) -> str:
+    sections, focus, _, _ = _SUBQUERIES[name]
+    return (blocks["intro"] + f"FOCUS: {focus}\n\n" + "".join(blocks[s] for s in sections) + "\n"
+            + blocks["sources"] + blocks["tone"])
 
 
 # Property-fact fields the gap-fill pass may backfill (owner/classification excluded).
@@ -210,10 +351,190 @@ _PROPERTY_FACT_KEYS = (
 )
 # Core facts worth a second targeted pass when the first leaves them blank.
 _CORE_FIELDS = ("bedrooms", "bathrooms", "sqft", "year_built")
-# Skip the (optional) gap-fill pass if pass 1 already consumed this much wall
-# clock, so pass1 + gap-fill stays well under the 600s gunicorn worker window
-# even on a slow-tail run.
-_GAPFILL_SKIP_AFTER = 240.0
+# Deadline budgeting (seconds). Research rounds leave _STRUCTURE_RESERVE_S for
+# structuring the findings. A round is only started with _MIN_ROUND_S left, the
+# gap-fill pass with _GAPFILL_MIN_S, the vision check with _VISION_MIN_S and any
+# API call with _MIN_CALL_S. A round gets its full web_search/web_fetch max_uses
+# with _FULL_SEARCH_BUDGET_S left and proportionally fewer below that.
+_STRUCTURE_RESERVE_S = 60.0
+_MIN_ROUND_S = 30.0
+_GAPFILL_MIN_S = 90.0
+_VISION_MIN_S = 10.0
+_MIN_CALL_S = 5.0
+_FULL_SEARCH_BUDGET_S = 180.0
+
+
+class ResearchTier(NamedTuple):
+    """How deep one research run goes (see RESEARCH_TIERS)."""
+    max_searches: int           # web_search budget of the brief (sub-queries scale to it)
+    max_fetches: int            # web_fetch budget of the brief
+    effort: str                 # output_config effort of the search rounds
+    model: Optional[str]        # research model; None -> the router's default (flagship)
+    gap_fill: bool              # run the targeted second pass for missing core facts
+    vision_check: str           # floor-plan check: "full" (local + model), "local" (no model call), "off"
+    structured_search: Optional[bool]  # None -> RESEARCH_STRUCTURED_SEARCH
+    budget_s: float             # research's share of the job budget
+    structure_reserve_s: float  # of which held back for structuring
+    job_budget_s: float         # whole-report latency budget the server gives a job of this tier
+    cache_results: bool         # write results to the research cache (shallow runs don't)
+    extract_model: Optional[str]  # transcript extraction on this model without thinking; None -> routed
+
+
+# Named research depths, selectable per report request (``research_tier``).
+# "fast" targets a same-day report in under a minute: the fast model (for the
+# transcript extraction too), a few searches answered directly as JSON, no
+# gap-fill, and a local-only floor-plan check. "deep" is for scheduled
+# walkthroughs with time to spare.
+RESEARCH_TIERS: Dict[str, ResearchTier] = {
+    "fast": ResearchTier(
+        max_searches=3, max_fetches=1, effort="low", model=FAST_MODEL, gap_fill=False,
+        vision_check="local", structured_search=True, budget_s=40.0, structure_reserve_s=10.0,
+        job_budget_s=60.0, cache_results=False, extract_model=FAST_MODEL),
+    "standard": ResearchTier(
+        max_searches=8, max_fetches=3, effort="low", model=None, gap_fill=True,
+        vision_check="full", structured_search=None, budget_s=420.0, structure_reserve_s=_STRUCTURE_RESERVE_S,
+        job_budget_s=540.0, cache_results=True, extract_model=None),
+    "deep": ResearchTier(
+        max_searches=14, max_fetches=6, effort="medium", model=None, gap_fill=True,
+        vision_check="full", structured_search=None, budget_s=500.0, structure_reserve_s=_STRUCTURE_RESERVE_S,
+        job_budget_s=580.0, cache_results=True, extract_model=None),
+}
+DEFAULT_TIER = os.environ.get("RESEARCH_TIER", "standard").strip().lower()
+if DEFAULT_TIER not in RESEARCH_TIERS:
+    logger.warning("Unknown RESEARCH_TIER=%r — using 'standard'", DEFAULT_TIER)
+    DEFAULT_TIER = "standard"
+
+# Sub-query search/fetch budgets in _SUBQUERIES are sized for the standard brief.
+_BASE_SEARCHES, _BASE_FETCHES = 8, 3
+# Gap-fill budget at the standard tier (room to fetch a listing page), scaled likewise.
+_GAPFILL_SEARCHES, _GAPFILL_FETCHES = 5, 2
+
+
+def resolve_tier(name: Optional[str]) -> Tuple[str, ResearchTier]:
+    """(name, tier) for a tier name; None/'' -> DEFAULT_TIER. Raises ValueError if unknown."""
+    key = (name or DEFAULT_TIER).strip().lower()
+    if key not in RESEARCH_TIERS:
+        raise ValueError(f"Unknown research tier {name!r}; expected one of: {', '.join(RESEARCH_TIERS)}")
+    return key, RESEARCH_TIERS[key]
+
+
+def _scaled_budget(n: int, total: int, base: int) -> int:
+    """A sub-query's share ``n`` of the base budget, scaled to a tier's ``total``."""
+    if total <= 0 or n <= 0:
+        return 0
+    return max(1, min(total, math.ceil(n * total / base)))
+
+
+class _Findings:
+    """Research prose + cited URLs from one round, captured as the response streams.
+
+    A round that hits the deadline or fails part-way keeps everything received
+    so far; ``complete`` is only set once the round finishes normally.
+    """
+
+    def __init__(self):
+        self.parts = []
+        self.sources = []
+        self.complete = False
+        self.last_turn = ""
+        self.record: Optional[Dict[str, Any]] = None  # parsed JSON from a structured round
+        self._turn_start = 0
+
+    def add_text(self, text: str) -> None:
+        self.parts.append(text)
+
+    def end_turn(self) -> None:
+        self.last_turn = "".join(self.parts[self._turn_start:])
+        self.parts.append("\n\n")
+        self._turn_start = len(self.parts)
+
+    def add_block(self, block: Any) -> None:
+        """Keep the URLs a finished text block cites."""
+        if getattr(block, "type", None) != "text":
+            return
+        for citation in getattr(block, "citations", None) or []:
+            url = getattr(citation, "url", None)
+            if url and url not in self.sources:
+                self.sources.append(url)
+
+    def text(self) -> str:
+        return "".join(list(self.parts)).strip()
+
+    @classmethod
+    def merge(cls, named: Dict[str, "_Findings"]) -> "_Findings":
+        """One record of several sub-queries' findings under per-query headers."""
+        merged = cls()
+        sections = []
+        for name, found in named.items():
+            text = found.text()
+            if text:
+                sections.append(f"=== {name.upper()} FINDINGS ===\n{text}")
+            for url in list(found.sources):
+                if url not in merged.sources:
+                    merged.sources.append(url)
+        merged.parts = ["\n\n".join(sections)]
+        merged.complete = all(found.complete for found in named.values())
+        if named and all(found.record is not None for found in named.values()):
+            merged.record = _merge_records({name: found.record for name, found in named.items()})
+        return merged
+
+
+def _parse_record(raw: str) -> Optional[Dict[str, Any]]:
+    """A JSON research record from model text; salvages JSON wrapped in prose."""
+    raw = (raw or "").strip()
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+    except json.JSONDecodeError:
+        import re as _re
+        m = _re.search(r"\{.*\}", raw, _re.DOTALL)
+        if not m:
+            return None
+        try:
+            data = json.loads(m.group(0))
+        except json.JSONDecodeError:
+            return None
+    return data if isinstance(data, dict) else None
+
+
+def _merge_records(records: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+    """Field-wise union of structured sub-query records.
+
+    Classification comes from the 'parcel' sub-query (it owns that objective),
+    each text field from the first sub-query that established it, and list
+    fields are concatenated without duplicates.
+    """
+    ordered = list(records.values())
+    classifier = records.get("parcel") or ordered[0]
+    merged: Dict[str, Any] = {}
+    for key, spec in _RESEARCH_SCHEMA["properties"].items():
+        if spec.get("type") == "array":
+            items = []
+            for r in ordered:
+                for item in r.get(key) or []:
+                    if str(item).strip() and item not in items:
+                        items.append(item)
+            merged[key] = items
+        elif key in ("address_resolves", "property_kind"):
+            merged[key] = classifier.get(key)
+        elif key == "found":
+            merged[key] = any(bool(r.get("found")) for r in ordered)
+        else:
+            merged[key] = next((r[key] for r in ordered if _field(r, key) != "Information not available"),
+                               "Information not available")
+    return merged
+
+
+def _merge_sources(data: Dict[str, Any], *more: list) -> None:
+    """Append new URLs to data['sources'], keeping order and dropping duplicates."""
+    merged, seen = [], set()
+    for s in list(data.get("sources") or []) + [u for urls in more for u in (urls or [])]:
+        s = str(s).strip()
+        if s and s not in seen:
+            seen.add(s)
+            merged.append(s)
+    data["sources"] = merged
 
 
 def _field(data: Optional[Dict[str, Any]], key: str) -> str:
@@ -256,6 +577,56 @@ def _gap_prompt(address: str, missing: list) -> str:
     )
 
 
+def _property_kind(data: Dict[str, Any]) -> str:
+    # Canonicalize spaces AND hyphens ("non-residential" -> "non_residential")
+    # so a natural-orthography value still matches the renderer's checks.
+    return str(data.get("property_kind") or "unknown").strip().lower().replace(" ", "_").replace("-", "_")
+
+
+def _result_from_data(address: str, data: Dict[str, Any], cached: bool = False,
+                      partial: bool = False) -> Dict[str, Any]:
+    """Shape a structured research record (fresh or cached) into research_property's result."""
+    property_kind = _property_kind(data)
+    property_details = {
+        "address": address,
+        # This pipeline researches OWNED (off-market) homes — there is no
+        # active list price, so leave 'price' as the sentinel. The document
+        # generator then renders the sale under a "Last Sold Price" label
+        # instead of mislabeling a years-old purchase as the current price.
+        "price": "Information not available",
+        "last_sold_price": _field(data, "last_sale_price"),
+        "last_sold_date": _field(data, "last_sale_date"),
+        "bedrooms": _field(data, "bedrooms"),
+        "bathrooms": _field(data, "bathrooms"),
+        "sqft": _field(data, "sqft"),
+        "year_built": _field(data, "year_built"),
+        "property_type": _field(data, "property_type"),
+        "lot_size": _field(data, "lot_size"),
+        "assessed_value": _field(data, "assessed_value"),
+        "property_taxes": _field(data, "property_taxes"),
+        "neighborhood": _field(data, "neighborhood"),
+        "photo_url": _field(data, "photo_url"),
+        "floor_plan_url": _field(data, "floor_plan_url"),
+        "listing_url": _field(data, "listing_url"),
+        "photos": [],
+        "floor_plans": [],
+        "source": "public records research",
+    }
+    return {
+        "found": bool(data.get("found")),
+        "address_resolves": bool(data.get("address_resolves", True)),
+        "property_kind": property_kind,
+        "property_details": property_details,
+        "zoning": _field(data, "zoning"),
+        "flood_zone": _field(data, "flood_zone"),
+        "feasibility": [s for s in (data.get("feasibility_notes") or []) if str(s).strip()],
+        "owner_summary": _field(data, "owner_summary"),
+        "sources": [s for s in (data.get("sources") or []) if str(s).strip()],
+        "cached": cached,
+        "partial": partial,
+    }
+
+
 def research_property(
     address: str,
     anthropic_api_key: str,
@@ -263,143 +634,347 @@ def research_property(
     owner_email: Optional[str] = None,
     owner_phone: Optional[str] = None,
     client_context: Optional[str] = None,
-    model: str = DEFAULT_MODEL,
-    effort: str = "low",
-    max_searches: int = 8,
-    max_fetches: int = 3,   # fetches enable floor-plan/listing retrieval; the ~2-min
-                            # report time is fine because delivery is async (POST 0.1s
-                            # + poll — no 120s synchronous limit)
+    model: Optional[str] = None,
+    effort: Optional[str] = None,
+    max_searches: Optional[int] = None,
+    max_fetches: Optional[int] = None,  # fetches enable floor-plan/listing retrieval; the ~2-min
+                                        # report time is fine because delivery is async (POST 0.1s
+                                        # + poll — no 120s synchronous limit)
 
     use_thinking: bool = False,
-    timeout: float = 420.0,
+    timeout: Optional[float] = None,
+    remaining_s: Optional[float] = None,
+    parallel: Optional[bool] = None,
+    deadline: Optional[Deadline] = None,
+    structured_search: Optional[bool] = None,
+    tier: Optional[str] = None,
+    priority: int = PRIORITY_NORMAL,
 ) -> Optional[Dict[str, Any]]:
     """Research a property (and lightly, its owner) from public web sources.
 
-    Tuned for DEPTH within a bounded latency budget: basic web search (no
-    dynamic-filtering code-exec), a couple of targeted page fetches, no extended
-    thinking, and a strict per-call client timeout so one report can never hang.
-    The hard timeout + max_retries=0 guarantee a graceful None on a slow run
-    rather than a stuck worker. (Extended thinking + the dynamic-filtering tools
-    are what previously pushed this to 15+ minutes; they stay off.)
+    Classifies the address (residential / non_residential / not_a_parcel),
+    researches it as concurrent sub-queries (or the single-call brief with
+    ``parallel=False``), structures the findings into ``_RESEARCH_SCHEMA`` and,
+    for a residential parcel still missing core facts, runs one gap-fill pass.
 
-    First classifies the address (residential / non_residential / not_a_parcel)
-    so the report can adapt — a park or place-name yields no parcel facts by
-    design, not by failure. For a resolvable residential parcel still missing
-    core facts (beds/baths/sqft/year) after the first pass, runs one bounded
-    gap-fill pass and merges only the blanks.
+    ``tier`` picks a RESEARCH_TIERS depth; explicit ``model`` / ``effort`` /
+    ``max_searches`` / ``max_fetches`` / ``structured_search`` override it.
+    Everything runs against ``deadline`` (capped at ``timeout``, default the
+    tier's research budget; without one, ``timeout`` or ``remaining_s``), and
+    API calls queue on the api_governor at ``priority``. Fresh results come
+    from the research cache without any API call.
 
     Returns {found, address_resolves, property_kind, property_details,
-    feasibility, owner_summary, sources, zoning, flood_zone} or None on any
-    failure/timeout. Never raises.
+    feasibility, owner_summary, sources, zoning, flood_zone, cached, partial} or
+    None when nothing usable was gathered; a result cut short by the deadline is
+    ``partial`` and not cached. Never raises.
     """
-    if anthropic is None or not anthropic_api_key or not address:
-        logger.info("Property research skipped (no SDK / key / address)")
+    if not address:
+        return None
+    cache = get_research_cache()
+    cached = cache.lookup(address, owner_name, client_context)
+    if cached.data is not None:
+        return _result_from_data(address, cached.data, cached=True)
+    if anthropic is None or not anthropic_api_key:
+        logger.info("Property research skipped (no SDK / key)")
         return None
     try:
-        # Hard client-side timeout + no retries so one report can't hang for
-        # tens of minutes on a slow search loop.
-        client = anthropic.Anthropic(api_key=anthropic_api_key, timeout=timeout, max_retries=0)
+        tier_name, depth = resolve_tier(tier)
+    except ValueError as e:
+        logger.warning("%s — using %s", e, DEFAULT_TIER)
+        tier_name, depth = resolve_tier(None)
+    effort = effort or depth.effort
+    max_searches = depth.max_searches if max_searches is None else max_searches
+    max_fetches = depth.max_fetches if max_fetches is None else max_fetches
+    if structured_search is None:
+        structured_search = (RESEARCH_STRUCTURED_SEARCH if depth.structured_search is None
+                             else depth.structured_search)
+    reserve_s = depth.structure_reserve_s
+    # A short tier's rounds are short by design; don't hold them to the standard minimum.
+    min_round_s = min(_MIN_ROUND_S, depth.budget_s / 4)
+    timeout = timeout or depth.budget_s
+    try:
+        if deadline is None:
+            deadline = Deadline(min(timeout, remaining_s) if remaining_s is not None else timeout)
+        else:
+            deadline = deadline.child(timeout)
+        remaining_s = deadline.remaining()
+        logger.info("Researching '%s' at %s depth (%d searches, %d fetches, %.0fs budget)",
+                    address, tier_name, max_searches, max_fetches, remaining_s)
+        # Retries are handled below against the deadline, never by the SDK.
+        client = wrap_anthropic(anthropic.Anthropic(api_key=anthropic_api_key, timeout=timeout, max_retries=0))
         _start = time.monotonic()
+        router = get_router()
+        governor = get_governor()
+        research_route = router.choose("research", model or depth.model or DEFAULT_MODEL, remaining_s=remaining_s)
+        structure_route = router.choose("structure", research_route.model, remaining_s=remaining_s)
+
+        def _create(route, dl: Deadline, step: str, findings: Optional[_Findings] = None, **kwargs):
+            """messages.create with the routed model and a deadline-sized timeout,
+            recording latency + tokens, inside an api_governor slot; one retry on a
+            transient error if time allows, and as many as the deadline allows
+            on a 429/529 (the governor paces them).
 
-        def _run_search(prompt: str, n_search: int, n_fetch: int) -> str:
+            With ``findings`` the call is streamed instead: text and citations are
+            added to it as they arrive and the stream is abandoned as soon as
+            ``dl`` expires or is cancelled. A call that already streamed text is
+            not retried (its findings stand)."""
+            retried = False
+            while True:
+                dl.check(step, need_s=_MIN_CALL_S)
+                received = len(findings.parts) if findings is not None else 0
+                started = time.monotonic()
+                try:
+                    with governor.slot(route.task, priority, dl):
+                        started = time.monotonic()
+                        if findings is None:
+                            resp = client.messages.create(model=route.model, timeout=dl.timeout(timeout), **kwargs)
+                        else:
+                            with client.messages.stream(model=route.model, timeout=dl.timeout(timeout),
+                                                        **kwargs) as stream:
+                                for event in stream:
+                                    if event.type == "text":
+                                        findings.add_text(event.text)
+                                    elif event.type == "content_block_stop":
+                                        findings.add_block(event.content_block)
+                                    dl.check(step)
+                                resp = stream.get_final_message()
+                except DeadlineExceeded:
+                    raise
+                except _TRANSIENT_ERRORS as e:
+                    router.record(route, time.monotonic() - started, ok=False)
+                    overloaded = is_overload(e)
+                    if (dl.remaining() > min_round_s and (findings is None or len(findings.parts) == received)
+                            and (overloaded or (not retried and type(e).__name__ != "APITimeoutError"))):
+                        logger.info("%s for '%s': %s %s — retrying", step, address,
+                                    "overloaded" if overloaded else "transient", type(e).__name__)
+                        retried = retried or not overloaded
+                        if not (overloaded and governor.enabled):
+                            time.sleep(2.0)
+                        continue
+                    raise
+                except Exception:
+                    router.record(route, time.monotonic() - started, ok=False)
+                    raise
+                router.record(route, time.monotonic() - started, resp)
+                return resp
+
+        def _run_search(prompt: str, n_search: int, n_fetch: int, dl: Deadline, step: str,
+                        findings: _Findings) -> None:
             """One research round: basic web search (+ optional fetch), following
-            pause_turn continuations. Basic tools (not the _20260209 dynamic-
-            filtering variant) keep it fast."""
+            pause_turn continuations while ``dl`` has room. Basic tools (not the
+            _20260209 dynamic-filtering variant) keep it fast. The text of every
+            turn accumulates in ``findings`` — also when this raises. A structured
+            round also leaves its parsed JSON in ``findings.record``."""
+            global _structured_search_rejected
+            dl.check(step, need_s=min_round_s)
+            n_search = dl.scaled(n_search, _FULL_SEARCH_BUDGET_S)
             tools = [{"type": "web_search_20250305", "name": "web_search", "max_uses": n_search}]
             if n_fetch > 0:
-                tools.append({"type": "web_fetch_20250910", "name": "web_fetch", "max_uses": n_fetch})
-            kwargs = dict(model=model, max_tokens=6000, output_config={"effort": effort}, tools=tools)
-            if use_thinking:
+                tools.append({"type": "web_fetch_20250910", "name": "web_fetch",
+                              "max_uses": dl.scaled(n_fetch, _FULL_SEARCH_BUDGET_S)})
+            kwargs = dict(max_tokens=6000, output_config={"effort": effort}, tools=tools)
+            if use_thinking or research_route.thinking:
                 kwargs["thinking"] = {"type": "adaptive"}
-            msgs = [{"role": "user", "content": prompt}]
-            resp = None
-            for _ in range(4):  # allow a few pause_turn continuations
-                resp = client.messages.create(messages=msgs, **kwargs)
+            structured = structured_search and not _structured_search_rejected
+            if structured:
+                kwargs["output_config"] = {"effort": effort,
+                                           "format": {"type": "json_schema", "schema": _RESEARCH_SCHEMA}}
+            msgs = [{"role": "user", "content": prompt + _STRUCTURED_SEARCH_NOTE if structured else prompt}]
+            for turn in range(4):  # allow a few pause_turn continuations
+                if turn and dl.remaining() < min_round_s:
+                    logger.info("%s for '%s': stopping after %d turn(s), %.0fs left", step, address, turn, dl.remaining())
+                    break
+                try:
+                    resp = _create(research_route, dl, step, findings=findings, messages=msgs, **kwargs)
+                except _BAD_REQUEST as e:
+                    if not structured or turn:
+                        raise
+                    _structured_search_rejected = True
+                    logger.warning("Structured output rejected alongside web search (%s) — using the "
+                                   "two-step path from now on", e)
+                    structured = False
+                    kwargs["output_config"] = {"effort": effort}
+                    msgs = [{"role": "user", "content": prompt}]
+                    resp = _create(research_route, dl, step, findings=findings, messages=msgs, **kwargs)
+                findings.end_turn()
                 if resp.stop_reason == "pause_turn":
                     msgs.append({"role": "assistant", "content": resp.content})
                     continue
                 break
-            return "".join(b.text for b in resp.content if getattr(b, "type", None) == "text")
+            findings.complete = True
+            if structured:
+                findings.record = _parse_record(findings.last_turn)
+
+        def _salvage(step: str, run) -> _Findings:
+            """Run a research round; on deadline/error keep whatever it streamed.
+
+            Re-raises only when nothing at all was collected."""
+            findings = _Findings()
+            try:
+                run(findings)
+            except Exception as e:
+                if not findings.text():
+                    raise
+                logger.warning("%s for '%s' stopped early (%s: %s) — structuring the %d chars collected",
+                               step, address, type(e).__name__, e, len(findings.text()))
+            return findings
+
+        def _rounds_deadline() -> Deadline:
+            """Search rounds' share of the budget: everything but the structuring reserve."""
+            return deadline.child(deadline.remaining() - reserve_s)
 
         def _structure(research_text: str) -> Optional[Dict[str, Any]]:
             """Structure research prose into the schema; salvage wrapped JSON."""
-            struct = client.messages.create(
-                model=model, max_tokens=6000,  # headroom so the JSON isn't truncated
+            struct = _create(
+                structure_route, deadline, "structure", max_tokens=6000,  # headroom so the JSON isn't truncated
                 messages=[{"role": "user", "content": (
                     "Extract the property research below into the required JSON. Use the exact string "
                     "'Information not available' for any field the research did not establish. Do not "
                     "invent values.\n\n--- RESEARCH ---\n" + research_text)}],
                 output_config={"effort": "low", "format": {"type": "json_schema", "schema": _RESEARCH_SCHEMA}},
             )
-            raw = next((b.text for b in struct.content if getattr(b, "type", None) == "text"), "")
-            try:
-                return json.loads(raw)
-            except json.JSONDecodeError:
-                import re as _re
-                m = _re.search(r"\{.*\}", raw, _re.DOTALL)
-                return json.loads(m.group(0)) if m else None
+            return _parse_record(next((b.text for b in struct.content if getattr(b, "type", None) == "text"), ""))
+
+        def _record(found: _Findings, step: str) -> Optional[Dict[str, Any]]:
+            """The round's own JSON when it finished cleanly, else a structuring call."""
+            if found.complete and found.record is not None:
+                return found.record
+            if structured_search:
+                logger.info("%s for '%s': structured output unusable — structuring separately", step, address)
+            return _structure(found.text())
 
         def _looks_like_floor_plan(url: str) -> bool:
-            """Vision-verify a candidate floor_plan_url is an actual schematic, not
-            a room photo the model mislabeled. Conservative: any error/uncertainty
-            counts as NOT a floor plan (better a link than a wrong image)."""
-            try:
-                v = client.messages.create(
-                    model="claude-haiku-4-5", max_tokens=10,
-                    messages=[{"role": "user", "content": [
-                        {"type": "image", "source": {"type": "url", "url": url}},
-                        {"type": "text", "text": "Is this image an architectural FLOOR PLAN (a top-down "
-                         "schematic diagram of a room layout with walls/room labels), or a PHOTO / "
-                         "something else? Answer with exactly one word: FLOORPLAN or OTHER."}]}],
-                )
+            """Verify a candidate floor_plan_url is an actual schematic, not a room
+            photo the model mislabeled. The local classifier settles clear-cut
+            images (and cached ones); only ambiguous ones reach the vision model.
+            Conservative: any error/uncertainty counts as NOT a floor plan (better
+            a link than a wrong image)."""
+            if depth.vision_check == "off" or deadline.remaining() < _VISION_MIN_S:
+                logger.info("Skipping floor-plan vision check for %s — %s tier, %.0fs left",
+                            url, tier_name, deadline.remaining())
+                return False
+
+            def ask_model(source: Dict[str, Any]) -> Optional[bool]:
+                if depth.vision_check != "full":
+                    logger.info("Floor-plan candidate %s left unverified (%s tier: local check only)",
+                                url, tier_name)
+                    return None
+                try:
+                    v = _create(
+                        router.choose("floor_plan_check", FAST_MODEL, remaining_s=deadline.remaining()),
+                        deadline.child(30.0), "floor_plan_check", max_tokens=10,
+                        messages=[{"role": "user", "content": [
+                            {"type": "image", "source": source},
+                            {"type": "text", "text": "Is this image an architectural FLOOR PLAN (a top-down "
+                             "schematic diagram of a room layout with walls/room labels), or a PHOTO / "
+                             "something else? Answer with exactly one word: FLOORPLAN or OTHER."}]}],
+                    )
+                except Exception as e:
+                    logger.info("Floor-plan vision check failed for %s (%s) — treating as not a floor plan",
+                                url, type(e).__name__)
+                    return None
                 ans = "".join(b.text for b in v.content if getattr(b, "type", None) == "text").strip().upper()
                 return ans.startswith("FLOORPLAN")
-            except Exception as e:
-                logger.info("Floor-plan vision check failed for %s (%s) — treating as not a floor plan",
-                            url, type(e).__name__)
-                return False
 
-        # Pass 1: full research + structuring.
-        research_text = _run_search(_research_prompt(address, owner_name, owner_email, owner_phone, client_context),
-                                    max_searches, max_fetches)
-        if not research_text.strip():
+            return get_floor_plan_classifier().is_floor_plan(
+                url, ask_model, timeout=deadline.timeout(10.0, reserve=_VISION_MIN_S))
+
+        def _run_subqueries(blocks: Dict[str, str]) -> _Findings:
+            """Run every sub-query concurrently; merge their findings.
+
+            Sub-queries still running when the rounds' deadline passes are
+            cancelled (their streams stop at the next event); whatever they had
+            streamed by then is kept alongside the finished ones."""
+            rounds = _rounds_deadline()
+            found = {name: _Findings() for name in _SUBQUERIES}
+
+            def timed(name: str) -> float:
+                _, _, n_search, n_fetch = _SUBQUERIES[name]
+                started = time.monotonic()
+                _run_search(_subquery_prompt(name, blocks),
+                            _scaled_budget(n_search, max_searches, _BASE_SEARCHES),
+                            _scaled_budget(n_fetch, max_fetches, _BASE_FETCHES),
+                            rounds, f"research:{name}", found[name])
+                return time.monotonic() - started
+
+            timings = {}
+            pool = ThreadPoolExecutor(max_workers=len(_SUBQUERIES), thread_name_prefix="research")
+            try:
+                futures = {name: pool.submit(timed, name) for name in _SUBQUERIES}
+                wait(futures.values(), timeout=rounds.remaining() + 1.0)
+                rounds.cancel()
+                for name, future in futures.items():
+                    if not future.done():
+                        logger.info("Research sub-query '%s' for '%s' hit the deadline — cancelled, keeping %d chars",
+                                    name, address, len(found[name].text()))
+                        continue
+                    try:
+                        timings[name] = future.result()
+                    except Exception as e:
+                        logger.info("Research sub-query '%s' failed for '%s': %s (keeping %d chars)",
+                                    name, address, e, len(found[name].text()))
+            finally:
+                pool.shutdown(wait=False, cancel_futures=True)
+            if timings:
+                slowest = max(timings, key=timings.get)
+                logger.info("Research sub-queries for '%s' done in %.1fs (slowest: %s %.1fs; sum %.1fs)",
+                            address, time.monotonic() - _start, slowest, timings[slowest], sum(timings.values()))
+            return _Findings.merge(found)
+
+        # Pass 1: research (concurrent sub-queries, or the single-call brief) + structuring.
+        if RESEARCH_PARALLEL if parallel is None else parallel:
+            pass1 = _run_subqueries(_prompt_blocks(address, owner_name, owner_email, owner_phone,
+                                                   client_context, known_building=cached.building))
+        else:
+            prompt = _research_prompt(address, owner_name, owner_email, owner_phone, client_context,
+                                      known_building=cached.building)
+            pass1 = _salvage("Research", lambda f: _run_search(prompt, max_searches, max_fetches,
+                                                                _rounds_deadline(), "research", f))
+        research_text = pass1.text()
+        if not research_text:
             logger.info("Property research produced no text for '%s'", address)
             return None
-        data = _structure(research_text)
+        partial = not pass1.complete
+        data = _record(pass1, "Research")
+        logger.info("Research pass 1 for '%s' done in %.1fs (%s)", address, time.monotonic() - _start,
+                    "structured search" if structured_search else "search + structuring")
         if not data:
             logger.warning("Property research structuring returned unparseable JSON for '%s'", address)
             return None
+        _merge_sources(data, pass1.sources)
+        # Building facts this run left blank but the cache knows (another unit).
+        for k, v in cached.building.items():
+            if _field(data, k) == "Information not available" and str(v or "").strip():
+                data[k] = v
 
         address_resolves = bool(data.get("address_resolves", True))
-        # Canonicalize spaces AND hyphens ("non-residential" -> "non_residential")
-        # so a natural-orthography value still matches the renderer's checks.
-        property_kind = str(data.get("property_kind") or "unknown").strip().lower().replace(" ", "_").replace("-", "_")
+        property_kind = _property_kind(data)
 
         # Pass 2 (gap-fill): only for a resolvable RESIDENTIAL parcel still missing
-        # core facts. Bounded (fewer searches, one fetch) so latency stays in
-        # budget; merges only blanks — never overwrites a pass-1 value.
-        if address_resolves and property_kind in ("residential", "unknown"):
+        # core facts. Bounded (a smaller search/fetch budget, scaled to the tier)
+        # so latency stays in budget; merges only blanks — never overwrites a
+        # pass-1 value.
+        if depth.gap_fill and address_resolves and property_kind in ("residential", "unknown"):
             missing = [f for f in _CORE_FIELDS if _field(data, f) == "Information not available"]
-            elapsed = time.monotonic() - _start
-            if missing and elapsed > _GAPFILL_SKIP_AFTER:
-                logger.info("Skipping gap-fill for '%s' — pass 1 took %.0fs (>%.0fs), staying under the worker window",
-                            address, elapsed, _GAPFILL_SKIP_AFTER)
+            if missing and deadline.remaining() < _GAPFILL_MIN_S + reserve_s:
+                logger.info("Skipping gap-fill for '%s' — only %.0fs of the job budget left (pass 1 took %.0fs)",
+                            address, deadline.remaining(), time.monotonic() - _start)
                 missing = []
             if missing:
                 logger.info("Gap-fill pass for '%s' (missing: %s)", address, ", ".join(missing))
                 try:
-                    gap_text = _run_search(_gap_prompt(address, missing), 5, 2)  # room to fetch a listing page
-                    gap = _structure(gap_text) if gap_text.strip() else None
+                    gap_found = _salvage("Gap-fill", lambda f: _run_search(
+                        _gap_prompt(address, missing),
+                        _scaled_budget(_GAPFILL_SEARCHES, max_searches, _BASE_SEARCHES),
+                        _scaled_budget(_GAPFILL_FETCHES, max_fetches, _BASE_FETCHES),
+                        _rounds_deadline(), "gap_fill", f))
+                    gap = _record(gap_found, "Gap-fill") if gap_found.text() else None
                     if gap:
                         for k in _PROPERTY_FACT_KEYS:
                             if _field(data, k) == "Information not available" and _field(gap, k) != "Information not available":
                                 data[k] = gap[k]
-                        merged, seen = [], set()
-                        for s in list(data.get("sources") or []) + list(gap.get("sources") or []):
-                            s = str(s).strip()
-                            if s and s not in seen:
-                                seen.add(s); merged.append(s)
-                        data["sources"] = merged
+                        _merge_sources(data, gap.get("sources"), gap_found.sources)
                 except Exception as e:
                     logger.info("Gap-fill pass failed for '%s' (keeping pass-1 data): %s", address, e)
 
@@ -410,42 +985,19 @@ def research_property(
                 logger.info("Rejected non-floor-plan image as floor_plan_url for '%s': %s", address, fp)
                 data["floor_plan_url"] = "Information not available"
 
-        property_details = {
-            "address": address,
-            # This pipeline researches OWNED (off-market) homes — there is no
-            # active list price, so leave 'price' as the sentinel. The document
-            # generator then renders the sale under a "Last Sold Price" label
-            # instead of mislabeling a years-old purchase as the current price.
-            "price": "Information not available",
-            "last_sold_price": _field(data, "last_sale_price"),
-            "last_sold_date": _field(data, "last_sale_date"),
-            "bedrooms": _field(data, "bedrooms"),
-            "bathrooms": _field(data, "bathrooms"),
-            "sqft": _field(data, "sqft"),
-            "year_built": _field(data, "year_built"),
-            "property_type": _field(data, "property_type"),
-            "lot_size": _field(data, "lot_size"),
-            "assessed_value": _field(data, "assessed_value"),
-            "property_taxes": _field(data, "property_taxes"),
-            "neighborhood": _field(data, "neighborhood"),
-            "photo_url": _field(data, "photo_url"),
-            "floor_plan_url": _field(data, "floor_plan_url"),
-            "listing_url": _field(data, "listing_url"),
-            "photos": [],
-            "floor_plans": [],
-            "source": "public records research",
-        }
-        return {
-            "found": bool(data.get("found")),
-            "address_resolves": address_resolves,
-            "property_kind": property_kind,
-            "property_details": property_details,
-            "zoning": _field(data, "zoning"),
-            "flood_zone": _field(data, "flood_zone"),
-            "feasibility": [s for s in (data.get("feasibility_notes") or []) if str(s).strip()],
-            "owner_summary": _field(data, "owner_summary"),
-            "sources": [s for s in (data.get("sources") or []) if str(s).strip()],
-        }
+        # A resolvable property that wasn't identified may be found on a later
+        # run, so only cache identified properties and settled non-parcels —
+        # and never a record salvaged from a cut-off first pass.
+        if partial:
+            logger.info("Property research for '%s' is partial (first pass cut off) — not caching", address)
+        elif not depth.cache_results:
+            logger.info("Property research for '%s' at %s depth — not caching", address, tier_name)
+        elif data.get("found") or not address_resolves:
+            cache.store(address, data, owner_name, client_context)
+        return _result_from_data(address, data, partial=partial)
+    except DeadlineExceeded as e:
+        logger.warning("Property research for '%s' ran out of job budget: %s", address, e)
+        return None
     except Exception as e:  # never break the pipeline
         logger.warning("Property research failed for '%s': %s", address, e)
         return None
@@ -0,0 +1,138 @@
+"""Per-host token-bucket rate limiting shared by every thread.
+
+Throttling used to be fixed sleeps at the call sites (1s between RapidAPI
+calls, 1-3s before each DuckDuckGo query, 0.5s between Zoho pages, 1.1s
+between Nominatim queries). They cost a single job that time even with nothing
+else in flight, and gave no protection when several jobs hit the same provider
+at once — each thread slept on its own schedule.
+
+``RateLimiter`` keeps one token bucket per host: ``rate`` requests/second
+sustained, up to ``burst`` back to back. ``wait(host)`` returns at once while
+the bucket has a token and otherwise sleeps exactly until the caller's turn;
+turns are reserved under a lock, so concurrent callers queue instead of all
+waking together. ``backoff(host, s)`` pushes the whole host back after a
+429/403 so every thread waits, not just the one that was refused.
+
+Hosts without a configured rate are not limited. Override or add rates with
+RATE_LIMITS='{"duckduckgo.com": [0.5, 1]}' (requests/second, burst).
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# host -> (requests per second, burst); from each provider's published limit or
+# the spacing the old fixed sleeps enforced.
+DEFAULT_RATES: Dict[str, Tuple[float, int]] = {
+    "nominatim.openstreetmap.org": (1.0, 1),       # usage policy: max 1 request/second
+    "us-real-estate-listings.p.rapidapi.com": (1.0, 2),
+    "www.zohoapis.com": (2.0, 2),
+    "accounts.zoho.com": (1.0, 2),
+    "duckduckgo.com": (0.5, 1),
+    "www.realtor.com": (0.5, 2),
+}
+
+
+class TokenBucket:
+    """Thread-safe token bucket; callers reserve their turn and sleep outside the lock."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = float(rate)
+        self.burst = max(1, int(burst))
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.waited = 0
+        self.wait_s = 0.0
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt); seconds until it is ours."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            delay = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.calls += 1
+            if delay > 0:
+                self.waited += 1
+                self.wait_s += delay
+            return delay
+
+    def acquire(self) -> float:
+        """Block until a request may go out; returns the seconds waited."""
+        delay = self._reserve()
+        if delay > 0:
+            time.sleep(delay)
+        return delay
+
+    def backoff(self, seconds: float) -> None:
+        """Hold every caller off for ``seconds`` (e.g. the provider answered 429)."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(float(self.burst), self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"rate": self.rate, "burst": self.burst, "calls": self.calls, "waited": self.waited,
+                "wait_s": round(self.wait_s, 2)}
+
+
+class RateLimiter:
+    """One TokenBucket per configured host."""
+
+    def __init__(self, rates: Optional[Dict[str, Tuple[float, int]]] = None):
+        self._buckets = {host: TokenBucket(rate, burst)
+                         for host, (rate, burst) in {**DEFAULT_RATES, **(rates or {})}.items() if rate > 0}
+
+    def bucket(self, host: Optional[str]) -> Optional[TokenBucket]:
+        return self._buckets.get((host or "").lower())
+
+    def wait(self, host: Optional[str]) -> float:
+        """Block until a request to ``host`` is within its rate; 0 for unlimited hosts."""
+        bucket = self.bucket(host)
+        if bucket is None:
+            return 0.0
+        waited = bucket.acquire()
+        if waited > 1.0:
+            logger.debug("Rate limit: waited %.1fs for %s", waited, host)
+        return waited
+
+    def backoff(self, host: Optional[str], seconds: float) -> None:
+        bucket = self.bucket(host)
+        if bucket is not None:
+            bucket.backoff(seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {host: b.stats() for host, b in self._buckets.items() if b.calls}
+
+
+def _env_rates() -> Dict[str, Tuple[float, int]]:
+    raw = os.environ.get("RATE_LIMITS")
+    if not raw:
+        return {}
+    try:
+        return {str(host).lower(): (float(v[0]), int(v[1]) if len(v) > 1 else 1)
+                for host, v in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError, IndexError):
+        logger.warning("Ignoring invalid RATE_LIMITS=%r", raw)
+        return {}
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter() -> RateLimiter:
+    """Process-wide limiter configured from the environment."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter(_env_rates())
+        return _limiter
@@ -0,0 +1,258 @@
+"""Persistent, address-keyed cache for property research.
+
+Web-search research takes minutes per report, yet the same property comes back
+all the time: repeat walkthroughs, report re-runs, and several units in one
+condo/co-op building. Research results are stored here under two canonical keys:
+
+  - BUILDING key (street number + street): facts shared by every unit —
+    year built, zoning, flood zone, property/building type, lot size, neighborhood
+  - UNIT key (building key + unit): the unit's own facts, its sale/tax record,
+    the owner brief, classification, feasibility notes and sources
+
+Each fact class has its own TTL, so volatile facts are re-researched sooner than
+stable ones:
+
+    building  180 days   (zoning / flood / year built rarely change)
+    unit       90 days   (beds / baths / sqft / floor plan / listing)
+    sale       30 days   (last sale, assessed value, taxes)
+    owner      14 days   (owner brief; also invalidated when the client changes)
+
+A lookup where every class is fresh for the unit is a full hit and needs no API
+call. Otherwise the fresh BUILDING facts are still returned so research can skip
+re-deriving them and fill its blanks. Keys come from address_canon, so every
+spelling of an address maps to the same entries.
+
+Each building and unit entry is its own small JSON file under RESEARCH_CACHE_DIR
+(default data/cache/research), written atomically, so server workers and a
+/pre-research batch can store side by side without losing each other's entries,
+and a lookup reads two files however large the store grows. Entries read are
+kept in memory and re-read only when their file changes. Override TTLs with
+RESEARCH_CACHE_TTL_DAYS='{"sale": 7}'; disable with RESEARCH_CACHE=off.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+try:
+    from address_canon import address_keys
+except ImportError:
+    from .address_canon import address_keys
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path(__file__).parent.parent.parent / "data" / "cache" / "research"
+_DAY = 86400.0
+# Entries kept parsed in memory (re-read when their file's mtime changes).
+_MEMO_SIZE = 1024
+
+# Fact class -> (scope, research-schema fields).
+FACT_CLASSES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "building": ("building", ("year_built", "zoning", "flood_zone", "property_type", "lot_size", "neighborhood")),
+    "unit": ("unit", ("found", "address_resolves", "property_kind", "bedrooms", "bathrooms", "sqft",
+                      "photo_url", "floor_plan_url", "listing_url", "feasibility_notes", "sources")),
+    "sale": ("unit", ("last_sale_price", "last_sale_date", "assessed_value", "property_taxes")),
+    "owner": ("unit", ("owner_summary",)),
+}
+
+DEFAULT_TTL_DAYS: Dict[str, float] = {"building": 180, "unit": 90, "sale": 30, "owner": 14}
+
+_SENTINEL = "Information not available"
+
+
+def owner_key(owner_name: Optional[str], client_context: Optional[str] = None) -> str:
+    """Identity the owner brief was written for; a different client invalidates it."""
+    blob = f"{(owner_name or '').strip().lower()}|{client_context or ''}"
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class CacheLookup(NamedTuple):
+    data: Optional[Dict[str, Any]]        # full research record on a complete hit, else None
+    building: Dict[str, Any]              # fresh building-level facts (may be empty)
+    stale: Tuple[str, ...]                # fact classes that need research
+
+
+class ResearchCache:
+    """File-per-entry JSON research store with per-fact-class TTLs."""
+
+    def __init__(self, directory: Optional[str] = None, ttl_days: Optional[Dict[str, float]] = None,
+                 enabled: bool = True):
+        self.directory = Path(directory) if directory else _DEFAULT_DIR
+        self.ttl_s = {k: float(v) * _DAY for k, v in DEFAULT_TTL_DAYS.items()}
+        for k, v in (ttl_days or {}).items():
+            try:
+                self.ttl_s[k] = float(v) * _DAY
+            except (TypeError, ValueError):
+                logger.warning("Ignoring invalid research cache TTL for %s: %r", k, v)
+        self.enabled = enabled
+        self.hits = 0
+        self.partial_hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._memo: "OrderedDict[Path, Tuple[Tuple[int, int], Dict[str, Any]]]" = OrderedDict()
+
+    def _path(self, table: str, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / table / digest[:2] / f"{digest}.json"
+
+    def _load(self, path: Path) -> Optional[Dict[str, Any]]:
+        """The entry stored at ``path``, re-parsed only when the file changed."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        stamp = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            memo = self._memo.get(path)
+            if memo and memo[0] == stamp:
+                self._memo.move_to_end(path)
+                return memo[1]
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning("Research cache entry %s unreadable (%s) — ignoring it", path.name, e)
+            return None
+        if not isinstance(entry, dict):
+            return None
+        self._remember(path, stamp, entry)
+        return entry
+
+    def _remember(self, path: Path, stamp: Tuple[int, int], entry: Dict[str, Any]) -> None:
+        with self._lock:
+            self._memo[path] = (stamp, entry)
+            self._memo.move_to_end(path)
+            while len(self._memo) > _MEMO_SIZE:
+                self._memo.popitem(last=False)
+
+    def _save(self, path: Path, entry: Dict[str, Any]) -> None:
+        """Write one entry atomically; concurrent writers of the same key each
+        leave a complete entry (last one wins)."""
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry, f, indent=1)
+            os.replace(tmp, path)
+            st = path.stat()
+            self._remember(path, (st.st_mtime_ns, st.st_size), entry)
+        except OSError as e:
+            logger.warning("Could not write research cache entry %s: %s", path.name, e)
+
+    def _fresh(self, entry: Optional[Dict[str, Any]], cls: str, now: float,
+               owner: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        rec = ((entry or {}).get("classes") or {}).get(cls)
+        if not rec or now - float(rec.get("ts", 0)) > self.ttl_s.get(cls, 0):
+            return None
+        if owner is not None and rec.get("owner") != owner:
+            return None
+        return rec.get("facts") or {}
+
+    def _read(self, address: str, owner_name: Optional[str],
+              client_context: Optional[str]) -> Tuple[Dict[str, Any], Dict[str, Any], Tuple[str, ...], str]:
+        """(fresh facts, fresh building facts, stale classes, unit key) for ``address``."""
+        building_key, unit_key = address_keys(address)
+        now = time.time()
+        b_entry = self._load(self._path("buildings", building_key))
+        u_entry = self._load(self._path("units", unit_key))
+        owner = owner_key(owner_name, client_context)
+        data, stale = {}, []
+        for cls, (scope, _fields) in FACT_CLASSES.items():
+            facts = self._fresh(b_entry if scope == "building" else u_entry, cls, now,
+                                owner if cls == "owner" else None)
+            if facts is None:
+                stale.append(cls)
+            else:
+                data.update(facts)
+        return data, self._fresh(b_entry, "building", now) or {}, tuple(stale), unit_key
+
+    def lookup(self, address: str, owner_name: Optional[str] = None,
+               client_context: Optional[str] = None) -> CacheLookup:
+        """Fresh cached research for ``address`` (never raises)."""
+        empty = CacheLookup(None, {}, tuple(FACT_CLASSES))
+        if not self.enabled or not address:
+            return empty
+        try:
+            data, building, stale, unit_key = self._read(address, owner_name, client_context)
+            if not stale:
+                with self._lock:
+                    self.hits += 1
+                logger.info("Research cache hit for '%s' (%s)", address, unit_key)
+                return CacheLookup(data, building, ())
+            with self._lock:
+                if building:
+                    self.partial_hits += 1
+                else:
+                    self.misses += 1
+            if building:
+                logger.info("Research cache: building facts fresh for '%s'; stale: %s", address, ", ".join(stale))
+            return CacheLookup(None, building, stale)
+        except Exception as e:
+            logger.warning("Research cache lookup failed for '%s': %s", address, e)
+            return empty
+
+    def is_fresh(self, address: str, owner_name: Optional[str] = None,
+                 client_context: Optional[str] = None) -> bool:
+        """True when ``lookup`` would be a full hit; leaves the hit/miss counters alone."""
+        if not self.enabled or not address:
+            return False
+        try:
+            return not self._read(address, owner_name, client_context)[2]
+        except Exception:
+            return False
+
+    def store(self, address: str, data: Dict[str, Any], owner_name: Optional[str] = None,
+              client_context: Optional[str] = None) -> None:
+        """Save a research record, split into building and unit entries (never raises)."""
+        if not self.enabled or not address or not data:
+            return
+        try:
+            building_key, unit_key = address_keys(address)
+            now = time.time()
+            owner = owner_key(owner_name, client_context)
+            entries = {"buildings": {"address": address, "classes": {}},
+                       "units": {"address": address, "classes": {}}}
+            for cls, (scope, fields) in FACT_CLASSES.items():
+                rec = {"ts": now, "facts": {f: data.get(f, _SENTINEL) for f in fields}}
+                if cls == "owner":
+                    rec["owner"] = owner
+                entries["buildings" if scope == "building" else "units"]["classes"][cls] = rec
+            # Each entry is written whole, so there is no read-modify-write to race.
+            self._save(self._path("buildings", building_key), entries["buildings"])
+            self._save(self._path("units", unit_key), entries["units"])
+        except Exception as e:
+            logger.warning("Research cache store failed for '%s': %s", address, e)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"enabled": self.enabled, "hits": self.hits, "partial_hits": self.partial_hits,
+                    "misses": self.misses}
+
+
+_cache_instance: Optional[ResearchCache] = None
+
+
+def get_research_cache() -> ResearchCache:
+    """Process-wide research cache configured from the environment."""
+    global _cache_instance
+    if _cache_instance is None:
+        ttl = None
+        raw = os.environ.get("RESEARCH_CACHE_TTL_DAYS")
+        if raw:
+            try:
+                ttl = json.loads(raw)
+            except json.JSONDecodeError:
+                logger.warning("Ignoring invalid RESEARCH_CACHE_TTL_DAYS=%r", raw)
+        _cache_instance = ResearchCache(
+            os.environ.get("RESEARCH_CACHE_DIR"),
+            ttl if isinstance(ttl, dict) else None,
+            enabled=os.environ.get("RESEARCH_CACHE", "on").strip().lower() not in ("off", "0", "false", "no"),
+        )
+    return _cache_instance
@@ -0,0 +1,267 @@
+"""On-disk cache of HTTP responses for the property-data lookups.
+
+The same listing details, photos and search-engine result pages are fetched
+again whenever an address comes back — repeat reports, re-runs, and
+enhance_cache_with_neighborhoods.py walking every deal. Each fetch costs
+RapidAPI / SerpAPI quota and a round trip. ``HttpPool`` consults this cache
+before sending a GET, so a repeat lookup is served from disk without touching
+the network or the host's rate limit.
+
+  - only URLs matching a TTL rule are cached (DEFAULT_TTL_HOURS, keyed by host +
+    path prefix); override or add rules with
+    HTTP_CACHE_TTL_HOURS='{"serpapi.com/search.json": 24}'
+  - 200 responses are kept for the rule's TTL; misses (404/410) are cached too,
+    for HTTP_CACHE_NEGATIVE_TTL_HOURS (default 6), so a dead listing ID isn't
+    re-requested on every lookup. Anything else (429, 5xx, DuckDuckGo's 202) is
+    never cached
+  - search-result pages (CALLER_COMMITTED) are cached only when the caller
+    commits them after validating a result, never just for being a 200
+  - one file per response under HTTP_CACHE_DIR (default data/cache/http),
+    evicted least-recently-used once the store exceeds HTTP_CACHE_MAX_MB
+    (default 200)
+
+Keys are a SHA-256 of the method, URL and query params; credentials (the
+SerpAPI ``api_key`` param, RapidAPI key header) are not part of the key.
+``stats()`` reports hits, negative hits, misses and the store size.
+HTTP_CACHE=off disables it.
+"""
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_DIR = Path(__file__).parent.parent.parent / "data" / "cache" / "http"
+_HOUR = 3600.0
+
+# "host/path-prefix" -> hours a 200 response stays fresh.
+DEFAULT_TTL_HOURS: Dict[str, float] = {
+    "us-real-estate-listings.p.rapidapi.com/v2/property": 72,       # price / status move
+    "us-real-estate-listings.p.rapidapi.com/propertyPhotos": 168,
+    "serpapi.com/search.json": 168,                                  # address -> listing URL
+    "duckduckgo.com/html": 72,
+    "www.realtor.com/realestateandhomes-search": 24,
+}
+# Search pages are only worth keeping once the caller has found a validated
+# result on them: an empty result list or a bot-check page is also a 200, and
+# caching it would block the lookup for the whole TTL. These are stored only by
+# ``put(..., committed=True)`` (StreamedResponse.commit).
+CALLER_COMMITTED = ("duckduckgo.com/html", "www.realtor.com/realestateandhomes-search")
+NEGATIVE_STATUS = (404, 410)
+_SECRET_PARAMS = ("api_key", "key", "token")
+
+HTTP_CACHE = os.environ.get("HTTP_CACHE", "on").strip().lower() not in ("off", "0", "false", "no")
+HTTP_CACHE_MAX_MB = float(os.environ.get("HTTP_CACHE_MAX_MB", 200))
+HTTP_CACHE_NEGATIVE_TTL_HOURS = float(os.environ.get("HTTP_CACHE_NEGATIVE_TTL_HOURS", 6))
+
+
+def _env_ttls() -> Dict[str, float]:
+    raw = os.environ.get("HTTP_CACHE_TTL_HOURS")
+    if not raw:
+        return {}
+    try:
+        return {str(k): float(v) for k, v in json.loads(raw).items()}
+    except (ValueError, TypeError, AttributeError):
+        logger.warning("Ignoring invalid HTTP_CACHE_TTL_HOURS=%r", raw)
+        return {}
+
+
+class ResponseCache:
+    """Size-bounded LRU store of HTTP responses, one JSON file per response."""
+
+    def __init__(self, directory: Optional[str] = None, ttl_hours: Optional[Dict[str, float]] = None,
+                 negative_ttl_hours: float = HTTP_CACHE_NEGATIVE_TTL_HOURS,
+                 max_mb: float = HTTP_CACHE_MAX_MB, enabled: bool = HTTP_CACHE):
+        self.directory = Path(directory) if directory else _DEFAULT_DIR
+        ttls = {**DEFAULT_TTL_HOURS, **(ttl_hours or {})}
+        # Longest prefix first, so a specific rule beats a host-wide one.
+        self.ttl_s = {k: v * _HOUR for k, v in sorted(ttls.items(), key=lambda kv: -len(kv[0])) if v > 0}
+        self.negative_ttl_s = max(0.0, negative_ttl_hours) * _HOUR
+        self.max_bytes = int(max_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        self._index: Optional[Dict[Path, list]] = None  # path -> [size, last used]
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _target(url: str) -> str:
+        parts = urlsplit(url)
+        return f"{(parts.hostname or '').lower()}{parts.path}"
+
+    def ttl(self, url: str) -> Optional[float]:
+        """Seconds a 200 response for ``url`` stays fresh; None if it isn't cacheable."""
+        target = self._target(url)
+        for prefix, ttl in self.ttl_s.items():
+            if target.startswith(prefix):
+                return ttl
+        return None
+
+    def caller_committed(self, url: str) -> bool:
+        """True when ``url`` is only cached once the caller commits it."""
+        return self._target(url).startswith(CALLER_COMMITTED)
+
+    def key(self, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> str:
+        parts = urlsplit(url)
+        query = parse_qsl(parts.query, keep_blank_values=True)
+        query += [(str(k), str(v)) for k, v in (params or {}).items() if v is not None]
+        query = sorted((k, v) for k, v in query if k.lower() not in _SECRET_PARAMS)
+        blob = f"{method.upper()} {parts.scheme}://{parts.netloc}{parts.path}?{urlencode(query)}"
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> Dict[Path, list]:
+        """Scan the store once (caller holds the lock)."""
+        if self._index is None:
+            self._index, self._bytes = {}, 0
+            for path in self.directory.glob("*/*.json") if self.directory.exists() else []:
+                try:
+                    st = path.stat()
+                except OSError:
+                    continue
+                self._index[path] = [st.st_size, st.st_mtime]
+                self._bytes += st.st_size
+        return self._index
+
+    def get(self, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> Optional[requests.Response]:
+        """A fresh cached response for the request, or None (never raises)."""
+        if not self.enabled or method.upper() != "GET" or self.ttl(url) is None:
+            return None
+        path = self._path(self.key(method, url, params))
+        try:
+            with open(path) as f:
+                entry = json.load(f)
+            if time.time() > float(entry["expires"]):
+                raise FileNotFoundError
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            rec = self._load_index().get(path)
+            if rec is not None:
+                rec[1] = time.time()
+            if entry["status"] in NEGATIVE_STATUS:
+                self.negative_hits += 1
+            else:
+                self.hits += 1
+        try:
+            os.utime(path)  # LRU order survives restarts
+        except OSError:
+            pass
+        resp = requests.Response()
+        resp.status_code = entry["status"]
+        resp._content = entry["body"].encode("utf-8")
+        resp.encoding = "utf-8"
+        resp.headers.update(entry.get("headers") or {})
+        resp.url = entry.get("url", url)
+        resp.from_cache = True
+        return resp
+
+    def put(self, method: str, url: str, params: Optional[Dict[str, Any]], resp: requests.Response,
+            committed: bool = False) -> None:
+        """Store ``resp`` if it is cacheable (never raises). A CALLER_COMMITTED
+        page is only stored with ``committed=True``."""
+        if not self.enabled or method.upper() != "GET":
+            return
+        ttl = self.ttl(url)
+        if ttl is None:
+            return
+        if resp.status_code in NEGATIVE_STATUS:
+            ttl = self.negative_ttl_s
+        elif resp.status_code != 200 or (self.caller_committed(url) and not committed):
+            return
+        if ttl <= 0:
+            return
+        path = self._path(self.key(method, url, params))
+        try:
+            entry = {"url": url, "status": resp.status_code, "expires": time.time() + ttl,
+                     "headers": {k: v for k, v in resp.headers.items() if k.lower() == "content-type"},
+                     "body": resp.text}
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+            with open(tmp, "w") as f:
+                json.dump(entry, f)
+            size = tmp.stat().st_size
+            os.replace(tmp, path)
+        except (OSError, ValueError) as e:
+            logger.warning("Could not write HTTP cache entry for %s: %s", urlsplit(url).hostname, e)
+            return
+        with self._lock:
+            index = self._load_index()
+            old = index.get(path)
+            self._bytes += size - (old[0] if old else 0)
+            index[path] = [size, time.time()]
+            self.stores += 1
+            self._evict()
+
+    def discard(self, method: str, url: str, params: Optional[Dict[str, Any]] = None) -> None:
+        """Drop a stored response the caller found unusable (e.g. a bot-check page)."""
+        if not self.enabled:
+            return
+        path = self._path(self.key(method, url, params))
+        with self._lock:
+            rec = self._load_index().pop(path, None)
+            if rec is not None:
+                self._bytes -= rec[0]
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until under the size bound (caller holds the lock)."""
+        if self._bytes <= self.max_bytes:
+            return
+        for path, (size, _used) in sorted(self._index.items(), key=lambda kv: kv[1][1]):
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                logger.warning("Could not evict HTTP cache entry %s: %s", path.name, e)
+                continue
+            del self._index[path]
+            self._bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries = len(self._index) if self._index is not None else None
+            size_mb = round(self._bytes / 1024 / 1024, 2) if self._index is not None else None
+            hits, negative_hits, misses = self.hits, self.negative_hits, self.misses
+            stores, evictions = self.stores, self.evictions
+        lookups = hits + negative_hits + misses
+        return {"enabled": self.enabled, "hits": hits, "negative_hits": negative_hits,
+                "misses": misses, "hit_rate": round((hits + negative_hits) / lookups, 3) if lookups else None,
+                "stores": stores, "evictions": evictions, "entries": entries, "size_mb": size_mb,
+                "max_mb": round(self.max_bytes / 1024 / 1024, 1)}
+
+
+_cache: Optional[ResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Process-wide response cache configured from the environment."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache(os.environ.get("HTTP_CACHE_DIR"), _env_ttls())
+        return _cache
@@ -0,0 +1,142 @@
+"""Bounded, format-aware text extraction for transcript uploads.
+
+``/generate-report`` accepts .docx and .pdf transcripts, which used to be opened
+as text — binary garbage went to the LLM, and a large upload was held in memory
+more than once. ``extract_transcript`` instead streams the text out of the file:
+
+  - .docx : paragraphs are pulled from ``word/document.xml`` with iterparse
+            straight out of the zip (no python-docx object model), each element
+            cleared and detached once read
+  - .pdf  : pages are extracted one at a time with pypdf (optional dependency)
+  - text  : read up to the character ceiling
+
+Extraction stops as soon as the configured token budget
+(TRANSCRIPT_TOKEN_BUDGET, ~4 chars/token) is reached, so neither worker memory
+nor the prompt grows with the upload. The format is taken from the file's
+magic bytes, not its name.
+"""
+import logging
+import os
+import zipfile
+from typing import Iterator, Optional
+from xml.etree import ElementTree
+
+try:
+    from pypdf import PdfReader
+    HAS_PYPDF = True
+except ImportError:
+    PdfReader = None
+    HAS_PYPDF = False
+
+logger = logging.getLogger(__name__)
+
+# Upper bound on transcript size sent to extraction. A long consultation is
+# ~25k tokens, so the default leaves plenty of headroom.
+TRANSCRIPT_TOKEN_BUDGET = int(os.environ.get("TRANSCRIPT_TOKEN_BUDGET", 60000))
+CHARS_PER_TOKEN = 4
+
+_W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+_DOCX_BODY = "word/document.xml"
+
+
+class UnsupportedTranscript(ValueError):
+    """The upload is not text, .docx or a readable .pdf."""
+
+
+def sniff_file_type(path: str) -> str:
+    """'docx', 'pdf', 'binary' or 'text' from the file's first bytes."""
+    with open(path, "rb") as f:
+        head = f.read(1024)
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    if head.lstrip().startswith(b"%PDF"):
+        return "pdf"
+    if b"\x00" in head:
+        return "binary"
+    return "text"
+
+
+def iter_docx_paragraphs(path: str) -> Iterator[str]:
+    """Yield each paragraph's text from a .docx, streaming document.xml."""
+    try:
+        archive = zipfile.ZipFile(path)
+    except zipfile.BadZipFile as e:
+        raise UnsupportedTranscript(f"Not a valid .docx file: {e}") from e
+    with archive:
+        if _DOCX_BODY not in archive.namelist():
+            raise UnsupportedTranscript("Zip upload is not a Word document")
+        with archive.open(_DOCX_BODY) as xml:
+            parts = []
+            # Open elements, root first. Every element is dropped from its parent
+            # as soon as it ends, so the tree never holds more than the path to
+            # the current element — whatever the nesting (tables, content controls).
+            path = []
+            for event, elem in ElementTree.iterparse(xml, events=("start", "end")):
+                if event == "start":
+                    path.append(elem)
+                    continue
+                path.pop()
+                tag = elem.tag
+                if tag == _W + "t" and elem.text:
+                    parts.append(elem.text)
+                elif tag == _W + "tab":
+                    parts.append("\t")
+                elif tag in (_W + "br", _W + "cr"):
+                    parts.append("\n")
+                elif tag == _W + "p":
+                    yield "".join(parts)
+                    parts = []
+                elem.clear()
+                if path:
+                    path[-1].remove(elem)
+
+
+def iter_pdf_pages(path: str) -> Iterator[str]:
+    """Yield the text of each PDF page, one page in memory at a time."""
+    if not HAS_PYPDF:
+        raise UnsupportedTranscript("PDF transcripts need the 'pypdf' package")
+    try:
+        reader = PdfReader(path)
+        for page in reader.pages:
+            yield page.extract_text() or ""
+    except UnsupportedTranscript:
+        raise
+    except Exception as e:  # pypdf raises a zoo of parse errors
+        raise UnsupportedTranscript(f"Could not read PDF: {e}") from e
+
+
+def extract_transcript(path: str, token_budget: Optional[int] = None) -> str:
+    """Text of a transcript upload, capped at ``token_budget`` tokens.
+
+    Raises UnsupportedTranscript for binary uploads that aren't .docx/.pdf.
+    """
+    max_chars = (token_budget or TRANSCRIPT_TOKEN_BUDGET) * CHARS_PER_TOKEN
+    kind = sniff_file_type(path)
+    if kind == "binary":
+        raise UnsupportedTranscript("Upload is a binary file, not a transcript")
+    if kind == "text":
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            text = f.read(max_chars + 1)
+        if len(text) > max_chars:
+            logger.warning("Transcript exceeds the %d-token budget — truncated to %d chars",
+                           token_budget or TRANSCRIPT_TOKEN_BUDGET, max_chars)
+            text = text[:max_chars]
+        return text
+
+    chunks = iter_docx_paragraphs(path) if kind == "docx" else iter_pdf_pages(path)
+    out, size = [], 0
+    try:
+        for chunk in chunks:
+            if not chunk.strip():
+                continue
+            out.append(chunk)
+            size += len(chunk) + 1
+            if size >= max_chars:
+                logger.warning("%s transcript reached the %d-token budget — stopped extracting early",
+                               kind, token_budget or TRANSCRIPT_TOKEN_BUDGET)
+                break
+    finally:
+        chunks.close()  # release the zip / PDF handle on early exit
+    text = "\n".join(out)[:max_chars]
+    logger.info("Extracted %d chars from %s transcript", len(text), kind)
+    return text
@@ -0,0 +1,255 @@
+"""Transcript export formats -> compact speaker-turn text.
+
+Transcripts arrive as plain text (the common case), as JSONL lines such as
+``{"": "Speaker: text"}``, or as meeting-tool exports:
+
+  - WebVTT (Teams / Zoom / Meet caption downloads, ``<v Speaker>`` voice tags)
+  - SubRip (.srt)
+  - Teams / Zoom JSON (``entries`` / ``timeline`` / ``segments`` lists whose
+    items carry speaker + text + timestamp fields)
+
+``flatten_transcript`` sniffs the format ONCE from the start of the payload, so
+plain text is returned untouched (no per-line json.loads, no split/join), and
+converts everything else in a single pass over the text: lines are walked by
+index rather than split into a list, and consecutive turns by the same speaker
+are merged as they stream past, so only the current turn is held in memory.
+Timestamps and cue numbering are dropped — Claude only needs who said what.
+"""
+import io
+import json
+import logging
+import re
+from typing import Any, Iterator, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ("text", "jsonl", "json", "vtt", "srt")
+
+# How much of the payload to look at when sniffing the format.
+_SNIFF_CHARS = 4096
+
+_SRT_HEAD = re.compile(r"\d+[ \t]*\r?\n[ \t]*\d{1,2}:\d{2}:\d{2}[,.]\d{1,3}[ \t]*-->")
+# Start of a JSON array export: '[' then an object, array or string.
+_JSON_ARRAY_HEAD = re.compile(r'^\[\s*[\{\["]')
+_CUE_TIMING = re.compile(r"^\s*(?:\d{1,2}:)?\d{1,2}:\d{2}[,.]\d{1,3}\s*-->")
+_VOICE_TAG = re.compile(r"<v(?:\.[^\s>]+)*\s+([^>]+)>")
+_MARKUP_TAG = re.compile(r"</?[^>]*>")
+# "Jane Smith: text" / "Speaker 1: text" — a short leading label before a colon.
+_SPEAKER_PREFIX = re.compile(r"^\s*([A-Za-z][\w .'()-]{0,40}?)\s*:\s+(\S.*)$")
+
+# Field names used by the common exports, in order of preference.
+_SPEAKER_KEYS = ("speaker", "speakerDisplayName", "speaker_name", "speakerName",
+                 "username", "participant", "name", "user", "author")
+_TEXT_KEYS = ("text", "content", "transcript", "utterance", "message", "words")
+_CONTAINER_KEYS = ("entries", "timeline", "segments", "utterances", "transcript",
+                   "results", "items", "messages", "captions")
+
+Turn = Tuple[str, str]
+
+
+def sniff_format(text: str) -> str:
+    """Classify a transcript payload as one of FORMATS from its first few KB."""
+    head = text[:_SNIFF_CHARS].lstrip("\ufeff \t\r\n")
+    if not head:
+        return "text"
+    if head.startswith("WEBVTT"):
+        return "vtt"
+    if _SRT_HEAD.match(head):
+        return "srt"
+    if head[0] == "[":
+        # A JSON array of objects / arrays / strings — not "[00:01] Jane: ..." text.
+        if _JSON_ARRAY_HEAD.match(head):
+            return "json"
+        try:
+            json.loads(head)
+            return "json"
+        except ValueError:
+            return "text"
+    if head[0] == "{":
+        # One object per line -> JSONL; otherwise a single (pretty-printed) document.
+        start = len(text) - len(text.lstrip("\ufeff \t\r\n"))
+        end = text.find("\n", start)
+        first = text[start:end if end >= 0 else len(text)].strip()
+        try:
+            json.loads(first)
+            return "jsonl"
+        except ValueError:
+            return "json"
+    return "text"
+
+
+def _iter_lines(text: str) -> Iterator[str]:
+    """Yield lines without materialising ``text.splitlines()``."""
+    start, n = 0, len(text)
+    while start < n:
+        end = text.find("\n", start)
+        if end < 0:
+            end = n
+        yield text[start:end].rstrip("\r")
+        start = end + 1
+
+
+def _split_speaker(line: str) -> Turn:
+    m = _SPEAKER_PREFIX.match(line)
+    if m:
+        return m.group(1).strip(), m.group(2)
+    return "", line
+
+
+def _speaker_of(obj: dict) -> str:
+    for key in _SPEAKER_KEYS:
+        value = obj.get(key)
+        if isinstance(value, dict):  # e.g. {"speaker": {"name": "..."}}
+            value = value.get("name") or value.get("displayName")
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    users = obj.get("users")  # Zoom timeline: {"users": [{"username": "..."}]}
+    if isinstance(users, list) and users and isinstance(users[0], dict):
+        return str(users[0].get("username") or users[0].get("name") or "").strip()
+    return ""
+
+
+def _text_of(obj: dict) -> Optional[str]:
+    for key in _TEXT_KEYS:
+        value = obj.get(key)
+        if isinstance(value, str):
+            return value
+        if key == "words" and isinstance(value, list):  # word-level exports
+            return " ".join(str(w.get("text") or w.get("word") or "") if isinstance(w, dict) else str(w)
+                            for w in value)
+    return None
+
+
+def _turns_from_obj(obj: Any) -> Iterator[Turn]:
+    """Speaker turns from one parsed JSON value (line or whole document)."""
+    if isinstance(obj, list):
+        for item in obj:
+            yield from _turns_from_obj(item)
+        return
+    if isinstance(obj, dict):
+        if "" in obj:  # legacy {"": "Speaker: text"} lines
+            yield _split_speaker(str(obj[""]))
+            return
+        text = _text_of(obj)
+        if text is not None:
+            speaker = _speaker_of(obj)
+            yield (speaker, text) if speaker else _split_speaker(text)
+            return
+        for key in _CONTAINER_KEYS:
+            if isinstance(obj.get(key), list):
+                yield from _turns_from_obj(obj[key])
+                return
+        yield "", str(obj)
+        return
+    if obj is not None:
+        yield _split_speaker(str(obj))
+
+
+def _turns_from_jsonl(text: str) -> Iterator[Turn]:
+    for line in _iter_lines(text):
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            # Stray plain-text line inside a JSONL payload: keep it.
+            yield _split_speaker(line)
+            continue
+        yield from _turns_from_obj(obj)
+
+
+def _turns_from_cues(text: str) -> Iterator[Turn]:
+    """WebVTT / SRT cues -> turns (timings, cue ids and NOTE/STYLE blocks dropped).
+
+    Continuation lines of a multi-line cue inherit the cue's speaker.
+    """
+    pending = None  # a line that may turn out to be a cue identifier
+    cue_speaker = ""
+    skipping_block = False
+
+    def turn(line: str) -> Turn:
+        nonlocal cue_speaker
+        who, said = _cue_turn(line)
+        if who:
+            cue_speaker = who
+        return who or cue_speaker, said
+
+    for raw in _iter_lines(text):
+        line = raw.strip()
+        if not line:
+            skipping_block = False
+            if pending is not None:
+                yield turn(pending)
+                pending = None
+            cue_speaker = ""
+            continue
+        if skipping_block:
+            continue
+        if line.startswith(("WEBVTT", "NOTE", "STYLE", "REGION")) and pending is None:
+            skipping_block = True
+            continue
+        if _CUE_TIMING.match(line):
+            pending = None  # the previous line was the cue id / SRT index
+            continue
+        if pending is not None:
+            yield turn(pending)
+        pending = line
+    if pending is not None:
+        yield turn(pending)
+
+
+def _cue_turn(line: str) -> Turn:
+    m = _VOICE_TAG.search(line)
+    if m:
+        return m.group(1).strip(), _MARKUP_TAG.sub("", line)
+    return _split_speaker(_MARKUP_TAG.sub("", line))
+
+
+def _write_turns(turns: Iterator[Turn]) -> str:
+    """Merge consecutive same-speaker turns and render "Speaker: text" lines."""
+    out = io.StringIO()
+    speaker, parts = None, []
+
+    def flush():
+        if parts:
+            body = " ".join(parts)
+            out.write(f"{speaker}: {body}\n" if speaker else f"{body}\n")
+
+    for who, said in turns:
+        said = " ".join(said.split())
+        if not said:
+            continue
+        if who and who == speaker:
+            parts.append(said)
+            continue
+        flush()
+        speaker, parts = who, [said]
+    flush()
+    return out.getvalue()
+
+
+def flatten_transcript(text: str) -> str:
+    """Plain speaker-turn text for any supported transcript format.
+
+    Plain text is returned as-is. A payload that looks structured but fails to
+    parse is also returned unchanged rather than dropped.
+    """
+    if not text:
+        return text
+    fmt = sniff_format(text)
+    if fmt == "text":
+        return text
+    try:
+        if fmt == "jsonl":
+            flattened = _write_turns(_turns_from_jsonl(text))
+        elif fmt == "json":
+            flattened = _write_turns(_turns_from_obj(json.loads(text)))
+        else:
+            flattened = _write_turns(_turns_from_cues(text))
+    except ValueError as e:
+        logger.warning("Transcript looked like %s but could not be parsed (%s) — using it as plain text", fmt, e)
+        return text
+    if not flattened.strip():
+        return text
+    logger.info("Flattened %s transcript: %d -> %d chars", fmt, len(text), len(flattened))
+    return flattened
@@ -1,10 +1,23 @@
 import json
 import logging
 import re
-from typing import Any, Dict
+import time
+from typing import Any, Dict, Optional
 
+import anthropic
 from anthropic import Anthropic
 
+try:
+    from model_router import ModelRouter, Route, get_router
+    from cassette import wrap_anthropic
+    from api_governor import PRIORITY_NORMAL, get_governor, is_overload
+    from deadline import Deadline, DeadlineExceeded
+except ImportError:
+    from .model_router import ModelRouter, Route, get_router
+    from .cassette import wrap_anthropic
+    from .api_governor import PRIORITY_NORMAL, get_governor, is_overload
+    from .deadline import Deadline, DeadlineExceeded
+
 logger = logging.getLogger(__name__)
 
 # Default Claude model. Override per-instance (e.g. from config) without touching call sites.
@@ -12,15 +25,79 @@ DEFAULT_MODEL = "claude-opus-4-8"
 
 # Adaptive thinking improves extraction accuracy on nuanced consultations (budget
 # inference, red-flag detection). It adds some latency; set to False for the fastest,
-# cheapest extraction.
+# cheapest extraction. This is a global kill switch — the model router decides per
+# call whether thinking is worth it (see model_router.DEFAULT_ROUTES).
 USE_ADAPTIVE_THINKING = True
 
+# Transient API errors, retried up to _MAX_ATTEMPTS in total. 429/529s wait for
+# the api_governor's backoff; the others back off exponentially.
+_TRANSIENT_ERRORS = tuple(
+    getattr(anthropic, name)
+    for name in ("RateLimitError", "OverloadedError", "InternalServerError", "APIConnectionError")
+    if hasattr(anthropic, name)
+)
+_MAX_ATTEMPTS = 4
+# Per-call client timeout (seconds); with a deadline, also no more than it leaves.
+# An attempt is only started with _MIN_CALL_S of the deadline left.
+_CALL_TIMEOUT_S = 120.0
+_MIN_CALL_S = 5.0
+
 
 class TranscriptProcessor:
-    def __init__(self, api_key: str, model: str = DEFAULT_MODEL):
-        # max_retries/timeout make the client resilient to transient rate-limit/5xx/network errors.
-        self.client = Anthropic(api_key=api_key, max_retries=3, timeout=120.0)
+    def __init__(self, api_key: str, model: str = DEFAULT_MODEL, router: Optional[ModelRouter] = None,
+                 priority: int = PRIORITY_NORMAL, deadline: Optional[Deadline] = None,
+                 fixed_model: Optional[str] = None):
+        # Transient rate-limit/5xx/network errors are retried in _create (through the
+        # api_governor, so it sees every 429/529), not by the SDK.
+        # wrap_anthropic is a no-op unless cassette record/replay is enabled.
+        self.client = wrap_anthropic(Anthropic(api_key=api_key, max_retries=0, timeout=_CALL_TIMEOUT_S))
+        self.priority = priority
+        # Default model for the heavy calls; the router may pick a smaller one per task.
         self.model = model or DEFAULT_MODEL
+        self.router = router or get_router()
+        # With a deadline, calls and retries stop when it runs out (DeadlineExceeded).
+        self.deadline = deadline
+        # A fixed model (e.g. a "fast" research tier's) replaces routing: every
+        # call goes to it without thinking.
+        self.fixed_model = fixed_model
+
+    def _route(self, task: str, input_chars: int, remaining_s: Optional[float]) -> Route:
+        if self.fixed_model:
+            return Route(task, self.fixed_model, False, -1)
+        if remaining_s is None and self.deadline is not None:
+            remaining_s = self.deadline.remaining()
+        return self.router.choose(task, self.model, input_chars, remaining_s)
+
+    def _create(self, route, **kwargs):
+        """messages.create with the routed model inside an api_governor slot,
+        recording latency + token usage; transient errors are retried."""
+        kwargs["model"] = route.model
+        if route.thinking and USE_ADAPTIVE_THINKING:
+            kwargs["thinking"] = {"type": "adaptive"}
+        governor = get_governor()
+        for attempt in range(_MAX_ATTEMPTS):
+            if self.deadline is not None:
+                self.deadline.check(route.task, need_s=_MIN_CALL_S)
+                kwargs["timeout"] = self.deadline.timeout(_CALL_TIMEOUT_S)
+            started = time.monotonic()
+            try:
+                with governor.slot(route.task, self.priority, self.deadline):
+                    started = time.monotonic()
+                    response = self.client.messages.create(**kwargs)
+            except _TRANSIENT_ERRORS as e:
+                self.router.record(route, time.monotonic() - started, ok=False)
+                if attempt == _MAX_ATTEMPTS - 1:
+                    raise
+                logger.info("%s: transient %s — retrying (%d/%d)", route.task, type(e).__name__,
+                            attempt + 1, _MAX_ATTEMPTS - 1)
+                if not (is_overload(e) and governor.enabled):
+                    time.sleep(2.0 ** attempt)
+                continue
+            except Exception:
+                self.router.record(route, time.monotonic() - started, ok=False)
+                raise
+            self.router.record(route, time.monotonic() - started, response)
+            return response
 
     # ------------------------------------------------------------------ helpers
     @staticmethod
@@ -95,8 +172,14 @@ class TranscriptProcessor:
 
         return '\n'.join(cleaned_lines)
 
-    def extract_info(self, transcript: str) -> Dict[str, Any]:
-        """Extract structured information from transcript"""
+    def extract_info(self, transcript: str, remaining_s: Optional[float] = None) -> Dict[str, Any]:
+        """Extract structured information from transcript.
+
+        ``remaining_s`` is the job's remaining latency budget (if known); the
+        router uses it, with the transcript length, to pick the model. Running
+        out of the processor's deadline raises DeadlineExceeded rather than
+        returning the empty template, so a job can't ship a blank brief.
+        """
         cleaned_transcript = transcript.strip()
 
         # Only short-circuit on a genuinely empty transcript. We deliberately do
@@ -115,6 +198,9 @@ class TranscriptProcessor:
 Return ONLY valid JSON matching this exact structure (fill in only the sections that are relevant to this specific consultation):
 {
     "property_address": string,  // The complete property address being renovated (extract exactly as mentioned)
+    "property_addresses": [  // EVERY property discussed (main home, rental unit, second home, ...); the main renovation property first
+        {"address": string, "role": string}  // role e.g. "main residence", "rental unit", "second home"
+    ],
     "property_info": {
         "building_type": string,  // e.g., "house", "condo", "co-op", "townhouse"
         "total_units": number or null,
@@ -228,7 +314,7 @@ CRITICAL EXTRACTION RULES:
 5. NO COMPANY SELF-DESCRIPTION: This brief is for our own salesperson attending the walkthrough. Do NOT describe our company, our services, our process, our fees, or our warranty/insurance, and never write "we will…" or "<company> will provide/handles…". Capture only the CLIENT's expectations of the contractor. Do not name our own company in any field.
 6. EXACT QUOTES: For requirements and preferences, use exact client language when possible
 7. NUMBERS: Convert written numbers to digits (e.g., "two hundred fifty thousand" = 250000, "five percent" = 5)
-8. ADDRESSES: Extract complete address exactly as stated, correct obvious spelling errors
+8. ADDRESSES: Extract complete address exactly as stated, correct obvious spelling errors. If the consultation covers more than one property, list each one in property_addresses (property_address stays the main renovation property)
 9. FLEXIBILITY: If certain sections don't apply to this consultation (e.g., no kitchen work discussed), leave those fields empty or null
 10. COMPLETENESS: Capture all mentioned work types - renovations, additions, repairs, maintenance, new construction, etc.
 11. ADAPTABILITY: This template works for any project size - from single room renovations to whole-house projects to commercial work
@@ -251,9 +337,10 @@ Process this transcript and return ONLY the JSON:"""
                 "Respond with ONLY the JSON object — no markdown fences, no prose."
             )
 
-            logger.info("Extracting renovation information via %s", self.model)
-            kwargs = dict(
-                model=self.model,
+            route = self._route("extract_info", len(cleaned_transcript), remaining_s)
+            logger.info("Extracting renovation information via %s (thinking=%s)", route.model, route.thinking)
+            response = self._create(
+                route,
                 max_tokens=16000,
                 system=system_prompt,
                 messages=[
@@ -261,10 +348,6 @@ Process this transcript and return ONLY the JSON:"""
                     {"role": "user", "content": cleaned_transcript},
                 ],
             )
-            if USE_ADAPTIVE_THINKING:
-                kwargs["thinking"] = {"type": "adaptive"}
-
-            response = self.client.messages.create(**kwargs)
 
             if response.stop_reason == "max_tokens":
                 logger.error(
@@ -280,6 +363,8 @@ Process this transcript and return ONLY the JSON:"""
             # Merge over the canonical template so every downstream key exists.
             return self._deep_merge(self._get_empty_template(), data)
 
+        except DeadlineExceeded:
+            raise
         except Exception as e:
             logger.error("Error extracting information: %s", e)
             return self._get_empty_template()
@@ -288,6 +373,7 @@ Process this transcript and return ONLY the JSON:"""
         """Return an empty template structure when no meaningful transcript is provided"""
         return {
             "property_address": "",
+            "property_addresses": [],
             "property_info": {
                 "building_type": "",
                 "total_units": None,
@@ -386,7 +472,7 @@ Process this transcript and return ONLY the JSON:"""
             }
         }
 
-    def extract_address(self, transcript: str) -> str:
+    def extract_address(self, transcript: str, remaining_s: Optional[float] = None) -> str:
         prompt = """
         Extract the complete property address mentioned in this renovation consultation transcript.
 
@@ -408,8 +494,9 @@ Process this transcript and return ONLY the JSON:"""
         """
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
+            route = self._route("extract_address", len(transcript), remaining_s)
+            response = self._create(
+                route,
                 max_tokens=512,
                 system="You are a helpful assistant that extracts addresses from text and corrects spelling mistakes in street names using context and common street names. Output only the address.",
                 messages=[
@@ -465,7 +552,7 @@ Process this transcript and return ONLY the JSON:"""
                 return addr
         return ""
 
-    def analyze_client(self, transcript: str) -> Dict[str, Any]:
+    def analyze_client(self, transcript: str, remaining_s: Optional[float] = None) -> Dict[str, Any]:
         """Analyze client behavior and preferences"""
         prompt = """
         Analyze the client's behavior, communication style, and potential red flags from this renovation consultation transcript.
@@ -513,8 +600,9 @@ Process this transcript and return ONLY the JSON:"""
         """
 
         try:
-            response = self.client.messages.create(
-                model=self.model,
+            route = self._route("analyze_client", len(transcript), remaining_s)
+            response = self._create(
+                route,
                 max_tokens=2000,
                 system="You are a helpful assistant that analyzes client behavior and preferences. Respond with only JSON.",
                 messages=[
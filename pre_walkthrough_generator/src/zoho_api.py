@@ -5,13 +5,22 @@ Handles authentication and data fetching from Zoho CRM
 
 import requests
 import json
-import time
 import re
 import html
 from typing import Dict, List, Any, Optional
 from datetime import datetime, timedelta
+from urllib.parse import urlsplit
 import logging
 
+try:
+    from address_canon import parse_address
+    from cassette import get_cassette
+    from rate_limiter import get_rate_limiter
+except ImportError:
+    from .address_canon import parse_address
+    from .cassette import get_cassette
+    from .rate_limiter import get_rate_limiter
+
 logger = logging.getLogger(__name__)
 
 
@@ -47,6 +56,7 @@ class ZohoAPI:
             # Send credentials in the POST BODY (data=), never the query string —
             # otherwise client_secret/refresh_token land in the request URL and a
             # raised HTTPError (which echoes the URL) leaks them into the logs.
+            get_rate_limiter().wait(urlsplit(self.auth_url).hostname)
             response = requests.post(self.auth_url, data=params, timeout=10)
             response.raise_for_status()
             data = response.json()
@@ -71,7 +81,16 @@ class ZohoAPI:
             raise
     
     def _make_request(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
-        """Make authenticated request to Zoho CRM API"""
+        """Make authenticated request to Zoho CRM API.
+
+        Goes through the record/replay cassette (a pass-through unless enabled),
+        keyed by endpoint + params so replays never need live credentials.
+        """
+        return get_cassette().call("zoho", {"endpoint": endpoint, "params": params},
+                                   lambda: self._fetch(endpoint, params))
+
+    def _fetch(self, endpoint: str, params: Dict = None) -> Dict[str, Any]:
+        """Live authenticated GET against the Zoho CRM API."""
         access_token = self._get_access_token()
         
         headers = {
@@ -82,6 +101,8 @@ class ZohoAPI:
         url = f"{self.base_url}/{endpoint}"
         
         try:
+            # Shared per-host rate limit (all threads, all jobs) instead of fixed sleeps.
+            get_rate_limiter().wait(urlsplit(url).hostname)
             response = requests.get(url, headers=headers, params=params, timeout=15)
             response.raise_for_status()
             # Zoho returns 204 No Content (empty body) when a search/related-list
@@ -94,7 +115,7 @@ class ZohoAPI:
             raise
     
     def get_all_records(self, module_name: str, fields: List[str] = None, 
-                       max_records: int = 5000) -> List[Dict[str, Any]]:
+                       max_records: int = 5000, sort_by: str = None) -> List[Dict[str, Any]]:
         """
         Fetch all records from a Zoho CRM module
         
@@ -102,6 +123,8 @@ class ZohoAPI:
             module_name: Name of the module (e.g., "Deals", "Projects")
             fields: List of field names to fetch (None = all fields)
             max_records: Maximum number of records to fetch
+            sort_by: Field to sort by, newest first (e.g. "Modified_Time"), so a
+                small ``max_records`` returns the most recent records
             
         Returns:
             List of record dictionaries
@@ -120,6 +143,9 @@ class ZohoAPI:
             
             if fields:
                 params["fields"] = ",".join(fields)
+            if sort_by:
+                params["sort_by"] = sort_by
+                params["sort_order"] = "desc"
             
             try:
                 data = self._make_request(module_name, params)
@@ -138,7 +164,6 @@ class ZohoAPI:
                     break
                 
                 page += 1
-                time.sleep(0.5)  # Rate limiting
                 
             except Exception as e:
                 logger.error(f"Error fetching page {page}: {e}")
@@ -300,23 +325,15 @@ class ZohoAPI:
             return out[:max_notes]
 
     _DIRS = {'e', 'w', 'n', 's', 'ne', 'nw', 'se', 'sw', 'east', 'west', 'north', 'south'}
-    _ABBR = {
-        'st': 'street', 'str': 'street', 'ave': 'avenue', 'av': 'avenue', 'pl': 'place',
-        'blvd': 'boulevard', 'rd': 'road', 'dr': 'drive', 'ct': 'court', 'ln': 'lane',
-        'pkwy': 'parkway', 'ter': 'terrace', 'hwy': 'highway', 'sq': 'square', 'plz': 'plaza',
-        'e': 'east', 'w': 'west', 'n': 'north', 's': 'south',
-        'apt': '', 'unit': '', 'ste': '', 'suite': '', 'fl': '', 'floor': '', 'no': '',
-    }
-
-    @classmethod
-    def _canon_addr(cls, s: str) -> str:
+    @staticmethod
+    def _canon_addr(s: str) -> str:
         """Canonicalize a street line so format variants compare EQUAL — the report
         address and the Zoho Mailing_Street often differ ('Pl' vs 'Place', 'E' vs
-        'East', 'APT 10M' vs '#10M'). Expands abbreviations/directions, drops
-        apt/unit markers, lowercases. '40 Sutton Pl APT 10M' == '40 Sutton Place, #10M'."""
-        s = re.sub(r'[^a-z0-9 ]', ' ', str(s or '').split(',')[0].lower())
-        toks = [cls._ABBR.get(t, t) for t in s.split()]
-        return ' '.join(t for t in toks if t)
+        'East', 'APT 10M' vs '#10M'). Street line + unit from address_canon; the
+        city/state/ZIP are ignored (Mailing_Street has none).
+        '40 Sutton Pl APT 10M' == '40 Sutton Place, #10M, New York, NY'."""
+        parts = parse_address(str(s or ''))
+        return f"{parts.line} {parts.unit}".strip()
 
     @classmethod
     def _street_search_prefix(cls, addr: str) -> str: